@@ -410,6 +410,52 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         default=False,
     )
 
+    export_image_max_size: IntProperty(
+        name='Max Texture Size',
+        description=(
+            'Maximum width and height of exported textures, in pixels. '
+            'Larger textures are scaled down, keeping their aspect ratio. 0 for no limit'
+        ),
+        default=0,
+        min=0,
+        max=65536
+    )
+
+    export_image_power_of_two: BoolProperty(
+        name='Power of Two',
+        description='Scale exported textures to the nearest power of two sizes (not over the maximum texture size)',
+        default=False
+    )
+
+    export_image_resize_filter: EnumProperty(
+        name='Resize Filter',
+        items=(('LANCZOS', 'Lanczos',
+                'Sharp resampling, with a Lanczos filter'),
+               ('BOX', 'Box',
+                'Average of source pixels. Faster, softer'),
+               ),
+        description='Filter used to resample scaled textures',
+        default='LANCZOS'
+    )
+
+    export_image_cache_dir: StringProperty(
+        name='Texture Cache',
+        description=(
+            'Folder of a persistent cache of encoded textures, shared by exports. '
+            'Textures with unchanged sources and settings are copied from the cache instead of being encoded again. '
+            'Empty to disable the cache'
+        ),
+        default='',
+        subtype='DIR_PATH'
+    )
+
+    export_image_cache_size: IntProperty(
+        name='Cache Size (MB)',
+        description='Maximum size of the texture cache. Least recently used textures are removed first',
+        default=2048,
+        min=1
+    )
+
     export_texcoords: BoolProperty(
         name='UVs',
         description='Export UVs (texture coordinates) with meshes',
@@ -482,6 +528,77 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         max=30
     )
 
+    export_meshopt_compression_enable: BoolProperty(
+        name='Meshopt compression',
+        description=(
+            'Compress geometry and animation data using EXT_meshopt_compression. '
+            'Not used when Draco compression is enabled'
+        ),
+        default=False
+    )
+
+    export_meshopt_float_bits: IntProperty(
+        name='Float mantissa bits',
+        description=(
+            'Mantissa bits kept for float vertex attributes and animation data, '
+            'using the exponential filter (0 = lossless). Positions are always lossless'
+        ),
+        default=0,
+        min=0,
+        max=24
+    )
+
+    export_quantize_enable: BoolProperty(
+        name='Mesh Quantization',
+        description=(
+            'Store vertex attributes as integers, using KHR_mesh_quantization. '
+            'Not used when Draco compression is enabled'
+        ),
+        default=False
+    )
+
+    export_quantize_position_bits: IntProperty(
+        name='Position quantization bits',
+        description='Quantization bits for position values. Skinned meshes and meshes with shape keys keep float positions',
+        default=14,
+        min=1,
+        max=16
+    )
+
+    export_quantize_position_type: EnumProperty(
+        name='Position type',
+        items=(('NORMALIZED', 'Normalized',
+                'Positions are stored as normalized integers'),
+               ('INTEGER', 'Integer',
+                'Positions are stored as integers')),
+        description='Storage of quantized positions. The dequantization transform is set on nodes',
+        default='NORMALIZED'
+    )
+
+    export_quantize_normal_bits: IntProperty(
+        name='Normal quantization bits',
+        description='Quantization bits for normal and tangent values',
+        default=8,
+        min=2,
+        max=16
+    )
+
+    export_quantize_texcoord_bits: IntProperty(
+        name='Texcoord quantization bits',
+        description='Quantization bits for texture coordinate values. Texture coordinates outside [0, 1] are kept as float',
+        default=12,
+        min=1,
+        max=16
+    )
+
+    export_quantize_color_bits: IntProperty(
+        name='Color quantization bits',
+        description='Quantization bits for color values. Colors outside [0, 1] are kept as float',
+        default=8,
+        min=1,
+        max=16
+    )
+
     export_tangents: BoolProperty(
         name='Tangents',
         description='Export vertex tangents with meshes',
@@ -647,6 +764,41 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         default=False
     )
 
+    export_optimize_vertex_order: BoolProperty(
+        name='Optimize Vertex Order',
+        description=(
+            'Reorder triangles and vertices for GPU vertex cache and vertex fetch efficiency. '
+            'Slows down export of large meshes'
+        ),
+        default=False
+    )
+
+    export_lods: BoolProperty(
+        name='Levels of Detail',
+        description=(
+            'Generate simplified levels of detail of meshes, using MSFT_lod. '
+            'Only static nodes without children get levels of detail. '
+            'Not used when Draco compression is enabled'
+        ),
+        default=False
+    )
+
+    export_lod_count: IntProperty(
+        name='Levels',
+        description='Maximum number of simplified levels generated for each mesh',
+        default=2,
+        min=1,
+        max=6
+    )
+
+    export_lod_ratio: FloatProperty(
+        name='Ratio',
+        description='Ratio of triangles kept from one level to the next',
+        default=0.5,
+        min=0.05,
+        max=0.95
+    )
+
     export_animations: BoolProperty(
         name='Animations',
         description='Exports active actions and NLA tracks as glTF animations',
@@ -935,6 +1087,22 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         default=False
     )
 
+    export_gpu_instances_scene_wide: BoolProperty(
+        name='Scene-Wide Instances',
+        description='Detect GPU instances anywhere in the scene, not only children of the same Empty. '
+                    'All leaf objects using the same mesh, without skinning or shape keys, '
+                    'are grouped in a single instanced node',
+        default=False
+    )
+
+    export_gpu_instances_keep_hierarchy: BoolProperty(
+        name='Keep Hierarchy',
+        description='Keep scene-wide instances under their original parents. '
+                    'When off, instances with non-animated parents are collapsed at scene root, '
+                    'using their world transforms',
+        default=False
+    )
+
     export_action_filter: BoolProperty(
         name='Filter Actions',
         description='Filter Actions to be exported',
@@ -1090,6 +1258,8 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
 
         export_settings['exported_images'] = {}
         export_settings['exported_texture_nodes'] = []
+        export_settings['evaluated_mesh_fingerprints'] = {}
+        export_settings['evaluated_mesh_signatures'] = {}
         export_settings['additional_texture_export'] = []
         export_settings['additional_texture_export_current_idx'] = 0
 
@@ -1108,6 +1278,12 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         export_settings['gltf_add_webp'] = self.export_image_add_webp
         export_settings['gltf_webp_fallback'] = self.export_image_webp_fallback
         export_settings['gltf_image_quality'] = self.export_image_quality
+        export_settings['gltf_image_max_size'] = self.export_image_max_size
+        export_settings['gltf_image_power_of_two'] = self.export_image_power_of_two
+        export_settings['gltf_image_resize_filter'] = self.export_image_resize_filter
+        export_settings['gltf_image_cache_dir'] = bpy.path.abspath(self.export_image_cache_dir) \
+            if self.export_image_cache_dir.strip() else None
+        export_settings['gltf_image_cache_size'] = self.export_image_cache_size * 1024 * 1024
         export_settings['gltf_copyright'] = self.export_copyright
         export_settings['gltf_texcoords'] = self.export_texcoords
         export_settings['gltf_normals'] = self.export_normals
@@ -1126,6 +1302,23 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         else:
             export_settings['gltf_draco_mesh_compression'] = False
 
+        export_settings['gltf_meshopt_compression'] = self.export_meshopt_compression_enable and not export_settings['gltf_draco_mesh_compression']
+        if export_settings['gltf_meshopt_compression']:
+            export_settings['gltf_meshopt_float_bits'] = self.export_meshopt_float_bits
+            export_settings['gltf_meshopt_normal_bits'] = self.export_quantize_normal_bits
+
+        # Draco already quantizes attributes
+        export_settings['gltf_quantize'] = self.export_quantize_enable and not export_settings['gltf_draco_mesh_compression']
+        if export_settings['gltf_quantize']:
+            export_settings['gltf_quantize_position_bits'] = self.export_quantize_position_bits
+            export_settings['gltf_quantize_position_normalized'] = self.export_quantize_position_type == 'NORMALIZED'
+            export_settings['gltf_quantize_normal_bits'] = self.export_quantize_normal_bits
+            export_settings['gltf_quantize_texcoord_bits'] = self.export_quantize_texcoord_bits
+            export_settings['gltf_quantize_color_bits'] = self.export_quantize_color_bits
+        export_settings['gltf_quantized_positions'] = {}
+        export_settings['gltf_quantized_accessors'] = []
+        export_settings['gltf_quantization_report'] = {'errors': {}, 'skipped': [], 'used': False}
+
         export_settings['gltf_gn_mesh'] = self.export_gn_mesh
 
         export_settings['gltf_materials'] = self.export_materials
@@ -1161,6 +1354,15 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         export_settings['gltf_yup'] = self.export_yup
         export_settings['gltf_apply'] = self.export_apply
         export_settings['gltf_shared_accessors'] = self.export_shared_accessors
+        export_settings['gltf_optimize_vertex_order'] = self.export_optimize_vertex_order
+
+        # Draco compressed primitives can't share their vertex data with simplified levels
+        export_settings['gltf_lods'] = self.export_lods and not export_settings['gltf_draco_mesh_compression']
+        if export_settings['gltf_lods']:
+            export_settings['gltf_lod_count'] = self.export_lod_count
+            export_settings['gltf_lod_ratio'] = self.export_lod_ratio
+        export_settings['gltf_lod_primitives'] = {}
+        export_settings['gltf_lod_meshes'] = {}
         export_settings['gltf_current_frame'] = self.export_current_frame
         export_settings['gltf_animations'] = self.export_animations
         export_settings['gltf_def_bones'] = self.export_def_bones
@@ -1241,6 +1443,12 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         export_settings['gltf_lighting_mode'] = self.export_import_convert_lighting_mode
 
         export_settings['gltf_gpu_instances'] = self.export_gpu_instances
+        if self.export_gpu_instances:
+            export_settings['gltf_gpu_instances_scene_wide'] = self.export_gpu_instances_scene_wide
+            export_settings['gltf_gpu_instances_keep_hierarchy'] = self.export_gpu_instances_keep_hierarchy
+        else:
+            export_settings['gltf_gpu_instances_scene_wide'] = False
+            export_settings['gltf_gpu_instances_keep_hierarchy'] = False
 
         export_settings['gltf_try_sparse_sk'] = self.export_try_sparse_sk
         export_settings['gltf_try_omit_sparse_sk'] = self.export_try_omit_sparse_sk
@@ -1421,6 +1629,9 @@ def export_panel_data(layout, operator):
 
         if is_draco_available():
             export_panel_data_compression(body, operator)
+        export_panel_data_quantization(body, operator)
+        export_panel_data_meshopt(body, operator)
+        export_panel_data_lod(body, operator)
 
 
 def export_panel_data_scene_graph(layout, operator):
@@ -1429,6 +1640,12 @@ def export_panel_data_scene_graph(layout, operator):
     if body:
         body.prop(operator, 'export_gn_mesh')
         body.prop(operator, 'export_gpu_instances')
+        col = body.column()
+        col.active = operator.export_gpu_instances
+        col.prop(operator, 'export_gpu_instances_scene_wide')
+        row = col.row()
+        row.active = operator.export_gpu_instances and operator.export_gpu_instances_scene_wide
+        row.prop(operator, 'export_gpu_instances_keep_hierarchy')
         body.prop(operator, 'export_hierarchy_flatten_objs')
         body.prop(operator, 'export_hierarchy_full_collections')
 
@@ -1451,6 +1668,7 @@ def export_panel_data_mesh(layout, operator):
 
         col = body.column()
         col.prop(operator, 'export_shared_accessors')
+        col.prop(operator, 'export_optimize_vertex_order')
 
         header, sub_body = body.panel("GLTF_export_data_material_vertex_color", default_closed=True)
         header.label(text="Vertex Colors")
@@ -1488,6 +1706,19 @@ def export_panel_data_material(layout, operator):
         col = body.column()
         col.active = operator.export_image_format != "WEBP"
         col.prop(operator, "export_image_webp_fallback")
+        col = body.column()
+        col.active = operator.export_image_format != "NONE"
+        col.prop(operator, "export_image_max_size")
+        col.prop(operator, "export_image_power_of_two")
+        sub = col.column()
+        sub.active = operator.export_image_max_size > 0 or operator.export_image_power_of_two
+        sub.prop(operator, "export_image_resize_filter")
+        col = body.column()
+        col.active = operator.export_image_format != "NONE"
+        col.prop(operator, "export_image_cache_dir")
+        sub = col.column()
+        sub.active = operator.export_image_cache_dir.strip() != ""
+        sub.prop(operator, "export_image_cache_size")
 
         header, sub_body = body.panel("GLTF_export_data_material_unused", default_closed=True)
         header.label(text="Unused Textures & Images")
@@ -1583,6 +1814,49 @@ def export_panel_data_compression(layout, operator):
         col.prop(operator, 'export_draco_generic_quantization', text="Generic")
 
 
+def export_panel_data_quantization(layout, operator):
+    header, body = layout.panel("GLTF_export_data_quantization", default_closed=True)
+    header.use_property_split = False
+    header.prop(operator, "export_quantize_enable", text="")
+    header.label(text="Quantization")
+    if body:
+        body.active = operator.export_quantize_enable and not (
+            is_draco_available() and operator.export_draco_mesh_compression_enable)
+
+        body.prop(operator, 'export_quantize_position_type')
+
+        col = body.column(align=True)
+        col.prop(operator, 'export_quantize_position_bits', text="Quantize Position")
+        col.prop(operator, 'export_quantize_normal_bits', text="Normal")
+        col.prop(operator, 'export_quantize_texcoord_bits', text="Tex Coord")
+        col.prop(operator, 'export_quantize_color_bits', text="Color")
+
+
+def export_panel_data_meshopt(layout, operator):
+    header, body = layout.panel("GLTF_export_data_meshopt", default_closed=True)
+    header.use_property_split = False
+    header.prop(operator, "export_meshopt_compression_enable", text="")
+    header.label(text="Meshopt Compression")
+    if body:
+        body.active = operator.export_meshopt_compression_enable and not (
+            is_draco_available() and operator.export_draco_mesh_compression_enable)
+
+        body.prop(operator, 'export_meshopt_float_bits')
+
+
+def export_panel_data_lod(layout, operator):
+    header, body = layout.panel("GLTF_export_data_lod", default_closed=True)
+    header.use_property_split = False
+    header.prop(operator, "export_lods", text="")
+    header.label(text="Levels of Detail")
+    if body:
+        body.active = operator.export_lods and not (
+            is_draco_available() and operator.export_draco_mesh_compression_enable)
+
+        body.prop(operator, 'export_lod_count')
+        body.prop(operator, 'export_lod_ratio')
+
+
 def export_panel_animation(layout, operator):
     header, body = layout.panel("GLTF_export_animation", default_closed=True)
     header.use_property_split = False
@@ -1789,6 +2063,26 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
         default=True
     )
 
+    import_embedded_images: EnumProperty(
+        name='Embedded Images',
+        items=(('PACK', 'Pack',
+                'Pack images embedded in the glTF file into the .blend file'),
+               ('FILES', 'Temporary Files',
+                'Write images embedded in the glTF file to a temporary directory, '
+                'and load them from there. Images are only read when used, and can be packed later')),
+        description='How images embedded in the glTF file (in buffers or data URIs) are stored',
+        default='PACK',
+    )
+
+    import_image_deduplication: BoolProperty(
+        name='Merge Identical Images',
+        description=(
+            'Create a single Blender image for glTF images with the same content, '
+            'even when stored in different files or buffers'
+        ),
+        default=False,
+    )
+
     merge_vertices: BoolProperty(
         name='Merge Vertices',
         description=(
@@ -1851,6 +2145,15 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
         default=True,
     )
 
+    import_skinning_double_precision: BoolProperty(
+        name='Double Precision Skinning',
+        description=(
+            'Compute skinned meshes in the bind pose with double precision. '
+            'More accurate for meshes far from the origin or with large joint transforms'
+        ),
+        default=False,
+    )
+
     import_webp_texture: BoolProperty(
         name='Import WebP textures',
         description=(
@@ -1860,6 +2163,76 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
         default=False,
     )
 
+    import_merge_materials: BoolProperty(
+        name='Merge Identical Materials',
+        description=(
+            'Create a single Blender material for glTF materials that only differ by their names. '
+            'Materials animated with KHR_animation_pointer are never merged'
+        ),
+        default=False,
+    )
+
+    import_material_templates: BoolProperty(
+        name='Material Templates',
+        description=(
+            'Build the node tree of materials with the same nodes (but different values) only once, '
+            'other materials are copies with their own values. Faster for scenes with many materials. '
+            'Not used for materials animated with KHR_animation_pointer, or when import extensions are enabled'
+        ),
+        default=False,
+    )
+
+    import_gpu_instances: EnumProperty(
+        name='GPU Instances',
+        items=(('OBJECTS', 'Objects',
+                'Create an object for each instance of EXT_mesh_gpu_instancing'),
+               ('GEOMETRY_NODES', 'Geometry Nodes',
+                'Create a single object for all instances of a node, '
+                'instancing the mesh on points with a Geometry Nodes modifier. '
+                'Much faster for many instances'),
+               ),
+        description='How instances of EXT_mesh_gpu_instancing are imported',
+        default='OBJECTS',
+    )
+
+    import_keyframe_decimation: EnumProperty(
+        name='Keyframe Decimation',
+        items=(('NONE', 'None',
+                'Keep all keyframes'),
+               ('LINEAR', 'Linear',
+                'Remove keyframes that interpolation of remaining keyframes reproduces within tolerances'),
+               ('BEZIER', 'Bézier',
+                'Remove keyframes that a Bézier curve through remaining keyframes reproduces within tolerances. '
+                'Linear animations are then imported with Bézier interpolation. '
+                'Best for baked animations'),
+               ),
+        description='Simplify animations, removing keyframes while keeping curves within tolerances',
+        default='NONE',
+    )
+
+    import_decimation_location_tolerance: FloatProperty(
+        name='Location Tolerance',
+        description='Maximum distance between decimated and original locations',
+        default=0.001,
+        min=0.0,
+        subtype='DISTANCE',
+    )
+
+    import_decimation_rotation_tolerance: FloatProperty(
+        name='Rotation Tolerance',
+        description='Maximum angle between decimated and original rotations',
+        default=0.0017453292519943296,  # 0.1°
+        min=0.0,
+        subtype='ANGLE',
+    )
+
+    import_decimation_value_tolerance: FloatProperty(
+        name='Value Tolerance',
+        description='Maximum difference between decimated and original scales, shape key weights and other values',
+        default=0.001,
+        min=0.0,
+    )
+
     def draw(self, context):
         operator = self
         layout = self.layout
@@ -1868,12 +2241,19 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
         layout.use_property_decorate = False  # No animation.
 
         layout.prop(self, 'import_pack_images')
+        layout.prop(self, 'import_embedded_images')
+        layout.prop(self, 'import_image_deduplication')
         layout.prop(self, 'merge_vertices')
         layout.prop(self, 'import_shading')
         layout.prop(self, 'guess_original_bind_pose')
+        layout.prop(self, 'import_skinning_double_precision')
         layout.prop(self, 'export_import_convert_lighting_mode')
         layout.prop(self, 'import_webp_texture')
+        layout.prop(self, 'import_merge_materials')
+        layout.prop(self, 'import_material_templates')
+        layout.prop(self, 'import_gpu_instances')
         import_bone_panel(layout, operator)
+        import_animation_panel(layout, operator)
 
         import_panel_user_extension(context, layout)
 
@@ -1971,6 +2351,17 @@ def import_bone_panel(layout, operator):
             body.prop(operator, 'bone_shape_scale_factor')
 
 
+def import_animation_panel(layout, operator):
+    header, body = layout.panel("GLTF_import_animation", default_closed=True)
+    header.label(text="Animation")
+    if body:
+        body.prop(operator, 'import_keyframe_decimation')
+        if operator.import_keyframe_decimation != 'NONE':
+            body.prop(operator, 'import_decimation_location_tolerance')
+            body.prop(operator, 'import_decimation_rotation_tolerance')
+            body.prop(operator, 'import_decimation_value_tolerance')
+
+
 def import_panel_user_extension(context, layout):
     for draw in importer_extension_layout_draw.values():
         draw(context, layout)
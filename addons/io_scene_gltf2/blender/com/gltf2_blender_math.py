@@ -14,6 +14,7 @@
 
 import typing
 import math
+import numpy as np
 from mathutils import Matrix, Vector, Quaternion, Euler
 
 from .data_path import get_target_property_name
@@ -217,3 +218,103 @@ def nearby_signed_perm_matrix(rot):
     z[(k + 2) % 3] = 0
 
     return m
+
+
+def np_trs_to_matrices(translation, rotation, scale):
+    """Compose (N,3) translations, (N,4) glTF (xyzw) quaternions and (N,3) scales into (N,4,4) matrices."""
+    x, y, z, w = rotation[:, 0], rotation[:, 1], rotation[:, 2], rotation[:, 3]
+
+    mats = np.zeros((len(translation), 4, 4), dtype=np.float64)
+    mats[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    mats[:, 0, 1] = 2 * (x * y - z * w)
+    mats[:, 0, 2] = 2 * (x * z + y * w)
+    mats[:, 1, 0] = 2 * (x * y + z * w)
+    mats[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    mats[:, 1, 2] = 2 * (y * z - x * w)
+    mats[:, 2, 0] = 2 * (x * z - y * w)
+    mats[:, 2, 1] = 2 * (y * z + x * w)
+    mats[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    mats[:, :3, :3] *= scale[:, np.newaxis, :]
+    mats[:, :3, 3] = translation
+    mats[:, 3, 3] = 1
+    return mats
+
+
+def np_matrices_to_trs(mats):
+    """Decompose (N,4,4) matrices into (N,3) translations, (N,4) glTF (xyzw) quaternions and (N,3) scales."""
+    translation = mats[:, :3, 3].copy()
+
+    basis = mats[:, :3, :3]
+    scale = np.linalg.norm(basis, axis=1)
+    # Negative determinant: flip one axis, so that the rotation part is a proper rotation
+    scale[np.linalg.det(basis) < 0, 0] *= -1
+    safe_scale = np.where(scale == 0, 1, scale)
+    rot = basis / safe_scale[:, np.newaxis, :]
+
+    # Rotation matrix to quaternion, choosing the most stable formula for each matrix
+    trace = rot[:, 0, 0] + rot[:, 1, 1] + rot[:, 2, 2]
+    quats = np.empty((len(mats), 4), dtype=np.float64)
+
+    case_w = trace > 0
+    case_x = ~case_w & (rot[:, 0, 0] >= rot[:, 1, 1]) & (rot[:, 0, 0] >= rot[:, 2, 2])
+    case_y = ~case_w & ~case_x & (rot[:, 1, 1] >= rot[:, 2, 2])
+    case_z = ~case_w & ~case_x & ~case_y
+
+    r = rot[case_w]
+    s = np.sqrt(1 + r[:, 0, 0] + r[:, 1, 1] + r[:, 2, 2]) * 2
+    quats[case_w] = np.stack(((r[:, 2, 1] - r[:, 1, 2]) / s,
+                              (r[:, 0, 2] - r[:, 2, 0]) / s,
+                              (r[:, 1, 0] - r[:, 0, 1]) / s,
+                              0.25 * s), axis=1)
+    r = rot[case_x]
+    s = np.sqrt(1 + r[:, 0, 0] - r[:, 1, 1] - r[:, 2, 2]) * 2
+    quats[case_x] = np.stack((0.25 * s,
+                              (r[:, 0, 1] + r[:, 1, 0]) / s,
+                              (r[:, 0, 2] + r[:, 2, 0]) / s,
+                              (r[:, 2, 1] - r[:, 1, 2]) / s), axis=1)
+    r = rot[case_y]
+    s = np.sqrt(1 + r[:, 1, 1] - r[:, 0, 0] - r[:, 2, 2]) * 2
+    quats[case_y] = np.stack(((r[:, 0, 1] + r[:, 1, 0]) / s,
+                              0.25 * s,
+                              (r[:, 1, 2] + r[:, 2, 1]) / s,
+                              (r[:, 0, 2] - r[:, 2, 0]) / s), axis=1)
+    r = rot[case_z]
+    s = np.sqrt(1 + r[:, 2, 2] - r[:, 0, 0] - r[:, 1, 1]) * 2
+    quats[case_z] = np.stack(((r[:, 0, 2] + r[:, 2, 0]) / s,
+                              (r[:, 1, 2] + r[:, 2, 1]) / s,
+                              0.25 * s,
+                              (r[:, 1, 0] - r[:, 0, 1]) / s), axis=1)
+
+    quats /= np.linalg.norm(quats, axis=1)[:, np.newaxis]
+
+    return translation, quats, scale
+
+
+def np_matrices_are_trs(mats, tolerance=1e-5):
+    """
+    Mask of (N,4,4) matrices that a TRS can represent: matrices with shear (from a non uniform scale
+    followed by a rotation) can't be decomposed without changing them. Tolerance is relative to the matrix scale.
+    """
+    rebuilt = np_trs_to_matrices(*np_matrices_to_trs(mats))
+    error = np.abs(rebuilt[:, :3, :3] - mats[:, :3, :3]).max(axis=(1, 2))
+    return error <= tolerance * np.abs(mats[:, :3, :3]).max(axis=(1, 2))
+
+
+def np_quaternion_multiply(a, b):
+    """Products of Blender (wxyz) quaternions, as (N,4) arrays (or a single (4,) quaternion, broadcasted)."""
+    aw, ax, ay, az = np.moveaxis(np.asarray(a), -1, 0)
+    bw, bx, by, bz = np.moveaxis(np.asarray(b), -1, 0)
+    return np.stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ), axis=-1)
+
+
+def np_quaternion_rotate(rotation, vectors):
+    """Rotate (N,3) vectors by (N,4) glTF (xyzw) quaternions."""
+    q_vec = rotation[:, :3]
+    q_w = rotation[:, 3:4]
+    uv = np.cross(q_vec, vectors)
+    return vectors + 2 * (q_w * uv + np.cross(q_vec, uv))
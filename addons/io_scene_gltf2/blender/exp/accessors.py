@@ -57,10 +57,7 @@ def array_to_accessor(
     # Not trying to check if sparse is better
     if sparse_type is None:
 
-        buffer_view = gltf2_io_binary_data.BinaryData(
-            array.tobytes(),
-            gltf2_io_constants.BufferViewTarget.ARRAY_BUFFER,
-        )
+        buffer_view = __vertex_binary_data(array)
 
         amax = None
         amin = None
@@ -126,6 +123,28 @@ def array_to_accessor(
     )
 
 
+def __vertex_binary_data(array):
+    """
+    Each element of a vertex attribute must be aligned to 4 bytes.
+    Elements of quantized attributes (for example VEC3 of shorts) are padded, using a byte stride.
+    """
+    element_size = array.itemsize * (array.shape[1] if array.ndim > 1 else 1)
+    if element_size % 4 == 0:
+        return gltf2_io_binary_data.BinaryData(
+            array.tobytes(),
+            gltf2_io_constants.BufferViewTarget.ARRAY_BUFFER,
+        )
+
+    byte_stride = (element_size + 3) // 4 * 4
+    padded = np.zeros((len(array), byte_stride // array.itemsize), dtype=array.dtype)
+    padded[:, :element_size // array.itemsize] = array.reshape(len(array), -1)
+    return gltf2_io_binary_data.BinaryData(
+        padded.tobytes(),
+        gltf2_io_constants.BufferViewTarget.ARRAY_BUFFER,
+        byteStride=byte_stride,
+    )
+
+
 def __try_sparse_accessor(array):
     """
     Returns an AccessorSparse for array, or None if
@@ -15,6 +15,7 @@
 import os
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import bpy
 import sys
@@ -22,10 +23,12 @@ import traceback
 
 from ...io.exp import export as gltf2_io_export
 from ...io.exp import draco as gltf2_io_draco_compression_extension
+from ...io.exp.texture_cache import TextureCache
 from ...io.exp.user_extensions import export_user_extensions
 from ..com import json_util
 from . import gather as gltf2_blender_gather
 from .exporter import GlTF2Exporter
+from .quantization import log_quantization_report
 
 
 def save(context, export_settings):
@@ -62,9 +65,22 @@ def save(context, export_settings):
 
 def __export(export_settings):
     exporter = GlTF2Exporter(export_settings)
-    __gather_gltf(exporter, export_settings)
-    buffer = __create_buffer(exporter, export_settings)
-    exporter.finalize_images()
+
+    export_settings['gltf_image_cache'] = None
+    if export_settings['gltf_image_cache_dir'] is not None:
+        export_settings['gltf_image_cache'] = TextureCache(
+            export_settings['gltf_image_cache_dir'], export_settings['gltf_image_cache_size'])
+
+    # Calculated images are encoded in background, while gathering continues
+    with ThreadPoolExecutor() as image_encoder:
+        export_settings['gltf_image_encoder'] = image_encoder
+        __gather_gltf(exporter, export_settings)
+        # All images are gathered, release source pixels
+        export_settings['gltf_image_pixel_cache'] = None
+        buffer = __create_buffer(exporter, export_settings)
+        exporter.finalize_images()
+    export_settings['gltf_image_encoder'] = None
+    __trim_image_cache(export_settings)
 
     export_user_extensions('gather_gltf_extensions_hook', export_settings, exporter.glTF)
     exporter.traverse_extensions()
@@ -84,6 +100,10 @@ def __export(export_settings):
     # Volum is a special case where we need to export only if transmission is used
     __check_volume(json, export_settings)
 
+    # KHR_mesh_quantization has no data in json, so it is not detected by __fix_json
+    if export_settings['gltf_quantization_report']['used'] is True:
+        export_settings['gltf_need_to_keep_extension_declaration'].append('KHR_mesh_quantization')
+
     __manage_extension_declaration(json, export_settings)
 
     # We need to run it again, as we can now have some "extensions" dict that are empty
@@ -224,11 +244,27 @@ def __gather_gltf(exporter, export_settings):
     for animation in animations:
         exporter.add_animation(animation)
     exporter.manage_gpu_instancing_nodes(export_settings)
+    if export_settings['gltf_lods']:
+        exporter.manage_lod_nodes()
+    if export_settings['gltf_quantize']:
+        exporter.manage_quantized_nodes()
+        if export_settings['gltf_quantization_report']['used'] is True:
+            exporter.add_quantization_extension()
+        log_quantization_report(export_settings)
     exporter.traverse_unused_skins(unused_skins)
     exporter.traverse_additional_textures()
     exporter.traverse_additional_images()
 
 
+def __trim_image_cache(export_settings):
+    cache = export_settings['gltf_image_cache']
+    if cache is None:
+        return
+    export_settings['log'].info("Texture cache: {} textures reused, {} encoded".format(cache.hits, cache.misses))
+    cache.trim()
+    export_settings['gltf_image_cache'] = None
+
+
 def __create_buffer(exporter, export_settings):
     buffer = bytes()
     if export_settings['gltf_format'] == 'GLB':
@@ -13,8 +13,12 @@
 # limitations under the License.
 
 import bpy
+import hashlib
 import re
 import os
+import uuid
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 from ... import get_version_string
@@ -22,11 +26,41 @@ from ...io.com import gltf2_io, gltf2_io_extensions
 from ...io.com.path import path_to_uri, uri_to_path
 from ...io.com.constants import ComponentType, DataType
 from ...io.exp import binary_data as gltf2_io_binary_data, buffer as gltf2_io_buffer, image_data as gltf2_io_image_data
+from ...io.exp import meshopt as gltf2_io_meshopt
 from ...io.exp.user_extensions import export_user_extensions
+from ..com.gltf2_blender_math import np_trs_to_matrices, np_matrices_to_trs, np_matrices_are_trs, np_quaternion_rotate
 from .accessors import gather_accessor
 from .material.image import get_gltf_image_from_blender_image
 
 
+def _write_file_if_changed(path, data):
+    """
+    Write a file, unless it already has this content.
+    The file is written to a temporary file, then renamed: readers never see a partial file.
+    :return: True if the file was written
+    """
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+
+    # Temporary file in the same folder, so that renaming is atomic
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, ".{}.{}.tmp".format(name, uuid.uuid4().hex))
+    try:
+        with open(tmp_path, 'xb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
 class AdditionalData:
     def __init__(self):
         additional_textures = []
@@ -81,6 +115,10 @@ class GlTF2Exporter:
         self.__buffer = gltf2_io_buffer.Buffer()
         self.__images = {}
 
+        # Content digest of exported images: glTF image index
+        self.__image_digests = {}
+        self.__image_dedup_report = {'count': 0, 'bytes': 0}
+
         # mapping of all glTFChildOfRootProperty types to their corresponding root level arrays
         self.__childOfRootPropertyTypeLookup = {
             gltf2_io.Accessor: self.__gltf.accessors,
@@ -128,6 +166,11 @@ class GlTF2Exporter:
         if self.__finalized:
             raise RuntimeError("Tried to finalize buffers for finalized glTF file")
 
+        fallback_length = 0
+        if self.export_settings['gltf_meshopt_compression'] is True:
+            self.__buffer, fallback_length = gltf2_io_meshopt.compress_buffer_views(
+                self.__gltf, self.__buffer, self.export_settings)
+
         if self.__buffer.byte_length > 0:
             if is_glb:
                 uri = None
@@ -147,6 +190,19 @@ class GlTF2Exporter:
             )
             self.__gltf.buffers.append(buffer)
 
+        if fallback_length > 0:
+            # Compressed bufferViews reference this buffer, which has no data
+            fallback_buffer = gltf2_io.Buffer(
+                byte_length=fallback_length,
+                extensions={'EXT_meshopt_compression': {'fallback': True}},
+                extras=None,
+                name=None,
+                uri=None
+            )
+            self.__gltf.buffers.append(fallback_buffer)
+            self.__append_unique_and_get_index(self.__gltf.extensions_used, 'EXT_meshopt_compression')
+            self.__append_unique_and_get_index(self.__gltf.extensions_required, 'EXT_meshopt_compression')
+
         self.__finalized = True
 
         if is_glb:
@@ -161,19 +217,40 @@ class GlTF2Exporter:
         self.__gltf.extensions_required.append('KHR_draco_mesh_compression')
         self.__gltf.extensions_used.append('KHR_draco_mesh_compression')
 
+    def add_quantization_extension(self):
+        """
+        Register KHR_mesh_quantization extension as *used* and *required*.
+
+        :return:
+        """
+        self.__append_unique_and_get_index(self.__gltf.extensions_required, 'KHR_mesh_quantization')
+        self.__append_unique_and_get_index(self.__gltf.extensions_used, 'KHR_mesh_quantization')
+
     def finalize_images(self):
         """
         Write all images.
         """
         output_path = self.export_settings['gltf_texturedirectory']
 
-        if self.__images:
-            os.makedirs(output_path, exist_ok=True)
+        if self.__image_dedup_report['count'] > 0:
+            self.export_settings['log'].info("Texture deduplication: {} images reused, {} bytes saved".format(
+                self.__image_dedup_report['count'], self.__image_dedup_report['bytes']))
+
+        if not self.__images:
+            return
+
+        os.makedirs(output_path, exist_ok=True)
 
-        for name, image in self.__images.items():
-            dst_path = output_path + "/" + name
-            with open(dst_path, 'wb') as f:
-                f.write(image.data)
+        # Files are written in parallel, as most of the time is spent waiting for I/O (or for encoding)
+        with ThreadPoolExecutor() as executor:
+            written = list(executor.map(
+                lambda item: _write_file_if_changed(output_path + "/" + item[0], item[1].data),
+                self.__images.items()))
+
+        unchanged = written.count(False)
+        if unchanged > 0:
+            self.export_settings['log'].info(
+                "Texture files: {} written, {} unchanged".format(len(written) - unchanged, unchanged))
 
     def manage_gpu_instancing(self, node, also_mesh=False):
         instances = {}
@@ -224,59 +301,11 @@ class GlTF2Exporter:
             holder = holders[idx]
 
             # Let's retrieve TRS of instances
-            translation = []
-            rotation = []
-            scale = []
-            for inst_node_idx in insts:
-                inst_node = self.__gltf.nodes[inst_node_idx]
-                t = inst_node.translation if inst_node.translation is not None else [0, 0, 0]
-                r = inst_node.rotation if inst_node.rotation is not None else [0, 0, 0, 1]
-                s = inst_node.scale if inst_node.scale is not None else [1, 1, 1]
-                for i in t:
-                    translation.append(i)
-                for i in r:
-                    rotation.append(i)
-                for i in s:
-                    scale.append(i)
-
-            # Create Accessors for the extension
-            ext = {}
-            ext['attributes'] = {}
-            ext['attributes']['TRANSLATION'] = gather_accessor(
-                gltf2_io_binary_data.BinaryData.from_list(translation, ComponentType.Float),
-                ComponentType.Float,
-                len(translation) // 3,
-                None,
-                None,
-                DataType.Vec3,
-                None
-            )
-            ext['attributes']['ROTATION'] = gather_accessor(
-                gltf2_io_binary_data.BinaryData.from_list(rotation, ComponentType.Float),
-                ComponentType.Float,
-                len(rotation) // 4,
-                None,
-                None,
-                DataType.Vec4,
-                None
-            )
-            ext['attributes']['SCALE'] = gather_accessor(
-                gltf2_io_binary_data.BinaryData.from_list(scale, ComponentType.Float),
-                ComponentType.Float,
-                len(scale) // 3,
-                None,
-                None,
-                DataType.Vec3,
-                None
-            )
+            translation = np.array([self.__gltf.nodes[i].translation or [0, 0, 0] for i in insts], dtype=np.float32)
+            rotation = np.array([self.__gltf.nodes[i].rotation or [0, 0, 0, 1] for i in insts], dtype=np.float32)
+            scale = np.array([self.__gltf.nodes[i].scale or [1, 1, 1] for i in insts], dtype=np.float32)
 
-            # Add extension to the Node, and traverse it
-            if not holder.extensions:
-                holder.extensions = {}
-            holder.extensions["EXT_mesh_gpu_instancing"] = gltf2_io_extensions.Extension(
-                'EXT_mesh_gpu_instancing', ext, False)
-            holder.mesh = inst_key
-            self.__traverse(holder.extensions)
+            self.__set_gpu_instancing_extension(holder, inst_key, translation, rotation, scale)
 
             # Remove children from original Empty
             new_children = []
@@ -287,61 +316,370 @@ class GlTF2Exporter:
 
             self.nodes_idx_to_remove.extend(insts)
 
+    def __set_gpu_instancing_extension(self, holder, mesh, translation, rotation, scale):
+        # Create Accessors for the extension
+        ext = {}
+        ext['attributes'] = {}
+        for attribute, data, data_type in [
+                ('TRANSLATION', translation, DataType.Vec3),
+                ('ROTATION', rotation, DataType.Vec4),
+                ('SCALE', scale, DataType.Vec3)]:
+            ext['attributes'][attribute] = gather_accessor(
+                gltf2_io_binary_data.BinaryData(data.astype(np.float32).tobytes()),
+                ComponentType.Float,
+                len(data),
+                None,
+                None,
+                data_type,
+                self.export_settings
+            )
+
+        dequantization = self.__get_mesh_dequantization(mesh)
+        if dequantization is not None:
+            # Instance transforms include the dequantization of positions
+            offset, node_scale = dequantization
+            translation = translation + np_quaternion_rotate(rotation, scale * offset)
+            scale = scale * node_scale
+
+        # Add extension to the Node, and traverse it
+        if not holder.extensions:
+            holder.extensions = {}
+        holder.extensions["EXT_mesh_gpu_instancing"] = gltf2_io_extensions.Extension(
+            'EXT_mesh_gpu_instancing', ext, False)
+        holder.mesh = mesh
+        self.__traverse(holder.extensions)
+
+    def __get_animated_nodes(self):
+        animated = set()
+        pointer_regex = re.compile(r"^/nodes/(\d+)/")
+        for animation in self.__gltf.animations:
+            for channel in animation.channels:
+                if channel.target.node is not None:
+                    animated.add(channel.target.node)
+                elif channel.target.extensions and "KHR_animation_pointer" in channel.target.extensions.keys():
+                    found = pointer_regex.match(channel.target.extensions["KHR_animation_pointer"]["pointer"])
+                    if found:
+                        animated.add(int(found.group(1)))
+        # Joints are moved by the skinning / armature animations
+        for skin in self.__gltf.skins:
+            animated.update(skin.joints)
+        return animated
+
+    def manage_scene_gpu_instancing(self, scene):
+        """
+        Scene-wide detection of instances.
+
+        All leaf nodes of the scene referencing the same mesh, without skin or morph weights,
+        are grouped under a generated holder node using EXT_mesh_gpu_instancing.
+        Instances with a static hierarchy are collapsed into a single holder at scene root,
+        using their world transforms.
+        Instances with an animated parent (or all, if hierarchy is kept) get a holder under their parent.
+        """
+        keep_hierarchy = self.export_settings['gltf_gpu_instances_keep_hierarchy']
+        animated = self.__get_animated_nodes()
+
+        # Breadth first traversal: parents are always visited before their children
+        order = list(scene.nodes)
+        parents = {idx: None for idx in scene.nodes}
+        i = 0
+        while i < len(order):
+            for child_idx in self.__gltf.nodes[order[i]].children:
+                parents[child_idx] = order[i]
+                order.append(child_idx)
+            i += 1
+
+        static = {}
+        for idx in order:
+            parent = parents[idx]
+            static[idx] = idx not in animated and (parent is None or static[parent])
+
+        instances = {}
+        for idx in order:
+            node = self.__gltf.nodes[idx]
+            if node.mesh is None or node.children or node.skin is not None or node.weights is not None:
+                continue
+            if node.camera is not None or node.extensions or node.matrix is not None or idx in animated:
+                continue
+            parent = parents[idx]
+            if parent is None or (static[parent] and not keep_hierarchy):
+                key = (None, node.mesh)
+            else:
+                key = (parent, node.mesh)
+            instances.setdefault(key, []).append(idx)
+
+        if all(len(v) == 1 for v in instances.values()):
+            return
+
+        # Local TRS of all visited nodes
+        positions = {idx: pos for pos, idx in enumerate(order)}
+        translation = np.array([self.__gltf.nodes[i].translation or [0, 0, 0] for i in order], dtype=np.float64)
+        rotation = np.array([self.__gltf.nodes[i].rotation or [0, 0, 0, 1] for i in order], dtype=np.float64)
+        scale = np.array([self.__gltf.nodes[i].scale or [1, 1, 1] for i in order], dtype=np.float64)
+
+        # World matrices, computed depth by depth
+        world = None
+        if any(k[0] is None for k in instances.keys()):
+            world = np_trs_to_matrices(translation, rotation, scale)
+            parent_pos = np.array([positions[parents[i]] if parents[i] is not None else -1 for i in order])
+            depth = np.zeros(len(order), dtype=np.int32)
+            for pos in range(len(order)):
+                if parent_pos[pos] != -1:
+                    depth[pos] = depth[parent_pos[pos]] + 1
+            for d in range(1, depth.max() + 1):
+                at_depth = np.nonzero(depth == d)[0]
+                world[at_depth] = np.matmul(world[parent_pos[at_depth]], world[at_depth])
+
+            # World matrices with shear (non uniform scale of a parent, rotation of a child) have no TRS:
+            # these instances stay under their parent
+            for key in [k for k in instances.keys() if k[0] is None]:
+                insts = instances[key]
+                valid = np_matrices_are_trs(world[[positions[i] for i in insts]])
+                instances[key] = [i for i, v in zip(insts, valid) if v]
+                for i in [i for i, v in zip(insts, valid) if not v]:
+                    instances.setdefault((parents[i], key[1]), []).append(i)
+
+        instances = {k: v for k, v in instances.items() if len(v) > 1}
+        if len(instances) == 0:
+            return
+
+        removed = set()
+        for (parent, mesh), insts in instances.items():
+            pos = np.array([positions[i] for i in insts])
+            if parent is None:
+                inst_t, inst_r, inst_s = np_matrices_to_trs(world[pos])
+                name = self.__gltf.meshes[mesh].name or "Instances"
+            else:
+                inst_t, inst_r, inst_s = translation[pos], rotation[pos], scale[pos]
+                name = (self.__gltf.nodes[parent].name or "Node") + "." + str(len(self.__gltf.nodes[parent].children))
+
+            holder = gltf2_io.Node(
+                camera=None,
+                children=[],
+                extensions=None,
+                extras=None,
+                matrix=None,
+                mesh=None,
+                name=name,
+                rotation=None,
+                scale=None,
+                skin=None,
+                translation=None,
+                weights=None,
+            )
+            holder = self.__traverse_property(holder)
+            idx = self.__to_reference(holder)
+            if parent is None:
+                scene.nodes.append(idx)
+            else:
+                self.__gltf.nodes[parent].children.append(idx)
+
+            self.__set_gpu_instancing_extension(self.__gltf.nodes[idx], mesh, inst_t, inst_r, inst_s)
+
+            removed.update(insts)
+            self.nodes_idx_to_remove.extend(insts)
+
+        # Detach instances from their original parents
+        scene.nodes = [i for i in scene.nodes if i not in removed]
+        for parent in set(parents[i] for i in removed if parents[i] is not None):
+            node = self.__gltf.nodes[parent]
+            node.children = [i for i in node.children if i not in removed]
+
+    def __get_mesh_dequantization(self, mesh_idx):
+        """Offset and scale needed to dequantize the positions of a mesh, None if not quantized."""
+        if not self.export_settings['gltf_quantized_positions']:
+            return None
+        position = self.__gltf.meshes[mesh_idx].primitives[0].attributes.get('POSITION')
+        if position is None:
+            return None
+        return self.export_settings['gltf_quantized_positions'].get(id(self.__gltf.accessors[position]))
+
+    def manage_quantized_nodes(self):
+        """
+        Set the dequantization transform of quantized positions (KHR_mesh_quantization) on nodes.
+
+        Static leaf nodes get the transform composed into their TRS.
+        Other nodes (animated, with children, or using a matrix) get a child node holding the mesh.
+        Instancing holders already have the transform in their instance attributes.
+        """
+        if not self.export_settings['gltf_quantized_positions']:
+            return
+
+        animated = self.__get_animated_nodes()
+
+        for idx in range(len(self.__gltf.nodes)):
+            node = self.__gltf.nodes[idx]
+            if node.mesh is None:
+                continue
+            if node.extensions and "EXT_mesh_gpu_instancing" in node.extensions.keys():
+                continue
+            dequantization = self.__get_mesh_dequantization(node.mesh)
+            if dequantization is None:
+                continue
+            offset, node_scale = dequantization
+
+            if not node.children and node.matrix is None and idx not in animated:
+                translation = np.array([node.translation or [0, 0, 0]], dtype=np.float64)
+                rotation = np.array([node.rotation or [0, 0, 0, 1]], dtype=np.float64)
+                scale = np.array([node.scale or [1, 1, 1]], dtype=np.float64)
+                translation = translation + np_quaternion_rotate(rotation, scale * offset)
+                node.translation = [float(v) for v in translation[0]]
+                node.scale = [float(v) for v in scale[0] * node_scale]
+                continue
+
+            child = gltf2_io.Node(
+                camera=None,
+                children=[],
+                extensions=None,
+                extras=None,
+                matrix=None,
+                mesh=node.mesh,
+                name=node.name,
+                rotation=None,
+                scale=[float(node_scale)] * 3,
+                skin=None,
+                translation=[float(v) for v in offset],
+                weights=None,
+            )
+            child = self.__traverse_property(child)
+            child_idx = self.__to_reference(child)
+            node.mesh = None
+            if node.children is None:
+                node.children = []
+            node.children.append(child_idx)
+
+    def manage_lod_nodes(self):
+        """
+        Add levels of detail to nodes using a mesh with generated levels (MSFT_lod).
+
+        Only static leaf nodes using TRS get levels of detail. Level nodes are copies of the node
+        using the simplified meshes; they are not part of the scene.
+        Screen coverage thresholds are set in node extras (MSFT_screencoverage).
+        """
+        if not self.export_settings['gltf_lod_meshes']:
+            return
+
+        animated = self.__get_animated_nodes()
+
+        for idx in range(len(self.__gltf.nodes)):
+            node = self.__gltf.nodes[idx]
+            if node.mesh is None or node.children or node.matrix is not None or idx in animated:
+                continue
+            if node.extensions and "EXT_mesh_gpu_instancing" in node.extensions.keys():
+                continue
+            lods = self.export_settings['gltf_lod_meshes'].get(id(self.__gltf.meshes[node.mesh]))
+            if lods is None:
+                continue
+            _, lod_meshes = lods
+
+            ids = []
+            for level, lod_mesh in enumerate(lod_meshes):
+                lod_node = gltf2_io.Node(
+                    camera=None,
+                    children=[],
+                    extensions=None,
+                    extras=None,
+                    matrix=None,
+                    mesh=lod_mesh,
+                    name=node.name + "_LOD" + str(level + 1) if node.name else None,
+                    rotation=node.rotation,
+                    scale=node.scale,
+                    skin=node.skin,
+                    translation=node.translation,
+                    weights=node.weights,
+                )
+                lod_node = self.__traverse_property(lod_node)
+                ids.append(self.__to_reference(lod_node))
+
+            if not node.extensions:
+                node.extensions = {}
+            node.extensions["MSFT_lod"] = gltf2_io_extensions.Extension('MSFT_lod', {'ids': ids}, False)
+            self.__traverse(node.extensions)
+
+            # Geometric thresholds, following the triangle count ratio. Last level is never culled
+            ratio = self.export_settings['gltf_lod_ratio']
+            coverage = [ratio ** (level + 1) for level in range(len(ids))] + [0.0]
+            if not node.extras:
+                node.extras = {}
+            node.extras["MSFT_screencoverage"] = coverage
+
     def manage_gpu_instancing_nodes(self, export_settings):
         if export_settings['gltf_gpu_instances'] is True:
+            self.nodes_idx_to_remove = []
             for scene_num in range(len(self.__gltf.scenes)):
                 # Modify the scene data in case of EXT_mesh_gpu_instancing export
 
-                self.nodes_idx_to_remove = []
-                for node_idx in self.__gltf.scenes[scene_num].nodes:
-                    node = self.__gltf.nodes[node_idx]
-                    if node.mesh is None:
-                        self.manage_gpu_instancing(node)
-                    else:
-                        self.manage_gpu_instancing(node, also_mesh=True)
-                    for child_idx in node.children:
-                        child = self.__gltf.nodes[child_idx]
-                        self.manage_gpu_instancing(child, also_mesh=child.mesh is not None)
-
-                # Slides other nodes index
-
-                self.nodes_idx_to_remove.sort()
-                for node_idx in self.__gltf.scenes[scene_num].nodes:
-                    self.recursive_slide_node_idx(node_idx)
-
-                new_node_list = []
-                for node_idx in self.__gltf.scenes[scene_num].nodes:
-                    len_ = len([i for i in self.nodes_idx_to_remove if i < node_idx])
-                    new_node_list.append(node_idx - len_)
-                self.__gltf.scenes[scene_num].nodes = new_node_list
-
-                for skin in self.__gltf.skins:
-                    new_joint_list = []
-                    for node_idx in skin.joints:
-                        len_ = len([i for i in self.nodes_idx_to_remove if i < node_idx])
-                        new_joint_list.append(node_idx - len_)
-                    skin.joints = new_joint_list
-                    if skin.skeleton is not None:
-                        len_ = len([i for i in self.nodes_idx_to_remove if i < skin.skeleton])
-                        skin.skeleton = skin.skeleton - len_
-
-            # Remove animation channels that was targeting a node that will be removed
-            new_animation_list = []
-            for animation in self.__gltf.animations:
-                new_channel_list = []
-                for channel in animation.channels:
-                    if channel.target.node not in self.nodes_idx_to_remove:
-                        new_channel_list.append(channel)
-                animation.channels = new_channel_list
-                if len(animation.channels) > 0:
-                    new_animation_list.append(animation)
-            self.__gltf.animations = new_animation_list
-
-            # TODO: remove unused animation accessors?
-
-            # And now really remove nodes
-            self.__gltf.nodes = [node for idx, node in enumerate(
-                self.__gltf.nodes) if idx not in self.nodes_idx_to_remove]
+                if export_settings['gltf_gpu_instances_scene_wide'] is True:
+                    self.manage_scene_gpu_instancing(self.__gltf.scenes[scene_num])
+                else:
+                    for node_idx in self.__gltf.scenes[scene_num].nodes:
+                        node = self.__gltf.nodes[node_idx]
+                        if node.mesh is None:
+                            self.manage_gpu_instancing(node)
+                        else:
+                            self.manage_gpu_instancing(node, also_mesh=True)
+                        for child_idx in node.children:
+                            child = self.__gltf.nodes[child_idx]
+                            self.manage_gpu_instancing(child, also_mesh=child.mesh is not None)
+
+            if len(self.nodes_idx_to_remove) == 0:
+                return
+
+            self.remove_nodes(self.nodes_idx_to_remove)
+
+    def remove_nodes(self, nodes_idx_to_remove):
+        """
+        Remove nodes, and slide all node indices referencing remaining nodes.
+
+        The remap table is built once: new index is old index minus number of removed nodes before it.
+        """
+        removed = np.unique(np.array(nodes_idx_to_remove, dtype=np.int64))
+        old_indices = np.arange(len(self.__gltf.nodes), dtype=np.int64)
+        remap = old_indices - np.searchsorted(removed, old_indices, side='left')
+        remap[removed] = -1
+        remap = remap.tolist()
+
+        for scene in self.__gltf.scenes:
+            scene.nodes = [remap[i] for i in scene.nodes if remap[i] != -1]
+
+        for node in self.__gltf.nodes:
+            if node.children:
+                node.children = [remap[i] for i in node.children if remap[i] != -1]
+
+        for skin in self.__gltf.skins:
+            skin.joints = [remap[i] for i in skin.joints]
+            if skin.skeleton is not None:
+                skin.skeleton = remap[skin.skeleton]
+
+        # Remove animation channels that was targeting a node that will be removed, remap others
+        pointer_regex = re.compile(r"^/nodes/(\d+)/")
+        new_animation_list = []
+        for animation in self.__gltf.animations:
+            new_channel_list = []
+            for channel in animation.channels:
+                target = channel.target
+                if target.node is not None:
+                    if remap[target.node] == -1:
+                        continue
+                    target.node = remap[target.node]
+                elif target.extensions and "KHR_animation_pointer" in target.extensions.keys():
+                    pointer = target.extensions["KHR_animation_pointer"]["pointer"]
+                    found = pointer_regex.match(pointer)
+                    if found:
+                        new_idx = remap[int(found.group(1))]
+                        if new_idx == -1:
+                            continue
+                        target.extensions["KHR_animation_pointer"]["pointer"] = \
+                            "/nodes/" + str(new_idx) + pointer[found.end(1):]
+                new_channel_list.append(channel)
+            animation.channels = new_channel_list
+            if len(animation.channels) > 0:
+                new_animation_list.append(animation)
+        self.__gltf.animations = new_animation_list
+
+        # TODO: remove unused animation accessors?
+
+        # And now really remove nodes
+        self.__gltf.nodes[:] = [node for idx, node in enumerate(self.__gltf.nodes) if remap[idx] != -1]
 
     def add_scene(self, scene: gltf2_io.Scene, active: bool = False, export_settings=None):
         """
@@ -359,19 +697,6 @@ class GlTF2Exporter:
         if active:
             self.__gltf.scene = scene_num
 
-    def recursive_slide_node_idx(self, node_idx):
-        node = self.__gltf.nodes[node_idx]
-
-        new_node_children = []
-        for child_idx in node.children:
-            len_ = len([i for i in self.nodes_idx_to_remove if i < child_idx])
-            new_node_children.append(child_idx - len_)
-
-        for child_idx in node.children:
-            self.recursive_slide_node_idx(child_idx)
-
-        node.children = new_node_children
-
     def traverse_unused_skins(self, skins):
         for s in skins:
             self.__traverse(s)
@@ -501,6 +826,36 @@ class GlTF2Exporter:
 
         return node
 
+    def __traverse_image(self, image):
+        """
+        Images with identical encoded content are exported once, whatever their names.
+        For images using an existing file, the content is the source file, so no encoding is needed to compare them.
+        """
+        key, byte_length = self.__get_image_content_key(image)
+        if key is not None and key in self.__image_digests.keys():
+            idx, byte_length = self.__image_digests[key]
+            self.__image_dedup_report['count'] += 1
+            self.__image_dedup_report['bytes'] += byte_length
+            return idx
+
+        image = self.__traverse_property(image)
+        idx = self.__to_reference(image)
+        if key is not None:
+            self.__image_digests[key] = (idx, byte_length)
+        return idx
+
+    def __get_image_content_key(self, image):
+        # Images already traversed (or referencing an original file) have no data anymore
+        if isinstance(image.uri, gltf2_io_image_data.ImageData):
+            data = image.uri.data
+            file_type = image.uri.file_extension
+        elif isinstance(image.buffer_view, gltf2_io_binary_data.BinaryData):
+            data = image.buffer_view.data
+            file_type = image.mime_type
+        else:
+            return None, 0
+        return (file_type, hashlib.blake2b(data, digest_size=16).digest()), len(data)
+
     def __traverse(self, node):
         """
         Recursively traverse a scene graph consisting of gltf compatible elements.
@@ -508,6 +863,9 @@ class GlTF2Exporter:
         The tree is traversed downwards until a primitive is reached. Then any ChildOfRoot property
         is stored in the according list in the glTF and replaced with a index reference in the upper level.
         """
+        if type(node) == gltf2_io.Image:
+            return self.__traverse_image(node)
+
         # traverse nodes of a child of root property type and add them to the glTF root
         if type(node) in self.__childOfRootPropertyTypeLookup:
             node = self.__traverse_property(node)
@@ -0,0 +1,107 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ...io.com import gltf2_io
+from ...io.exp.simplify import simplify
+
+# Weight of normal and texture coordinate differences in the collapse cost
+ATTRIBUTE_WEIGHT = 1e-2
+
+# A level that doesn't remove at least this ratio of the previous level indices ends the chain
+MIN_REDUCTION = 0.05
+
+
+def compute_lod_indices(blender_primitives, shared_attributes, mesh_name, export_settings):
+    """
+    Simplify triangle primitives for each level of detail.
+
+    Each level is simplified from the full resolution indices, vertices are never modified,
+    so that all levels share the vertex attributes of the mesh.
+    Edges and points primitives are kept as is.
+
+    :return: list of levels, each level being a list of indices (one per primitive)
+    """
+    levels = []
+    ratio = export_settings['gltf_lod_ratio']
+    previous_count = sum(len(p['indices']) for p in blender_primitives if p.get('mode') is None)
+    if previous_count == 0:
+        return levels
+
+    for level in range(1, export_settings['gltf_lod_count'] + 1):
+        level_indices = []
+        for primitive in blender_primitives:
+            if primitive.get('mode') is not None or len(primitive['indices']) == 0:
+                level_indices.append(primitive['indices'])
+                continue
+
+            attributes = shared_attributes if shared_attributes is not None else primitive['attributes']
+            indices, _ = simplify(
+                attributes['POSITION']['data'],
+                primitive['indices'],
+                int(len(primitive['indices']) * ratio ** level),
+                attributes=__cost_attributes(attributes)
+            )
+            level_indices.append(indices)
+
+        count = sum(len(i) for i, p in zip(level_indices, blender_primitives) if p.get('mode') is None)
+        if count > previous_count * (1.0 - MIN_REDUCTION):
+            break
+        export_settings['log'].info("LOD {} of {}: {} triangles".format(level, mesh_name, count // 3))
+        levels.append(level_indices)
+        previous_count = count
+
+    return levels
+
+
+def __cost_attributes(attributes):
+    return [(attributes[name]['data'], ATTRIBUTE_WEIGHT) for name in attributes.keys()
+            if name == 'NORMAL' or name.startswith('TEXCOORD_')]
+
+
+def gather_lod_meshes(mesh, export_settings):
+    """
+    Create the meshes of the levels of detail of a glTF mesh, and register them for the nodes using this mesh.
+    Levels use the same attributes, targets and materials than the full resolution mesh, only indices change.
+    """
+    lod_primitives = [export_settings['gltf_lod_primitives'].get(id(primitive)) for primitive in mesh.primitives]
+    if any(levels is None for levels in lod_primitives):
+        return
+
+    level_count = min(len(levels) for levels in lod_primitives)
+    meshes = []
+    for level in range(level_count):
+        meshes.append(gltf2_io.Mesh(
+            extensions=mesh.extensions,
+            extras=mesh.extras,
+            name=mesh.name + "_LOD" + str(level + 1),
+            primitives=[levels[level] for levels in lod_primitives],
+            weights=mesh.weights
+        ))
+
+    if len(meshes) > 0:
+        export_settings['gltf_lod_meshes'][id(mesh)] = (mesh, meshes)
+
+
+def gather_lod_primitive(primitive, lod_indices, export_settings):
+    """Store the primitives of the levels of detail of a glTF primitive."""
+    levels = [gltf2_io.MeshPrimitive(
+        attributes=primitive.attributes,
+        extensions=primitive.extensions,
+        extras=primitive.extras,
+        indices=indices,
+        material=primitive.material,
+        mode=primitive.mode,
+        targets=primitive.targets
+    ) for indices in lod_indices]
+    export_settings['gltf_lod_primitives'][id(primitive)] = levels
@@ -13,11 +13,25 @@
 # limitations under the License.
 
 import bpy
+import hashlib
 import os
 from typing import Optional, Tuple
 import numpy as np
 import tempfile
 import enum
+from concurrent.futures import Future
+from ....io.exp.png import encode_png, encode_png_bands
+from ....io.exp.pixel_cache import PixelCache
+from ....io.exp.resample import fit_size, resample
+
+# Number of rows packed at once
+PACK_BAND_ROWS = 256
+
+# Number of floats converted at once, when storing byte image pixels as uint8
+COMPACT_BLOCK_SIZE = 1 << 22
+
+# Size of the blocks read when hashing source files
+HASH_BLOCK_SIZE = 1 << 20
 
 
 class Channel(enum.IntEnum):
@@ -226,6 +240,10 @@ class ExportImage:
         )
 
     def encode(self, mime_type: Optional[str], export_settings) -> Tuple[bytes, bool]:
+        """
+        Encode the image.
+        Encoded data can be a Future, when PNG encoding of calculated pixels is done in background.
+        """
         self.file_format = {
             "image/jpeg": "JPEG",
             "image/png": "PNG",
@@ -251,7 +269,11 @@ class ExportImage:
                 return self.__encode_unhappy(export_settings), None
         else:
             pixels, width, height, factor = self.numpy_calc(self.stored, export_settings)
-            return self.__encode_from_numpy_array(pixels, (width, height), export_settings), factor
+            size = _fit_size((width, height), export_settings)
+            if size != (width, height):
+                pixels = resample(np.asarray(pixels, np.float32).reshape(height, width, 4), size,
+                                  export_settings['gltf_image_resize_filter']).reshape(-1)
+            return self.__encode_from_numpy_array(pixels, size, export_settings), factor
 
     def __encode_happy(self, export_settings) -> bytes:
         return self.__encode_from_image(self.blender_image(export_settings), export_settings)
@@ -265,6 +287,11 @@ class ExportImage:
                    for fill in self.fills.values())
 
     def __encode_unhappy_udim(self, export_settings) -> bytes:
+        self.__set_partially_used(export_settings)
+        return self.__encode_cached(lambda: self.__fills_fingerprint(export_settings),
+                                    lambda: self.__pack_unhappy_udim(export_settings), export_settings)
+
+    def __pack_unhappy_udim(self, export_settings) -> bytes:
         # We need to assemble the image out of channels.
         # Do it with numpy and image.pixels of the right UDIM tile.
 
@@ -273,7 +300,6 @@ class ExportImage:
             if isinstance(fill, FillImageTile) or isinstance(fill, FillImageRGB2BWTile):
                 if fill.image not in images:
                     images.append((fill.image, fill.tile))
-                    export_settings['exported_images'][fill.image.name] = 2  # 2 = partially used
 
         if not images:
             # No ImageFills; use a 1x1 white pixel
@@ -283,52 +309,35 @@ class ExportImage:
         # We need to open the original UDIM image tile to get size & pixel data
         original_image_sizes = []
         for image, tile in images:
-            src_path = bpy.path.abspath(image.filepath_raw).replace("<UDIM>", tile)
-            with TmpImageGuard() as guard:
-                guard.image = bpy.data.images.load(
-                    src_path,
-                )
-                original_image_sizes.append((guard.image.size[0], guard.image.size[1]))
+            _, size = get_image_tile_pixels(image, tile, None, export_settings)
+            original_image_sizes.append(size)
 
         width = max(image_size[0] for image_size in original_image_sizes)
         height = max(image_size[1] for image_size in original_image_sizes)
+        width, height = _fit_size((width, height), export_settings)
 
-        out_buf = np.ones(width * height * 4, np.float32)
-        tmp_buf = np.empty(width * height * 4, np.float32)
-
-        for idx, (image, tile) in enumerate(images):
-            if original_image_sizes[idx][0] == width and original_image_sizes[idx][1] == height:
-                src_path = bpy.path.abspath(image.filepath_raw).replace("<UDIM>", tile)
-                with TmpImageGuard() as guard:
-                    guard.image = bpy.data.images.load(
-                        src_path,
-                    )
-                    guard.image.pixels.foreach_get(tmp_buf)
-            else:
-                # Image is the wrong size; make a temp copy and scale it.
-                src_path = bpy.path.abspath(image.filepath_raw).replace("<UDIM>", tile)
-                with TmpImageGuard() as guard:
-                    guard.image = bpy.data.images.load(
-                        src_path,
-                    )
-                    tmp_image = guard.image
-                    tmp_image.scale(width, height)
-                    tmp_image.pixels.foreach_get(tmp_buf)
+        plan = []
+        for image, tile in images:
+            # Image of the wrong size is scaled
+            src_buf, _ = get_image_tile_pixels(image, tile, (width, height), export_settings)
 
             # Copy any channels for this image to the output
             for dst_chan, fill in self.fills.items():
                 if isinstance(fill, FillImageTile) and fill.image == image:
-                    out_buf[int(dst_chan)::4] = tmp_buf[int(fill.src_chan)::4]
+                    plan.append((dst_chan, 'CHANNEL', src_buf, fill.src_chan))
                 elif isinstance(fill, FillWith):
-                    out_buf[int(dst_chan)::4] = fill.value
+                    plan.append((dst_chan, 'VALUE', None, fill.value))
                 elif isinstance(fill, FillImageRGB2BWTile) and fill.image == image:
-                    out_buf[int(dst_chan)::4] = tmp_buf[0::4] * 0.2989 + tmp_buf[1::4] * 0.5870 + tmp_buf[2::4] * 0.1140
-
-        tmp_buf = None  # GC this
+                    plan.append((dst_chan, 'BW', src_buf, False))
 
-        return self.__encode_from_numpy_array(out_buf, (width, height), export_settings)
+        return self.__encode_packed(plan, (width, height), export_settings)
 
     def __encode_unhappy(self, export_settings) -> bytes:
+        self.__set_partially_used(export_settings)
+        return self.__encode_cached(lambda: self.__fills_fingerprint(export_settings),
+                                    lambda: self.__pack_unhappy(export_settings), export_settings)
+
+    def __pack_unhappy(self, export_settings) -> bytes:
         # We need to assemble the image out of channels.
         # Do it with numpy and image.pixels.
 
@@ -338,7 +347,6 @@ class ExportImage:
             if isinstance(fill, FillImage) or isinstance(fill, FillImageRGB2BW):
                 if fill.image not in images:
                     images.append(fill.image)
-                    export_settings['exported_images'][fill.image.name] = 2  # 2 = partially used
 
         if not images:
             # No ImageFills; use a 1x1 white pixel
@@ -347,37 +355,115 @@ class ExportImage:
 
         width = max(image.size[0] for image in images)
         height = max(image.size[1] for image in images)
+        width, height = _fit_size((width, height), export_settings)
 
-        out_buf = np.ones(width * height * 4, np.float32)
-        tmp_buf = np.empty(width * height * 4, np.float32)
-
+        plan = []
         for image in images:
-            if image.size[0] == width and image.size[1] == height:
-                image.pixels.foreach_get(tmp_buf)
-            else:
-                # Image is the wrong size; make a temp copy and scale it.
-                with TmpImageGuard() as guard:
-                    make_temp_image_copy(guard, src_image=image)
-                    tmp_image = guard.image
-                    tmp_image.scale(width, height)
-                    tmp_image.pixels.foreach_get(tmp_buf)
+            # Image of the wrong size is scaled
+            src_buf = get_image_pixels(image, width, height, export_settings)
 
             # Copy any channels for this image to the output
             for dst_chan, fill in self.fills.items():
                 if isinstance(fill, FillImage) and fill.image == image:
-                    out_buf[int(dst_chan)::4] = tmp_buf[int(fill.src_chan)::4]
+                    plan.append((dst_chan, 'CHANNEL', src_buf, fill.src_chan))
                 elif isinstance(fill, FillWith):
-                    out_buf[int(dst_chan)::4] = fill.value
+                    plan.append((dst_chan, 'VALUE', None, fill.value))
                 elif isinstance(fill, FillImageRGB2BW) and fill.image == image:
-                    out_buf[int(dst_chan)::4] = tmp_buf[0::4] * 0.2989 + tmp_buf[1::4] * 0.5870 + tmp_buf[2::4] * 0.1140
-                    if image.alpha_mode in ["STRAIGHT", "PREMUL"]:
-                        out_buf[int(dst_chan)::4] *= tmp_buf[3::4]
+                    plan.append((dst_chan, 'BW', src_buf, image.alpha_mode in ["STRAIGHT", "PREMUL"]))
+
+        return self.__encode_packed(plan, (width, height), export_settings)
+
+    def __set_partially_used(self, export_settings):
+        for fill in self.fills.values():
+            if isinstance(fill, (FillImage, FillImageTile, FillImageRGB2BW, FillImageRGB2BWTile)):
+                export_settings['exported_images'][fill.image.name] = 2  # 2 = partially used
+
+    def __fills_fingerprint(self, export_settings):
+        """
+        Inputs of the packing, for the persistent texture cache.
+        None if the image can't be cached: no source image, or a source image without stable data (generated, edited).
+        """
+        inputs = []
+        for dst_chan, fill in sorted(self.fills.items(), key=lambda item: int(item[0])):
+            if isinstance(fill, (FillImage, FillImageTile, FillImageRGB2BW, FillImageRGB2BWTile)):
+                source = _image_source_digest(fill.image, getattr(fill, 'tile', None), export_settings)
+                if source is None:
+                    return None
+                src_chan = int(fill.src_chan) if hasattr(fill, 'src_chan') else None
+                inputs.append((int(dst_chan), type(fill).__name__, source, src_chan))
+            elif isinstance(fill, FillWith):
+                inputs.append((int(dst_chan), 'FillWith', repr(fill.value)))
+            else:
+                inputs.append((int(dst_chan), type(fill).__name__))
 
-        tmp_buf = None  # GC this
+        if not any(len(i) == 4 for i in inputs):
+            return None
+        return inputs
 
-        return self.__encode_from_numpy_array(out_buf, (width, height), export_settings)
+    def __encode_cached(self, get_inputs, encode, export_settings):
+        """
+        Encode with encode(), unless the same inputs were already encoded in the persistent texture cache.
+        Inputs, from get_inputs() (only called when the cache is used), must describe all that encode()
+        depends on, except encoding settings (added here). None inputs disable the cache for this image.
+        """
+        cache = export_settings.get('gltf_image_cache')
+        inputs = get_inputs() if cache is not None else None
+        if inputs is None:
+            return encode()
+
+        settings = [self.file_format, bpy.app.version]
+        if self.file_format in ["JPEG", "WEBP"]:
+            settings.append(export_settings['gltf_image_quality'])
+        if _resize_enabled(export_settings):
+            settings.append((export_settings['gltf_image_max_size'], export_settings['gltf_image_power_of_two'],
+                             export_settings['gltf_image_resize_filter']))
+        key = cache.fingerprint(settings, inputs)
+
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+        data = encode()
+        if isinstance(data, Future):
+            data.add_done_callback(lambda f: cache.put(key, f.result()) if f.exception() is None else None)
+        elif data:
+            cache.put(key, data)
+        return data
+
+    def __encode_packed(self, plan, dim: Tuple[int, int], export_settings) -> bytes:
+        """
+        Encode an image packed from source pixels (see _pack_rows).
+        Packing is done by bands of rows, so that no full resolution float buffer is needed for PNG.
+        """
+        if self.file_format == "PNG":
+            channels = 4 if Channel.A in self.fills else 3
+            return self.__run_encoder(_encode_png_from_plan, plan, dim, channels, export_settings=export_settings,
+                                      pixels=[src_buf for _, _, src_buf, _ in plan if src_buf is not None])
+
+        # Blender needs the full image to save it
+        width, height = dim
+        out_buf = np.empty((height, width, 4), np.float32)
+        for start in range(0, height, PACK_BAND_ROWS):
+            out_buf[start:start + PACK_BAND_ROWS] = _pack_rows(plan, dim, start, min(start + PACK_BAND_ROWS, height))
+        return self.__encode_from_numpy_array(out_buf.reshape(-1), dim, export_settings)
+
+    def __run_encoder(self, function, *args, export_settings, pixels=()):
+        # Encoded in process, in background if an encoder pool is available.
+        # Source pixels used by the encoding stay in memory until it is done: they count in the pixel cache budget
+        executor = export_settings.get('gltf_image_encoder')
+        if executor is not None:
+            future = executor.submit(function, *args)
+            if pixels:
+                # Pixels come from the pixel cache, that exists
+                export_settings['gltf_image_pixel_cache'].add_pending(future, pixels)
+            return future
+        return function(*args)
 
     def __encode_from_numpy_array(self, pixels: np.ndarray, dim: Tuple[int, int], export_settings) -> bytes:
+        if self.file_format == "PNG":
+            channels = 4 if Channel.A in self.fills else 3
+            return self.__run_encoder(_encode_png_from_pixels, pixels, dim, channels, export_settings=export_settings)
+
         with TmpImageGuard() as guard:
             guard.image = bpy.data.images.new(
                 "##gltf-export:tmp-image##",
@@ -392,6 +478,15 @@ class ExportImage:
             return _encode_temp_image(tmp_image, self.file_format, export_settings)
 
     def __encode_from_image(self, image: bpy.types.Image, export_settings) -> bytes:
+        # Images over the texture size limit are resampled, the existing file can't be used
+        size = _fit_size(tuple(image.size), export_settings)
+        if size != tuple(image.size):
+            return self.__encode_cached(
+                lambda: _image_source_digest(image, None, export_settings),
+                lambda: self.__encode_from_numpy_array(
+                    pixels_to_float(get_image_pixels(image, size[0], size[1], export_settings)), size, export_settings),
+                export_settings)
+
         # See if there is an existing file we can use.
         data = None
         # Sequence image can't be exported, but it avoid to crash to check that default image exists
@@ -405,46 +500,248 @@ class ExportImage:
                     with open(src_path, 'rb') as f:
                         data = f.read()
         # Check magic number is right
-        if data:
-            if self.file_format == 'PNG':
-                if data.startswith(b'\x89PNG'):
-                    return data
-            elif self.file_format == 'JPEG':
-                if data.startswith(b'\xff\xd8\xff'):
-                    return data
-            elif self.file_format == 'WEBP':
-                if data[8:12] == b'WEBP':
-                    return data
+        if data and _is_file_format(data, self.file_format):
+            return data
 
         # Copy to a temp image and save.
-        with TmpImageGuard() as guard:
-            make_temp_image_copy(guard, src_image=image)
-            tmp_image = guard.image
-            return _encode_temp_image(tmp_image, self.file_format, export_settings)
+        def encode():
+            with TmpImageGuard() as guard:
+                make_temp_image_copy(guard, src_image=image)
+                tmp_image = guard.image
+                return _encode_temp_image(tmp_image, self.file_format, export_settings)
+
+        def get_inputs():
+            if not data:
+                return None
+            return hashlib.blake2b(data, digest_size=20).hexdigest(), image.alpha_mode, image.colorspace_settings.name
+
+        return self.__encode_cached(get_inputs, encode, export_settings)
 
     def __encode_from_image_tile(self, udim_image, tile, export_settings):
+        if _resize_enabled(export_settings):
+            _, native_size = get_image_tile_pixels(udim_image, tile, None, export_settings)
+            size = _fit_size(native_size, export_settings)
+            if size != tuple(native_size):
+                return self.__encode_cached(
+                    lambda: _image_source_digest(udim_image, tile, export_settings),
+                    lambda: self.__encode_from_numpy_array(
+                        pixels_to_float(get_image_tile_pixels(udim_image, tile, size, export_settings)[0]),
+                        size, export_settings),
+                    export_settings)
+
         src_path = bpy.path.abspath(udim_image.filepath_raw).replace("<UDIM>", tile)
 
         if os.path.isfile(src_path):
             with open(src_path, 'rb') as f:
                 data = f.read()
 
-        if data:
-            if self.file_format == 'PNG':
-                if data.startswith(b'\x89PNG'):
-                    return data
-            elif self.file_format == 'JPEG':
-                if data.startswith(b'\xff\xd8\xff'):
-                    return data
-            elif self.file_format == 'WEBP':
-                if data[8:12] == b'WEBP':
-                    return data
+        if data and _is_file_format(data, self.file_format):
+            return data
 
         # We don't manage UDIM packed image, so this could not happen to be here
         # Lets display an error
         export_settings['log'].error("UDIM packed images are not supported for export. Please unpack them before exporting.")
 
 
+def _resize_enabled(export_settings) -> bool:
+    return export_settings['gltf_image_max_size'] > 0 or export_settings['gltf_image_power_of_two']
+
+
+def _fit_size(size, export_settings) -> Tuple[int, int]:
+    """Size of an exported texture, from its source size, applying the texture size options."""
+    size = (int(size[0]), int(size[1]))
+    if not _resize_enabled(export_settings) or size[0] <= 0 or size[1] <= 0:
+        return size
+    return fit_size(size, export_settings['gltf_image_max_size'], export_settings['gltf_image_power_of_two'])
+
+
+def _is_file_format(data: bytes, file_format: str) -> bool:
+    """Check the magic number of encoded image data."""
+    if file_format == 'PNG':
+        return data.startswith(b'\x89PNG')
+    elif file_format == 'JPEG':
+        return data.startswith(b'\xff\xd8\xff')
+    elif file_format == 'WEBP':
+        return data[8:12] == b'WEBP'
+    return False
+
+
+def _image_source_digest(image: bpy.types.Image, tile, export_settings):
+    """
+    Digest of the source data of a Blender image (or UDIM tile), with the settings changing its pixels.
+    None if the image has no stable source data: generated or edited images.
+    Files are hashed once per export, unless they change.
+    """
+    if image.source not in ['FILE', 'SEQUENCE', 'TILED'] or image.is_dirty:
+        return None
+
+    digests = export_settings.setdefault('gltf_image_source_digests', {})
+    settings = (image.alpha_mode, image.colorspace_settings.name, tuple(image.size))
+
+    if image.packed_file is not None and tile is None:
+        key = ('packed', image.name_full, image.packed_file.size)
+        if key not in digests.keys():
+            digests[key] = hashlib.blake2b(image.packed_file.data, digest_size=20).hexdigest()
+        return digests[key], settings
+
+    src_path = bpy.path.abspath(image.filepath_raw)
+    if tile is not None:
+        src_path = src_path.replace("<UDIM>", tile)
+    try:
+        stat = os.stat(src_path)
+        key = (src_path, stat.st_size, stat.st_mtime_ns)
+        if key not in digests.keys():
+            h = hashlib.blake2b(digest_size=20)
+            with open(src_path, 'rb') as f:
+                for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                    h.update(block)
+            digests[key] = h.hexdigest()
+    except OSError:
+        return None
+    return digests[key], settings
+
+
+def __get_pixel_cache(export_settings):
+    if export_settings.get('gltf_image_pixel_cache') is None:
+        export_settings['gltf_image_pixel_cache'] = PixelCache()
+    return export_settings['gltf_image_pixel_cache']
+
+
+def pixels_to_float(pixels: np.ndarray) -> np.ndarray:
+    """Float pixels (as image.pixels) from cached pixels."""
+    if pixels.dtype == np.uint8:
+        return pixels.astype(np.float32) / 255.0
+    return pixels
+
+
+def __compact_pixels(buf: np.ndarray, is_float: bool) -> np.ndarray:
+    # Pixels of byte images are exact multiples of 1/255 (resampled pixels are rounded).
+    # Converted by blocks, so that there is no other full size float buffer than buf
+    if is_float:
+        return buf
+    pixels = np.empty(len(buf), np.uint8)
+    block = np.empty(min(len(buf), COMPACT_BLOCK_SIZE), np.float32)
+    for start in range(0, len(buf), COMPACT_BLOCK_SIZE):
+        end = min(start + COMPACT_BLOCK_SIZE, len(buf))
+        values = block[:end - start]
+        np.clip(buf[start:end], 0.0, 1.0, out=values)
+        values *= 255.0
+        np.rint(values, out=values)
+        pixels[start:end] = values
+    return pixels
+
+
+def get_image_pixels(image: bpy.types.Image, width: int, height: int, export_settings) -> np.ndarray:
+    """
+    Pixels of a Blender image, scaled to width x height if needed.
+    The returned array must not be modified. It can be uint8, see pixels_to_float.
+    """
+    def load():
+        buf = np.empty(width * height * 4, np.float32)
+        if image.size[0] == width and image.size[1] == height:
+            image.pixels.foreach_get(buf)
+        elif width < image.size[0] or height < image.size[1]:
+            # Downscaled by texture size options: resampled from native pixels
+            native = get_image_pixels(image, image.size[0], image.size[1], export_settings)
+            buf = resample(native.reshape(image.size[1], image.size[0], 4), (width, height),
+                           export_settings['gltf_image_resize_filter']).reshape(-1)
+        else:
+            # Image is the wrong size; make a temp copy and scale it.
+            with TmpImageGuard() as guard:
+                make_temp_image_copy(guard, src_image=image)
+                tmp_image = guard.image
+                tmp_image.scale(width, height)
+                tmp_image.pixels.foreach_get(buf)
+        return __compact_pixels(buf, image.is_float), None
+
+    pixels, _ = __get_pixel_cache(export_settings).get((image.name_full, None, width, height), load)
+    return pixels
+
+
+def get_image_tile_pixels(image: bpy.types.Image, tile, size, export_settings):
+    """
+    Pixels of a tile of a Blender UDIM image, scaled to size (width, height) if given.
+    :return: pixels (must not be modified, can be uint8), and size of the pixels
+    """
+    def load():
+        src_path = bpy.path.abspath(image.filepath_raw).replace("<UDIM>", tile)
+        with TmpImageGuard() as guard:
+            guard.image = bpy.data.images.load(
+                src_path,
+            )
+            tmp_image = guard.image
+            native_width, native_height = tmp_image.size
+            if size is not None and (size[0] < native_width or size[1] < native_height):
+                # Downscaled by texture size options: resampled from native pixels
+                buf = np.empty(native_width * native_height * 4, np.float32)
+                tmp_image.pixels.foreach_get(buf)
+                buf = resample(buf.reshape(native_height, native_width, 4), tuple(size),
+                               export_settings['gltf_image_resize_filter']).reshape(-1)
+                return __compact_pixels(buf, tmp_image.is_float), tuple(size)
+            if size is not None and tuple(tmp_image.size) != tuple(size):
+                tmp_image.scale(*size)
+            buf = np.empty(tmp_image.size[0] * tmp_image.size[1] * 4, np.float32)
+            tmp_image.pixels.foreach_get(buf)
+            return __compact_pixels(buf, tmp_image.is_float), (tmp_image.size[0], tmp_image.size[1])
+
+    cache = __get_pixel_cache(export_settings)
+    if size is not None:
+        # Native size pixels can be used, if already loaded with the right size
+        native = cache.entries.get((image.name_full, tile, None, None))
+        if native is not None and tuple(native[1]) == tuple(size):
+            return native
+        return cache.get((image.name_full, tile) + tuple(size), load)
+    return cache.get((image.name_full, tile, None, None), load)
+
+
+def _pack_rows(plan, dim: Tuple[int, int], start: int, end: int) -> np.ndarray:
+    """
+    Pack rows [start, end) of an image (Blender row order, from bottom).
+    Plan is a list of (dst_chan, operation, source pixels, argument):
+    CHANNEL copies the source channel given as argument, VALUE fills with the argument,
+    BW converts source to grayscale, multiplied by alpha if argument is True.
+    :return: (rows, width, 4) float32 array
+    """
+    width, height = dim
+    out = np.ones((end - start, width, 4), np.float32)
+    for dst_chan, operation, src_buf, argument in plan:
+        if operation == 'VALUE':
+            out[:, :, int(dst_chan)] = argument
+            continue
+
+        rows = src_buf.reshape(height, width, 4)[start:end]
+        if operation == 'CHANNEL':
+            # Only the used channel is converted
+            out[:, :, int(dst_chan)] = pixels_to_float(rows[:, :, int(argument)])
+        else:
+            src = pixels_to_float(rows)
+            out[:, :, int(dst_chan)] = src[:, :, 0] * 0.2989 + src[:, :, 1] * 0.5870 + src[:, :, 2] * 0.1140
+            if argument:
+                out[:, :, int(dst_chan)] *= src[:, :, 3]
+    return out
+
+
+def _encode_png_from_plan(plan, dim: Tuple[int, int], channels: int) -> bytes:
+    """Pack and encode to an 8 bits PNG, by bands of rows, from top to bottom."""
+    width, height = dim
+
+    def bands():
+        for top in range(0, height, PACK_BAND_ROWS):
+            end = height - top
+            start = max(0, end - PACK_BAND_ROWS)
+            band = _pack_rows(plan, dim, start, end)[::-1, :, :channels]
+            yield np.clip(band * 255.0 + 0.5, 0.0, 255.0).astype(np.uint8)
+
+    return encode_png_bands(width, height, channels, bands())
+
+
+def _encode_png_from_pixels(pixels: np.ndarray, dim: Tuple[int, int], channels: int) -> bytes:
+    """Encode Blender float pixels (rows from bottom to top) to an 8 bits PNG, as Blender would save it."""
+    image = np.asarray(pixels, dtype=np.float32).reshape(dim[1], dim[0], 4)[::-1, :, :channels]
+    image = np.clip(image * 255.0 + 0.5, 0.0, 255.0).astype(np.uint8)
+    return encode_png(image)
+
+
 def _encode_temp_image(tmp_image: bpy.types.Image, file_format: str, export_settings) -> bytes:
     with tempfile.TemporaryDirectory() as tmpdirname:
         tmpfilename = tmpdirname + '/img'
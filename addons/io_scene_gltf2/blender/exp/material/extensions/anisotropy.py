@@ -19,7 +19,7 @@ from .....io.com.gltf2_io_extensions import Extension
 from ....com.conversion import get_anisotropy_rotation_blender_to_gltf
 from ...material import texture_info as gltf2_blender_gather_texture_info
 from ..search_node_tree import detect_anisotropy_nodes, get_socket, has_image_node_from_socket, get_factor_from_socket
-from ..encode_image import TmpImageGuard, make_temp_image_copy, StoreImage, StoreData
+from ..encode_image import get_image_pixels, pixels_to_float, StoreImage, StoreData
 
 
 def export_anisotropy(blender_material, export_settings):
@@ -228,17 +228,8 @@ def grayscale_anisotropy_calculation(stored, export_settings):
         (ident, store.image) for (
             ident, store) in stored.items() if isinstance(
             store, StoreImage)]:
-        tmp_buf = np.empty(width * height * 4, np.float32)
-
-        if image.size[0] == width and image.size[1] == height:
-            image.pixels.foreach_get(tmp_buf)
-        else:
-            # Image is the wrong size; make a temp copy and scale it.
-            with TmpImageGuard() as guard:
-                make_temp_image_copy(guard, src_image=image)
-                tmp_image = guard.image
-                tmp_image.scale(width, height)
-                tmp_image.pixels.foreach_get(tmp_buf)
+        # Image of the wrong size is scaled
+        tmp_buf = pixels_to_float(get_image_pixels(image, width, height, export_settings))
 
         buffers[identifier] = np.reshape(tmp_buf, [width, height, 4])
         buffers[identifier] = rgb2gray(buffers[identifier])
@@ -20,6 +20,8 @@ from ...io.exp.user_extensions import export_user_extensions
 from ..com.extras import generate_extras
 from . import primitives as gltf2_blender_gather_primitives
 from .cache import cached_by_key
+from .mesh_fingerprint import get_mesh_cache_id, is_fingerprinted
+from .lod import gather_lod_meshes
 
 
 def get_mesh_cache_key(blender_mesh,
@@ -41,6 +43,15 @@ def get_mesh_cache_key(blender_mesh,
 
     # TODO check what is really needed for modifiers
 
+    # Evaluated meshes are cached on their geometry fingerprint, so that objects
+    # sharing the same evaluated geometry share the same glTF mesh
+    if original_mesh is None and is_fingerprinted(blender_mesh, export_settings):
+        return (
+            (get_mesh_cache_id(blender_mesh, export_settings),),
+            (None,),
+            mats
+        )
+
     mesh_to_id_cache = blender_mesh if original_mesh is None else original_mesh
     return (
         (id(mesh_to_id_cache),),
@@ -86,6 +97,9 @@ def gather_mesh(blender_mesh: bpy.types.Mesh,
                            modifiers,
                            materials)
 
+    if export_settings['gltf_lods']:
+        gather_lod_meshes(mesh, export_settings)
+
     return mesh
 
 
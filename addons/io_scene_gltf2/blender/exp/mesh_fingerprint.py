@@ -0,0 +1,141 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bpy
+import hashlib
+import numpy as np
+
+# Number of vertices sampled for the cheap signature
+SAMPLE_COUNT = 64
+
+# data_type: (foreach property, numpy type, components)
+ATTRIBUTE_FOREACH = {
+    "FLOAT": ('value', np.float32, 1),
+    "INT": ('value', np.int32, 1),
+    "INT8": ('value', np.int32, 1),
+    "BOOLEAN": ('value', bool, 1),
+    "FLOAT2": ('vector', np.float32, 2),
+    "INT32_2D": ('value', np.int32, 2),
+    "FLOAT_VECTOR": ('vector', np.float32, 3),
+    "FLOAT_COLOR": ('color', np.float32, 4),
+    "BYTE_COLOR": ('color', np.float32, 4),
+    "QUATERNION": ('value', np.float32, 4),
+    "FLOAT4X4": ('value', np.float32, 16),
+}
+
+
+def __cheap_signature(blender_mesh):
+    """Element counts, attribute layout and a strided sample of vertex positions."""
+    nb_verts = len(blender_mesh.vertices)
+    sample = b''
+    if nb_verts > 0:
+        positions = np.empty(nb_verts * 3, dtype=np.float32)
+        blender_mesh.vertices.foreach_get('co', positions)
+        step = max(1, nb_verts // SAMPLE_COUNT)
+        sample = positions.reshape(nb_verts, 3)[::step].tobytes()
+
+    return (
+        nb_verts,
+        len(blender_mesh.edges),
+        len(blender_mesh.loops),
+        len(blender_mesh.polygons),
+        tuple((a.name, a.domain, a.data_type) for a in blender_mesh.attributes),
+        sample
+    )
+
+
+def __full_digest(blender_mesh):
+    """Digest of every attribute layer, the face offsets and the corner normals."""
+    digest = hashlib.blake2b(digest_size=16)
+
+    for attr in blender_mesh.attributes:
+        if attr.data_type not in ATTRIBUTE_FOREACH.keys():
+            # String attributes are not exported
+            continue
+        prop, dtype, nb_components = ATTRIBUTE_FOREACH[attr.data_type]
+        data = np.empty(len(attr.data) * nb_components, dtype=dtype)
+        attr.data.foreach_get(prop, data)
+        digest.update(attr.name.encode())
+        digest.update(data.tobytes())
+
+    loop_starts = np.empty(len(blender_mesh.polygons), dtype=np.int32)
+    blender_mesh.polygons.foreach_get('loop_start', loop_starts)
+    digest.update(loop_starts.tobytes())
+
+    normals = np.empty(len(blender_mesh.loops) * 3, dtype=np.float32)
+    blender_mesh.corner_normals.foreach_get('vector', normals)
+    digest.update(normals.tobytes())
+
+    return digest.hexdigest()
+
+
+def __evaluated_digest(blender_object):
+    """Full digest of the evaluated mesh of an object, evaluated again as its mesh has been freed."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    blender_mesh_owner = blender_object.evaluated_get(depsgraph)
+    blender_mesh = blender_mesh_owner.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
+    try:
+        return __full_digest(blender_mesh)
+    finally:
+        blender_mesh_owner.to_mesh_clear()
+
+
+def register_evaluated_mesh(blender_mesh, blender_object, export_settings):
+    """
+    Fingerprint the geometry of a mesh evaluated by the exporter (to_mesh() with modifiers).
+
+    Evaluated meshes are new datablocks, so their id() can't be used to share glTF meshes between
+    objects using the same modifier stack. The cheap signature sorts out most different meshes.
+    The full digest is only computed when several meshes have the same cheap signature, to confirm
+    that the geometry is really identical: the first mesh of the signature is then evaluated again,
+    as evaluated meshes are freed once exported.
+    Meshes with shape keys are not fingerprinted.
+    """
+    if blender_mesh.shape_keys is not None:
+        return None
+
+    signature = __cheap_signature(blender_mesh)
+    signatures = export_settings['evaluated_mesh_signatures']
+    group = signatures.get(signature)
+
+    if group is None:
+        # First mesh with this signature
+        signatures[signature] = {'object': blender_object, 'fingerprints': None}
+        fingerprint = (signature, None)
+    elif group['object'] == blender_object:
+        # Same object exported again (instances), the evaluated mesh is the same
+        fingerprint = (signature, None)
+    else:
+        if group['fingerprints'] is None:
+            # Fingerprints by full digest, the first mesh keeping its fingerprint without digest
+            group['fingerprints'] = {__evaluated_digest(group['object']): (signature, None)}
+        digest = __full_digest(blender_mesh)
+        fingerprint = group['fingerprints'].setdefault(digest, (signature, digest))
+
+    export_settings['evaluated_mesh_fingerprints'][id(blender_mesh)] = fingerprint
+    return fingerprint
+
+
+def unregister_evaluated_mesh(blender_mesh, export_settings):
+    """To be called before the evaluated mesh is freed, as its id can then be reused."""
+    export_settings['evaluated_mesh_fingerprints'].pop(id(blender_mesh), None)
+
+
+def get_mesh_cache_id(blender_mesh, export_settings):
+    """Id used by the mesh & primitive caches: the fingerprint if registered, the memory id otherwise."""
+    return export_settings['evaluated_mesh_fingerprints'].get(id(blender_mesh), id(blender_mesh))
+
+
+def is_fingerprinted(blender_mesh, export_settings):
+    return id(blender_mesh) in export_settings['evaluated_mesh_fingerprints'].keys()
@@ -28,6 +28,7 @@ from . import cameras as gltf2_blender_gather_cameras
 from . import mesh as gltf2_blender_gather_mesh
 from . import joints as gltf2_blender_gather_joints
 from . import lights as gltf2_blender_gather_lights
+from .mesh_fingerprint import register_evaluated_mesh, unregister_evaluated_mesh
 from .tree import VExportNode
 
 
@@ -352,6 +353,12 @@ def __gather_mesh(vnode, blender_object, export_settings):
                 if modifier.type == 'ARMATURE':
                     uuid_for_skined_data = vnode.uuid
 
+        # Evaluated meshes are new datablocks for each object.
+        # Fingerprint their geometry, so that identical evaluated meshes share the same glTF mesh
+        # Skinned meshes are transformed to their skeleton space, so they can't be shared
+        if export_settings['gltf_apply'] and modifiers is not None and uuid_for_skined_data is None:
+            register_evaluated_mesh(blender_mesh, blender_object, export_settings)
+
     result = gltf2_blender_gather_mesh.gather_mesh(blender_mesh,
                                                    uuid_for_skined_data,
                                                    blender_object.vertex_groups if blender_object else None,
@@ -361,6 +368,7 @@ def __gather_mesh(vnode, blender_object, export_settings):
                                                    export_settings)
 
     if export_settings['gltf_apply'] and modifiers is not None:
+        unregister_evaluated_mesh(blender_mesh, export_settings)
         blender_mesh_owner.to_mesh_clear()
 
     return result
@@ -19,6 +19,7 @@ from ...io.com import gltf2_io, constants as gltf2_io_constants, debug as gltf2_
 from ...io.exp import binary_data as gltf2_io_binary_data
 from ...io.exp.user_extensions import export_user_extensions
 from .accessors import array_to_accessor
+from .quantization import can_quantize_attribute, quantize_attribute
 
 
 def gather_primitive_attributes(blender_primitive, export_settings):
@@ -188,6 +189,14 @@ def __gather_attribute(blender_primitive, attribute, export_settings):
         "POSITION": True
     }
 
+    if export_settings['gltf_quantize'] and can_quantize_attribute(attribute, data, export_settings):
+
+        export_user_extensions('gather_attribute_change', export_settings, attribute, data, False)
+
+        return {
+            attribute: quantize_attribute(attribute, data, export_settings)
+        }
+
     if (attribute.startswith("_") or attribute.startswith("COLOR_")
         ) and blender_primitive["attributes"][attribute]['component_type'] == gltf2_io_constants.ComponentType.UnsignedShort:
         # Byte Color vertex color, need to normalize
@@ -0,0 +1,189 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import numpy as np
+
+# Size of the simulated post-transform vertex cache (FIFO)
+CACHE_SIZE = 16
+
+
+def optimize_primitives(blender_primitives, shared_attributes, mesh_name, export_settings):
+    """
+    Reorder triangles for post-transform vertex cache efficiency (Tipsify),
+    then renumber vertices in first use order, for vertex fetch efficiency.
+
+    Primitives are modified in place. Shared attributes are renumbered once, for all triangle primitives.
+    Edges and points primitives are not modified.
+    """
+    triangle_primitives = [p for p in blender_primitives if p.get('mode') is None and len(p['indices']) > 0]
+    if len(triangle_primitives) == 0:
+        return
+
+    # The cache miss ratio is only computed for debug logs: the cache simulation is slow on large meshes
+    report = export_settings['log'].logger.isEnabledFor(logging.DEBUG)
+    acmr_before = []
+    acmr_after = []
+
+    if shared_attributes is not None:
+        vertex_count = __vertex_count(shared_attributes)
+        for primitive in triangle_primitives:
+            if report:
+                acmr_before.append(compute_acmr(primitive['indices'], vertex_count))
+            primitive['indices'] = tipsify(primitive['indices'], vertex_count)
+
+        remap, order = __fetch_remap(np.concatenate([p['indices'] for p in triangle_primitives]), vertex_count)
+        __permute_attributes(shared_attributes, order)
+        for primitive in triangle_primitives:
+            primitive['indices'] = remap[primitive['indices']]
+            if report:
+                acmr_after.append(compute_acmr(primitive['indices'], vertex_count))
+
+    else:
+        for primitive in triangle_primitives:
+            vertex_count = __vertex_count(primitive['attributes'])
+            if report:
+                acmr_before.append(compute_acmr(primitive['indices'], vertex_count))
+            indices = tipsify(primitive['indices'], vertex_count)
+            remap, order = __fetch_remap(indices, vertex_count)
+            __permute_attributes(primitive['attributes'], order)
+            primitive['indices'] = remap[indices]
+            if report:
+                acmr_after.append(compute_acmr(primitive['indices'], vertex_count))
+
+    if report:
+        # ACMR of the whole mesh, weighted by triangle count
+        weights = [len(p['indices']) for p in triangle_primitives]
+        export_settings['log'].debug("Vertex cache optimization: {}: ACMR {:.3f} -> {:.3f}".format(
+            mesh_name, np.average(acmr_before, weights=weights), np.average(acmr_after, weights=weights)))
+
+
+def __vertex_count(attributes):
+    return len(attributes['POSITION']['data'])
+
+
+def __fetch_remap(indices, vertex_count):
+    """
+    Remap table giving vertices in order of first use by indices.
+    Unused vertices are kept, at the end.
+    """
+    used, first_use = np.unique(indices, return_index=True)
+    used = used[np.argsort(first_use)]
+    unused = np.setdiff1d(np.arange(vertex_count), used, assume_unique=True)
+    order = np.concatenate((used, unused))
+
+    remap = np.empty(vertex_count, dtype=indices.dtype)
+    remap[order] = np.arange(vertex_count, dtype=indices.dtype)
+    return remap, order
+
+
+def __permute_attributes(attributes, order):
+    for attribute, value in attributes.items():
+        if attribute.startswith("JOINTS_") or attribute.startswith("WEIGHTS_"):
+            # Skinning data is stored as flat lists, 4 values per vertex
+            attributes[attribute] = np.asarray(value).reshape(-1, 4)[order].ravel().tolist()
+        else:
+            value['data'] = value['data'][order]
+
+
+def compute_acmr(indices, vertex_count, cache_size=CACHE_SIZE):
+    """Average cache miss ratio (misses per triangle) of a FIFO vertex cache."""
+    if len(indices) == 0:
+        return 0.0
+    # A vertex is in cache if less than cache_size misses happened since it was loaded
+    loaded_at = [-cache_size - 1] * vertex_count
+    misses = 0
+    for v in indices.tolist():
+        if misses - loaded_at[v] > cache_size:
+            loaded_at[v] = misses
+            misses += 1
+    return misses / (len(indices) // 3)
+
+
+def tipsify(indices, vertex_count, cache_size=CACHE_SIZE):
+    """
+    Tipsify triangle reordering (Sander, Nehab, Barczak 2007).
+    Fans around vertices, choosing the next fanning vertex among the ones still in cache.
+    Triangle winding is kept.
+    """
+    triangles = indices.reshape(-1, 3)
+    nb_triangles = len(triangles)
+
+    # Vertex -> triangles adjacency, in CSR layout
+    flat = indices.astype(np.int64)
+    adjacency = (np.argsort(flat, kind='stable') // 3).tolist()
+    live = np.bincount(flat, minlength=vertex_count)
+    offsets = np.concatenate(([0], np.cumsum(live))).tolist()
+    live = live.tolist()
+
+    # Flat lists: a list per triangle would be slow to create for large meshes
+    flat_list = indices.tolist()
+    cache_time = [0] * vertex_count
+    emitted = bytearray(nb_triangles)
+    dead_end = []
+    output = []
+    time = cache_size + 1
+    cursor = 0
+
+    fanning = -1
+    while cursor < vertex_count:
+        if live[cursor] > 0:
+            fanning = cursor
+            break
+        cursor += 1
+
+    while fanning >= 0:
+        # Emit all triangles left around the fanning vertex
+        fan = [t for t in adjacency[offsets[fanning]:offsets[fanning + 1]] if not emitted[t]]
+        output += fan
+        vertices = []
+        for t in fan:
+            emitted[t] = 1
+            vertices += flat_list[3 * t:3 * t + 3]
+
+        for v in vertices:
+            live[v] -= 1
+            if time - cache_time[v] > cache_size:
+                cache_time[v] = time
+                time += 1
+        dead_end += vertices
+
+        # Next fanning vertex: the one still in cache with the highest age,
+        # if all its triangles can be emitted while it stays in cache
+        fanning = -1
+        best_priority = -1
+        for v in set(vertices):
+            live_count = live[v]
+            if live_count > 0:
+                age = time - cache_time[v]
+                priority = age if age + 2 * live_count <= cache_size else 0
+                if priority > best_priority:
+                    best_priority = priority
+                    fanning = v
+
+        if fanning == -1:
+            # Dead end: use a recently used vertex, or the next vertex with triangles left
+            while dead_end:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    fanning = v
+                    break
+        if fanning == -1:
+            while cursor < vertex_count:
+                if live[cursor] > 0:
+                    fanning = cursor
+                    break
+                cursor += 1
+
+    return triangles[output].reshape(-1)
@@ -19,9 +19,13 @@ from ...io.com import gltf2_io, constants as gltf2_io_constants, gltf2_io_extens
 from ...blender.com.data_path import get_sk_exported
 from ...io.exp import binary_data as gltf2_io_binary_data
 from .cache import cached, cached_by_key
+from .mesh_fingerprint import get_mesh_cache_id, is_fingerprinted
 from . import primitive_extract as gltf2_blender_gather_primitives_extract
 from . import primitive_attributes as gltf2_blender_gather_primitive_attributes
 from .accessors import gather_accessor, array_to_accessor
+from .quantization import prepare_mesh_position_quantization
+from .primitive_optimize import optimize_primitives
+from .lod import compute_lod_indices, gather_lod_primitive
 from .material.materials import get_final_material, gather_material, get_base_material, get_material_from_idx
 from .material.extensions import variants as ext_variants
 
@@ -41,8 +45,12 @@ def gather_primitive_cache_key(
 
     # TODO check what is really needed for modifiers
 
+    # Evaluated meshes with a fingerprint don't depend on their modifiers anymore
+    if is_fingerprinted(blender_mesh, export_settings):
+        modifiers = None
+
     return (
-        (id(blender_mesh),),
+        (get_mesh_cache_id(blender_mesh, export_settings),),
         (modifiers,),
         tuple(id(m) if m is not None else None for m in materials)
     )
@@ -111,6 +119,9 @@ def gather_primitives(
             targets=internal_primitive['targets'])
         primitives.append(primitive)
 
+        if export_settings['gltf_lods']:
+            gather_lod_primitive(primitive, internal_primitive['lod_indices'], export_settings)
+
     return primitives
 
 
@@ -130,8 +141,12 @@ def get_primitive_cache_key(
 
     # TODO check what is really needed for modifiers
 
+    # Evaluated meshes with a fingerprint don't depend on their modifiers anymore
+    if is_fingerprinted(blender_mesh, export_settings):
+        modifiers = None
+
     return (
-        (id(blender_mesh),),
+        (get_mesh_cache_id(blender_mesh, export_settings),),
         (modifiers,)
     )
 
@@ -153,6 +168,16 @@ def __gather_cache_primitives(
     blender_primitives, additional_materials_udim, shared_attributes = gltf2_blender_gather_primitives_extract.extract_primitives(
         materials, blender_mesh, uuid_for_skined_data, vertex_groups, modifiers, export_settings)
 
+    if export_settings['gltf_optimize_vertex_order']:
+        optimize_primitives(blender_primitives, shared_attributes, blender_mesh.name, export_settings)
+
+    lod_indices = []
+    if export_settings['gltf_lods']:
+        lod_indices = compute_lod_indices(blender_primitives, shared_attributes, blender_mesh.name, export_settings)
+
+    if export_settings['gltf_quantize']:
+        __prepare_position_quantization(blender_primitives, shared_attributes, uuid_for_skined_data, export_settings)
+
     if shared_attributes is not None:
 
         if len(blender_primitives) > 0:
@@ -199,14 +224,37 @@ def __gather_cache_primitives(
             }
             primitives.append(primitive)
 
+    for primitive_idx, (primitive, internal_primitive) in enumerate(zip(primitives, blender_primitives)):
+        primitive["lod_indices"] = [__gather_lod_indices(
+            level[primitive_idx], internal_primitive, primitive["indices"], export_settings) for level in lod_indices]
+
     return primitives, additional_materials_udim
 
 
+def __prepare_position_quantization(blender_primitives, shared_attributes, uuid_for_skined_data, export_settings):
+    # Quantized positions need a dequantization transform on the node.
+    # This is not possible for skinned meshes (node transform is ignored)
+    if uuid_for_skined_data is not None:
+        return
+
+    prepare_mesh_position_quantization(blender_primitives, shared_attributes, export_settings)
+
+
+def __gather_lod_indices(indices, blender_primitive, base_accessor, export_settings):
+    if indices is blender_primitive.get('indices') or len(indices) == 0:
+        # Edges, points, or primitives that can't be simplified share the full resolution indices
+        return base_accessor
+    return __indices_to_accessor(indices, export_settings)
+
+
 def __gather_indices(blender_primitive, blender_mesh, modifiers, export_settings):
     indices = blender_primitive.get('indices')
     if indices is None:
         return None
+    return __indices_to_accessor(indices, export_settings)
+
 
+def __indices_to_accessor(indices, export_settings):
     # NOTE: Values used by some graphics APIs as "primitive restart" values are disallowed.
     # Specifically, the values 65535 (in UINT16) and 4294967295 (in UINT32) cannot be used as indices.
     # https://github.com/KhronosGroup/glTF/issues/1142
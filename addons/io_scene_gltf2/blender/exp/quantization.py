@@ -0,0 +1,257 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+
+import numpy as np
+
+from ...io.com import constants as gltf2_io_constants
+from .accessors import array_to_accessor
+
+# Tolerance used to check that texture coordinates and colors are in [0, 1]
+RANGE_EPSILON = 1e-6
+
+
+def prepare_mesh_position_quantization(blender_primitives, shared_attributes, export_settings):
+    """
+    Compute the quantization grid of the POSITION attributes of all primitives of a mesh.
+
+    With shared accessors, triangle primitives have no attributes of their own: they use the
+    shared attributes. Edges and points primitives still have their own attributes.
+    """
+    attribute_sets = [p['attributes'] for p in blender_primitives if 'attributes' in p.keys()]
+    if shared_attributes is not None:
+        attribute_sets.append(shared_attributes)
+
+    # Morph targets would need to be quantized with the same grid
+    if any(a.startswith("MORPH_") for attributes in attribute_sets for a in attributes.keys()):
+        return
+
+    position_attributes = [attributes['POSITION'] for attributes in attribute_sets if 'POSITION' in attributes.keys()]
+    prepare_position_quantization(position_attributes, export_settings)
+
+
+def prepare_position_quantization(position_attributes, export_settings):
+    """
+    Compute a quantization grid shared by all POSITION attributes of a mesh.
+
+    The dequantization transform is set on nodes, so it must be the same for all primitives of the mesh.
+    The grid uses a uniform scale, so that the node transform stays decomposable.
+    """
+    if len(position_attributes) == 0:
+        return
+
+    data = [attr['data'] for attr in position_attributes if len(attr['data']) > 0]
+    if len(data) == 0:
+        return
+
+    mins = np.min([np.amin(d, axis=0) for d in data], axis=0).astype(np.float64)
+    maxs = np.max([np.amax(d, axis=0) for d in data], axis=0).astype(np.float64)
+    extent = np.amax(maxs - mins)
+
+    step = extent / ((1 << export_settings['gltf_quantize_position_bits']) - 1)
+    if step == 0.0:
+        # All vertices are at the same position
+        step = 1.0
+
+    for attr in position_attributes:
+        attr['quantization'] = (mins, step)
+
+
+def can_quantize_attribute(attribute, data, export_settings):
+    if attribute == "POSITION":
+        return data.get('quantization') is not None
+
+    elif attribute in ["NORMAL", "TANGENT"]:
+        return True
+
+    elif attribute.startswith("TEXCOORD_") or attribute.startswith("COLOR_"):
+        if attribute.startswith("COLOR_") and data['component_type'] == gltf2_io_constants.ComponentType.UnsignedByte:
+            # Fake COLOR_0, already stored as bytes
+            return False
+        # Without KHR_texture_transform, only texture coordinates in [0, 1] can be normalized
+        # Same for colors, HDR colors are kept as float
+        if len(data['data']) == 0 or np.amin(data['data']) < -RANGE_EPSILON \
+                or np.amax(data['data']) > 1.0 + RANGE_EPSILON:
+            export_settings['gltf_quantization_report']['skipped'].append(attribute)
+            return False
+        return True
+
+    return False
+
+
+def quantize_attribute(attribute, data, export_settings):
+    """
+    Quantize an attribute, using KHR_mesh_quantization.
+    can_quantize_attribute() must be checked first.
+
+    :return: the quantized accessor
+    """
+    if attribute == "POSITION":
+        return __quantize_position(data, export_settings)
+
+    if attribute in ["NORMAL", "TANGENT"]:
+        quantized, component_type = __quantize_unit_vectors(
+            data['data'], export_settings['gltf_quantize_normal_bits'], attribute, export_settings)
+        return array_to_accessor(
+            quantized,
+            export_settings,
+            component_type=component_type,
+            data_type=data['data_type'],
+            normalized=True
+        )
+
+    if attribute.startswith("TEXCOORD_"):
+        bits, signed = export_settings['gltf_quantize_texcoord_bits'], False
+    else:
+        bits, signed = export_settings['gltf_quantize_color_bits'], False
+
+    quantized, component_type = __quantize_normalized(
+        data['data'], bits, signed, attribute.split("_")[0], export_settings)
+
+    return array_to_accessor(
+        quantized,
+        export_settings,
+        component_type=component_type,
+        data_type=data['data_type'],
+        normalized=True
+    )
+
+
+def __quantize_position(data, export_settings):
+    offset, step = data['quantization']
+    bits = export_settings['gltf_quantize_position_bits']
+
+    component_type = gltf2_io_constants.ComponentType.UnsignedByte if bits <= 8 \
+        else gltf2_io_constants.ComponentType.UnsignedShort
+    dtype = gltf2_io_constants.ComponentType.to_numpy_dtype(component_type)
+
+    grid = np.round((data['data'] - offset) / step)
+    quantized = np.clip(grid, 0, (1 << bits) - 1).astype(dtype)
+    __report_error("POSITION", quantized * step + offset, data['data'], export_settings)
+
+    normalized = export_settings['gltf_quantize_position_normalized']
+    node_scale = step * np.iinfo(dtype).max if normalized else step
+
+    accessor = array_to_accessor(
+        quantized,
+        export_settings,
+        component_type=component_type,
+        data_type=data['data_type'],
+        normalized=True if normalized else None
+    )
+    if len(quantized) > 0:
+        amax, amin = np.amax(quantized, axis=0), np.amin(quantized, axis=0)
+        if normalized:
+            # Bounds of normalized accessors are given as normalized values
+            type_max = np.iinfo(dtype).max
+            amax, amin = amax / type_max, amin / type_max
+        accessor.max, accessor.min = amax.tolist(), amin.tolist()
+
+    # Stored to set the dequantization transform on nodes using this mesh
+    export_settings['gltf_quantized_positions'][id(accessor)] = (offset, node_scale)
+    # Keep the accessor alive, so that its id can't be reused
+    export_settings['gltf_quantized_accessors'].append(accessor)
+
+    return accessor
+
+
+def __quantize_normalized(array, bits, signed, kind, export_settings):
+    """
+    Quantize values in [-1, 1] (signed) or [0, 1] (unsigned) to a grid of the given bit depth.
+    Values are stored in the smallest integer type able to hold this grid.
+    """
+    if signed:
+        component_type = gltf2_io_constants.ComponentType.Byte if bits <= 8 \
+            else gltf2_io_constants.ComponentType.Short
+        grid_max = (1 << (bits - 1)) - 1
+        low = -1.0
+    else:
+        component_type = gltf2_io_constants.ComponentType.UnsignedByte if bits <= 8 \
+            else gltf2_io_constants.ComponentType.UnsignedShort
+        grid_max = (1 << bits) - 1
+        low = 0.0
+
+    dtype = gltf2_io_constants.ComponentType.to_numpy_dtype(component_type)
+    type_max = np.iinfo(dtype).max
+
+    grid = np.round(np.clip(array, low, 1.0) * grid_max) / grid_max
+    quantized = np.round(grid * type_max).astype(dtype)
+    __report_error(kind, np.maximum(quantized / type_max, -1.0), array, export_settings)
+
+    return quantized, component_type
+
+
+def __quantize_unit_vectors(array, bits, kind, export_settings):
+    """
+    Quantize normals, or tangents with their w component, to a signed grid of the given bit depth.
+    Among the grid points around each vector, the one decoding closest to unit length is kept,
+    so that low bit depths don't give shorter or longer vectors.
+    """
+    component_type = gltf2_io_constants.ComponentType.Byte if bits <= 8 \
+        else gltf2_io_constants.ComponentType.Short
+    dtype = gltf2_io_constants.ComponentType.to_numpy_dtype(component_type)
+    type_max = np.iinfo(dtype).max
+    grid_max = (1 << (bits - 1)) - 1
+
+    def encode(grid):
+        return np.round(grid / grid_max * type_max)
+
+    def length_error(quantized):
+        return np.abs(np.linalg.norm(np.maximum(quantized / type_max, -1.0), axis=1) - 1.0)
+
+    vectors = np.asarray(array, dtype=np.float64)[:, :3]
+    lengths = np.linalg.norm(vectors, axis=1)
+    # Zero vectors are kept as they are
+    valid = lengths > 0
+    vectors = np.clip(np.divide(vectors, lengths[:, np.newaxis], out=np.zeros_like(vectors),
+                                where=valid[:, np.newaxis]), -1.0, 1.0) * grid_max
+
+    best = encode(np.round(vectors))
+    best_error = length_error(best)
+    floor = np.floor(vectors)
+    for offset in itertools.product((0, 1), repeat=3):
+        candidate = encode(np.minimum(floor + offset, grid_max))
+        error = length_error(candidate)
+        better = valid & (error < best_error)
+        best[better] = candidate[better]
+        best_error[better] = error[better]
+
+    quantized = best.astype(dtype)
+    if kind == "TANGENT":
+        # Handedness, -1 or 1
+        w, _ = __quantize_normalized(array[:, 3:], bits, True, kind, export_settings)
+        quantized = np.concatenate((quantized, w), axis=1)
+
+    __report_error(kind, np.maximum(quantized / type_max, -1.0), array, export_settings)
+
+    return quantized, component_type
+
+
+def __report_error(kind, dequantized, original, export_settings):
+    if len(original) == 0:
+        return
+    error = float(np.amax(np.abs(dequantized - original)))
+    errors = export_settings['gltf_quantization_report']['errors']
+    errors[kind] = max(errors.get(kind, 0.0), error)
+    export_settings['gltf_quantization_report']['used'] = True
+
+
+def log_quantization_report(export_settings):
+    report = export_settings['gltf_quantization_report']
+    for kind, error in report['errors'].items():
+        export_settings['log'].info("Quantization: {} max error {:.6g}".format(kind, error))
+    if len(report['skipped']) > 0:
+        export_settings['log'].info(
+            "Quantization: {} attributes with values outside [0, 1] kept as float".format(len(report['skipped'])))
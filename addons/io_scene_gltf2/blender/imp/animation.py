@@ -33,6 +33,8 @@ class BlenderAnimation():
         gltf.action_cache = {}
         # Things we need to stash when we're done.
         gltf.needs_stash = []
+        # Keyframes count of each action, before and after decimation
+        gltf.keyframe_decimation_stats = {}
 
         import_user_extensions('gather_import_animation_before_hook', gltf, anim_idx)
 
@@ -131,6 +133,9 @@ class BlenderAnimation():
         for (obj, action) in gltf.needs_stash:
             simulate_stash(obj, track_name, action)
 
+        for action_name, (before, after) in gltf.keyframe_decimation_stats.items():
+            gltf.log.info("Keyframe decimation of %s: %d of %d keyframes removed" % (action_name, before - after, before))
+
         import_user_extensions('gather_import_animation_after_hook', gltf, anim_idx, track_name)
 
         if hasattr(bpy.data.scenes[0], 'gltf2_animation_tracks') is False:
@@ -13,11 +13,11 @@
 # limitations under the License.
 
 import bpy
-from mathutils import Vector
+import numpy as np
 
 from ...io.imp.user_extensions import import_user_extensions
-from ...io.imp.gltf2_io_binary import BinaryData
-from .animation_utils import make_fcurve
+from ..com.gltf2_blender_math import np_quaternion_multiply
+from .animation_utils import make_fcurve, read_sampler, keyframe_coords, decimate_keyframes
 from .vnode import VNode
 
 
@@ -71,34 +71,30 @@ class BlenderNodeAnim():
 
         action = BlenderNodeAnim.get_or_create_action(gltf, node_idx, animation.track_name)
 
-        keys = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].input)
-        values = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].output)
-
-        if animation.samplers[channel.sampler].interpolation == "CUBICSPLINE":
-            # TODO manage tangent?
-            values = values[1::3]
+        keys, values = read_sampler(gltf, animation.samplers[channel.sampler])
 
         # Convert the curve from glTF to Blender.
+        # values is a (keys, components) array, all keys are converted at once.
 
         if path == "translation":
             blender_path = "location"
             group_name = "Location"
             num_components = 3
-            values = [gltf.loc_gltf_to_blender(vals) for vals in values]
+            gltf.locs_batch_gltf_to_blender(values)
             values = vnode.base_locs_to_final_locs(values)
 
         elif path == "rotation":
             blender_path = "rotation_quaternion"
             group_name = "Rotation"
             num_components = 4
-            values = [gltf.quaternion_gltf_to_blender(vals) for vals in values]
+            values = gltf.quaternions_batch_gltf_to_blender(values)
             values = vnode.base_rots_to_final_rots(values)
 
         elif path == "scale":
             blender_path = "scale"
             group_name = "Scale"
             num_components = 3
-            values = [gltf.scale_gltf_to_blender(vals) for vals in values]
+            gltf.scales_batch_gltf_to_blender(values)
             values = vnode.base_scales_to_final_scales(values)
 
         # Objects parented to a bone are translated to the bone tip by default.
@@ -106,8 +102,7 @@ class BlenderNodeAnim():
         if vnode.type == VNode.Object and path == "translation":
             if vnode.parent is not None and gltf.vnodes[vnode.parent].type == VNode.Bone:
                 bone_length = gltf.vnodes[vnode.parent].bone_length
-                off = Vector((0, -bone_length, 0))
-                values = [vals + off for vals in values]
+                values[:, 1] -= bone_length
 
         if vnode.type == VNode.Bone:
             # Need to animate the pose bone when the node is a bone.
@@ -135,44 +130,44 @@ class BlenderNodeAnim():
 
             if path == 'translation':
                 edit_trans, edit_rot = vnode.editbone_trans, vnode.editbone_rot
-                edit_rot_inv = edit_rot.conjugated()
-                values = [
-                    edit_rot_inv @ (trans - edit_trans)
-                    for trans in values
-                ]
+                edit_rot_inv = np.array(edit_rot.conjugated().to_matrix())
+                values = (values - np.array(edit_trans)) @ edit_rot_inv.T
 
             elif path == 'rotation':
                 edit_rot = vnode.editbone_rot
-                edit_rot_inv = edit_rot.conjugated()
-                values = [
-                    edit_rot_inv @ rot
-                    for rot in values
-                ]
+                edit_rot_inv = np.array(edit_rot.conjugated())
+                values = np_quaternion_multiply(edit_rot_inv, values)
 
             elif path == 'scale':
                 pass  # no change needed
 
         # To ensure rotations always take the shortest path, we flip
         # adjacent antipodal quaternions.
-        if path == 'rotation':
-            for i in range(1, len(values)):
-                if values[i].dot(values[i - 1]) < 0:
-                    values[i] = -values[i]
+        # A key is flipped when its dot product with the previous (already flipped) key is negative:
+        # the sign of each key is the product of the signs of all previous dot products.
+        if path == 'rotation' and len(values) > 1:
+            dots = np.sum(values[1:] * values[:-1], axis=1)
+            signs = np.cumprod(np.where(dots < 0, -1.0, 1.0))
+            values[1:] *= signs[:, np.newaxis]
+
+        keys, values, interpolation = decimate_keyframes(
+            gltf, action, keys, values,
+            animation.samplers[channel.sampler].interpolation,
+            {'translation': 'LOCATION', 'rotation': 'ROTATION'}.get(path, 'VALUE'),
+        )
 
         fps = (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
 
-        coords = [0] * (2 * len(keys))
-        coords[::2] = (key[0] * fps for key in keys)
+        coords = keyframe_coords(keys, values, fps)
 
         for i in range(0, num_components):
-            coords[1::2] = (vals[i] for vals in values)
             make_fcurve(
                 action,
-                coords,
+                coords[i],
                 data_path=blender_path,
                 index=i,
                 group_name=group_name,
-                interpolation=animation.samplers[channel.sampler].interpolation,
+                interpolation=interpolation,
             )
 
         import_user_extensions('gather_import_animation_channel_after_hook',
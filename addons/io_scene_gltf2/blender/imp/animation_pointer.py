@@ -13,13 +13,12 @@
 # limitations under the License.
 
 import bpy
+import numpy as np
 from ...io.imp.user_extensions import import_user_extensions
-from ...io.imp.gltf2_io_binary import BinaryData
 from ..exp.material.search_node_tree import NodeSocket, previous_node, from_socket, get_socket, FilterByType, get_socket_from_gltf_material_node, get_texture_node_from_socket  # TODO move to COM
 from ..exp.sampler import detect_manual_uv_wrapping  # TODO move to COM
 from ..exp.material.unlit import detect_shadeless_material  # TODO move to COM
-from ..com.conversion import texture_transform_gltf_to_blender
-from .animation_utils import make_fcurve
+from .animation_utils import make_fcurve, read_sampler, keyframe_coords, decimate_keyframes
 from .light import BlenderLight
 from .camera import BlenderCamera
 
@@ -69,14 +68,10 @@ class BlenderPointerAnim():
         action = BlenderPointerAnim.get_or_create_action(
             gltf, asset, asset_idx, animation.track_name, id_root, name=name)
 
-        keys = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].input)
-        values = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].output)
-
-        if animation.samplers[channel.sampler].interpolation == "CUBICSPLINE":
-            # TODO manage tangent?
-            values = values[1::3]
+        keys, values = read_sampler(gltf, animation.samplers[channel.sampler])
 
         # Convert the curve from glTF to Blender.
+        # values is a (keys, components) array, all keys are converted at once.
         blender_path = None
         num_components = None
         group_name = ''
@@ -97,10 +92,8 @@ class BlenderPointerAnim():
             blender_path = "lens"
             num_components = 1
 
-            old_values = values.copy()
             sensor = asset.blender_object_data.sensor_height
-            for idx, i in enumerate(old_values):
-                values[idx] = [BlenderCamera.calc_lens_from_fov(gltf, i[0], sensor)]
+            values = BlenderCamera.calc_lens_from_fov(gltf, values, sensor)
 
         if len(pointer_tab) == 5 and pointer_tab[1] == "cameras" and \
                 pointer_tab[3] in ["orthographic"] and \
@@ -112,34 +105,26 @@ class BlenderPointerAnim():
                 if "xmag" in asset.multiple_channels_mag.keys():
                     xmag_animation = gltf.data.animations[asset.multiple_channels_mag['xmag'][0]]
                     xmag_channel = xmag_animation.channels[asset.multiple_channels_mag['xmag'][1]]
-                    xmag_keys = BinaryData.get_data_from_accessor(
-                        gltf, xmag_animation.samplers[xmag_channel.sampler].input)
-                    xmag_values = BinaryData.get_data_from_accessor(
-                        gltf, xmag_animation.samplers[xmag_channel.sampler].output)
+                    xmag_keys, xmag_values = read_sampler(gltf, xmag_animation.samplers[xmag_channel.sampler])
                 else:
-                    xmag_keys == keys.copy()
-                    xmag_values = [asset.orthographic.xmag] * len(keys)
+                    xmag_keys = keys.copy()
+                    xmag_values = np.full((len(keys), 1), asset.orthographic.xmag)
 
                 if "ymag" in asset.multiple_channels_mag.keys():
                     ymag_animation = gltf.data.animations[asset.multiple_channels_mag['ymag'][0]]
                     ymag_channel = ymag_animation.channels[asset.multiple_channels_mag['ymag'][1]]
-                    ymag_keys = BinaryData.get_data_from_accessor(
-                        gltf, ymag_animation.samplers[ymag_channel.sampler].input)
-                    ymag_values = BinaryData.get_data_from_accessor(
-                        gltf, ymag_animation.samplers[ymag_channel.sampler].output)
+                    ymag_keys, ymag_values = read_sampler(gltf, ymag_animation.samplers[ymag_channel.sampler])
                 else:
-                    ymag_keys == keys.copy()
-                    ymag_values = [asset.orthographic.ymag] * len(keys)
+                    ymag_keys = keys.copy()
+                    ymag_values = np.full((len(keys), 1), asset.orthographic.ymag)
 
                 # We will manage it only if keys are the same... TODO ?
-                if xmag_keys == ymag_keys:
+                if np.array_equal(xmag_keys, ymag_keys):
 
                     blender_path = "ortho_scale"
                     num_components = 1
 
-                    old_values = values.copy()
-                    for idx, i in enumerate(old_values):
-                        values[idx] = max(xmag_values[idx], ymag_values[idx]) * 2
+                    values = np.maximum(xmag_values, ymag_values) * 2
 
                 # Delete values, as we don't need to add keyframes again for ortho_scale
                 # (xmag + ymag channels => only 1 ortho_scale channel in blender)
@@ -158,14 +143,11 @@ class BlenderPointerAnim():
             group_name = 'Color'
             num_components = 3 if blender_path == "color" else 1
 
-            # TODO perf, using numpy
             if blender_path == "energy":
-                old_values = values.copy()
-                for idx, i in enumerate(old_values):
-                    if asset['type'] in ["SPOT", "POINT"]:
-                        values[idx] = [BlenderLight.calc_energy_pointlike(gltf, i[0])]
-                    else:
-                        values[idx] = [BlenderLight.calc_energy_directional(gltf, i[0])]
+                if asset['type'] in ["SPOT", "POINT"]:
+                    values = BlenderLight.calc_energy_pointlike(gltf, values)
+                else:
+                    values = BlenderLight.calc_energy_directional(gltf, values)
 
             # TODO range, not implemented (even not in static import)
 
@@ -178,27 +160,20 @@ class BlenderPointerAnim():
                 blender_path = "spot_size"
                 num_components = 1
 
-                old_values = values.copy()
-                for idx, i in enumerate(old_values):
-                    values[idx] = [values[idx][0] * 2]
+                values = values * 2
 
             if pointer_tab[5] == "spot.innerConeAngle":
                 if "spot.outerConeAngle" in asset["multiple_channels"].keys():
                     outer_animation = gltf.data.animations[asset['multiple_channels']['spot.outerConeAngle'][0]]
                     outer_channel = outer_animation.channels[asset['multiple_channels']['spot.outerConeAngle'][1]]
-                    outer_keys = BinaryData.get_data_from_accessor(
-                        gltf, outer_animation.samplers[outer_channel.sampler].input)
-                    outer_values = BinaryData.get_data_from_accessor(
-                        gltf, outer_animation.samplers[outer_channel.sampler].output)
+                    outer_keys, outer_values = read_sampler(gltf, outer_animation.samplers[outer_channel.sampler])
                 else:
                     outer_keys = keys.copy()
-                    outer_values = [[asset['spot']['outerConeAngle']]] * len(keys)
+                    outer_values = np.full((len(keys), 1), asset['spot']['outerConeAngle'])
 
                 # We will manage it only if keys are the same... TODO ?
-                if keys == outer_keys:
-                    old_values = values.copy()
-                    for idx, i in enumerate(old_values):
-                        values[idx] = [BlenderLight.calc_spot_cone_inner(gltf, outer_values[idx][0], values[idx][0])]
+                if np.array_equal(keys, outer_keys):
+                    values = BlenderLight.calc_spot_cone_inner(gltf, outer_values, values)
                 blender_path = "spot_blend"
                 num_components = 1
 
@@ -389,31 +364,28 @@ class BlenderPointerAnim():
                 if 'rotation' in asset['multiple_channels'].keys():
                     animation_rotation = gltf.data.animations[asset['multiple_channels']['rotation'][0]]
                     channel_rotation = animation_rotation.channels[asset['multiple_channels']['rotation'][1]]
-                    keys_rotation = BinaryData.get_data_from_accessor(
-                        gltf, animation_rotation.samplers[channel_rotation.sampler].input)
-                    values_rotation = BinaryData.get_data_from_accessor(
-                        gltf, animation_rotation.samplers[channel_rotation.sampler].output)
+                    keys_rotation, values_rotation = read_sampler(
+                        gltf, animation_rotation.samplers[channel_rotation.sampler])
                 else:
                     keys_rotation = keys.copy()
-                    values_rotation = [asset.get('rotation', 0.0)] * len(keys)
+                    values_rotation = np.full((len(keys), 1), asset.get('rotation', 0.0))
 
                 if 'scale' in asset['multiple_channels'].keys():
                     animation_scale = gltf.data.animations[asset['multiple_channels']['scale'][0]]
                     channel_scale = animation_scale.channels[asset['multiple_channels']['scale'][1]]
-                    keys_scale = BinaryData.get_data_from_accessor(
-                        gltf, animation_scale.samplers[channel_scale.sampler].input)
-                    values_scale = BinaryData.get_data_from_accessor(
-                        gltf, animation_scale.samplers[channel_scale.sampler].output)
+                    keys_scale, values_scale = read_sampler(gltf, animation_scale.samplers[channel_scale.sampler])
                 else:
                     keys_scale = keys.copy()
-                    values_scale = [asset.get('scale', [1.0, 1.0])] * len(keys)
+                    values_scale = np.tile(asset.get('scale', [1.0, 1.0]), (len(keys), 1))
 
                 # We will manage it only if keys are the same... TODO ?
-                if keys == keys_rotation == keys_scale:
-                    old_values = values.copy()
-                    for idx, i in enumerate(old_values):
-                        values[idx] = texture_transform_gltf_to_blender(
-                            {'rotation': values_rotation[idx], 'scale': values_scale[idx], 'offset': i}).get('offset')
+                if np.array_equal(keys, keys_rotation) and np.array_equal(keys, keys_scale):
+                    # Same as texture_transform_gltf_to_blender, for all keys
+                    rotation, scale_y = values_rotation[:, 0], values_scale[:, 1]
+                    values = np.stack((
+                        values[:, 0] + scale_y * np.sin(rotation),
+                        1 - values[:, 1] - scale_y * np.cos(rotation),
+                    ), axis=1)
 
         if len(pointer_tab) == 6 and pointer_tab[1] == "materials" and \
                 pointer_tab[3] == "extensions" and \
@@ -447,9 +419,7 @@ class BlenderPointerAnim():
                 blender_path = density_socket.socket.path_from_id() + ".default_value"
                 num_components = 1
 
-                old_values = values.copy()
-                for idx, i in enumerate(old_values):
-                    values[idx] = [1.0 / old_values[idx][0]]
+                values = 1.0 / values
 
             if pointer_tab[5] == "attenuationColor":
                 attenuation_color_socket = get_socket(asset['blender_nodetree'], True, 'Color', volume=True)
@@ -574,9 +544,7 @@ class BlenderPointerAnim():
                 blender_path = specular_socket.socket.path_from_id() + ".default_value"
                 num_components = 1
 
-            old_values = values.copy()
-            for idx, i in enumerate(old_values):
-                values[idx] = [i[0] / 2.0]
+            values = values / 2.0
 
         if len(pointer_tab) == 6 and pointer_tab[1] == "materials" and \
                 pointer_tab[3] == "extensions" and \
@@ -629,20 +597,21 @@ class BlenderPointerAnim():
         if blender_path is None:
             return  # Should not happen if all specification is managed
 
+        keys, values, interpolation = decimate_keyframes(
+            gltf, action, keys, values, animation.samplers[channel.sampler].interpolation, 'VALUE')
+
         fps = bpy.context.scene.render.fps
 
-        coords = [0] * (2 * len(keys))
-        coords[::2] = (key[0] * fps for key in keys)
+        coords = keyframe_coords(keys, values, fps)
 
         for i in range(0, num_components):
-            coords[1::2] = (vals[i] for vals in values)
             make_fcurve(
                 action,
-                coords,
+                coords[i],
                 data_path=blender_path,
                 index=i,
                 group_name=group_name,
-                interpolation=animation.samplers[channel.sampler].interpolation,
+                interpolation=interpolation,
             )
 
         # For baseColorFactor, we also need to add keyframes to alpha socket
@@ -666,14 +635,13 @@ class BlenderPointerAnim():
             else:
                 blender_path = alpha_socket.socket.path_from_id() + ".default_value"
 
-            coords[1::2] = (vals[3] for vals in values)
             make_fcurve(
                 action,
-                coords,
+                coords[3],
                 data_path=blender_path,
                 index=0,
                 group_name=group_name,
-                interpolation=animation.samplers[channel.sampler].interpolation,
+                interpolation=interpolation,
             )
 
     @staticmethod
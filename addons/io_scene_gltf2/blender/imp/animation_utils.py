@@ -13,6 +13,9 @@
 # limitations under the License.
 
 import bpy
+import numpy as np
+from ...io.imp.gltf2_io_binary import BinaryData
+from .keyframe_decimation import decimate
 
 
 def simulate_stash(obj, track_name, action, start_frame=None):
@@ -49,6 +52,66 @@ def restore_animation_on_object(obj, anim_name):
     obj.animation_data.action = None
 
 
+def read_sampler(gltf, sampler):
+    """
+    Keys and values of an animation sampler, as numpy arrays.
+    :return: (keys,) times and (keys, components) values. All outputs of a key are components
+             (for example, all morph target weights).
+    """
+    keys = BinaryData.decode_accessor(gltf, sampler.input).reshape(-1)
+    values = np.array(BinaryData.decode_accessor(gltf, sampler.output), dtype=np.float64).reshape(len(keys), -1)
+
+    if sampler.interpolation == "CUBICSPLINE":
+        # Outputs of a key are in-tangents, values, then out-tangents
+        # TODO manage tangent?
+        values = values.reshape(len(keys), 3, -1)[:, 1]
+
+    return keys, values
+
+
+def keyframe_coords(keys, values, fps):
+    """
+    Interleaved (frame, value) coordinates, to be set on fcurve keyframes.
+    :return: (components, 2 * keys) float32 array, one row for each component of values
+    """
+    coords = np.empty((values.shape[1], 2 * len(keys)), dtype=np.float32)
+    coords[:, ::2] = keys * fps
+    coords[:, 1::2] = values.T
+    return coords
+
+
+def decimate_keyframes(gltf, action, keys, values, interpolation, kind):
+    """
+    Remove keyframes not needed to stay within tolerances, when enabled by import settings.
+    :param kind: 'LOCATION', 'ROTATION' (quaternions) or 'VALUE' (any other values, checked by component)
+    :return: keys, values and interpolation of remaining keyframes
+    """
+    mode = gltf.import_settings['import_keyframe_decimation']
+    if mode == 'NONE':
+        return keys, values, interpolation
+
+    fit = interpolation or 'LINEAR'
+    if mode == 'BEZIER' and fit == 'LINEAR':
+        fit = 'CUBICSPLINE'
+
+    if kind == 'LOCATION':
+        indices = decimate(keys, values, gltf.import_settings['import_decimation_location_tolerance'], fit, 'DISTANCE')
+    elif kind == 'ROTATION':
+        indices = decimate(keys, values, gltf.import_settings['import_decimation_rotation_tolerance'], fit, 'ANGLE')
+    else:
+        indices = decimate(keys, values, gltf.import_settings['import_decimation_value_tolerance'], fit, 'MAX')
+
+    stats = gltf.keyframe_decimation_stats.setdefault(action.name, [0, 0])
+    stats[0] += values.size
+    stats[1] += len(indices) * values.shape[1]
+
+    if len(indices) == len(keys):
+        # Nothing removed, keep the original interpolation
+        return keys, values, interpolation
+
+    return keys[indices], values[indices], fit
+
+
 def make_fcurve(action, co, data_path, index=0, group_name='', interpolation=None):
     try:
         fcurve = action.fcurves.new(data_path=data_path, index=index, action_group=group_name)
@@ -15,8 +15,7 @@
 import bpy
 
 from ...io.imp.user_extensions import import_user_extensions
-from ...io.imp.gltf2_io_binary import BinaryData
-from .animation_utils import make_fcurve
+from .animation_utils import make_fcurve, read_sampler, keyframe_coords, decimate_keyframes
 
 
 class BlenderWeightAnim():
@@ -62,44 +61,46 @@ class BlenderWeightAnim():
         action.id_root = "KEY"
         gltf.needs_stash.append((obj.data.shape_keys, action))
 
-        keys = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].input)
-        values = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].output)
+        # (keys, targets) weights
+        keys, values = read_sampler(gltf, animation.samplers[channel.sampler])
 
         # retrieve number of targets
         pymesh = gltf.data.meshes[gltf.data.nodes[node_idx].mesh]
         nb_targets = len(pymesh.shapekey_names)
 
-        if animation.samplers[channel.sampler].interpolation == "CUBICSPLINE":
-            offset = nb_targets
-            stride = 3 * nb_targets
-        else:
-            offset = 0
-            stride = nb_targets
-
-        coords = [0] * (2 * len(keys))
-        coords[::2] = (key[0] * fps for key in keys)
+        interpolation = animation.samplers[channel.sampler].interpolation
+        decimation = gltf.import_settings['import_keyframe_decimation'] != 'NONE'
+        if not decimation:
+            coords = keyframe_coords(keys, values[:, :nb_targets], fps)
+        min_weights = values[:, :nb_targets].min(axis=0)
+        max_weights = values[:, :nb_targets].max(axis=0)
 
         for sk in range(nb_targets):
             if pymesh.shapekey_names[sk] is not None:  # Do not animate shapekeys not created
-                coords[1::2] = (values[offset + stride * i + sk][0] for i in range(len(keys)))
                 kb_name = pymesh.shapekey_names[sk]
                 data_path = 'key_blocks["%s"].value' % bpy.utils.escape_identifier(kb_name)
 
+                if decimation:
+                    # Each shape key has its own fcurve, keyframes are decimated separately
+                    sk_keys, sk_values, sk_interpolation = decimate_keyframes(
+                        gltf, action, keys, values[:, sk:sk + 1], interpolation, 'VALUE')
+                    sk_coords = keyframe_coords(sk_keys, sk_values, fps)[0]
+                else:
+                    sk_coords, sk_interpolation = coords[sk], interpolation
+
                 make_fcurve(
                     action,
-                    coords,
+                    sk_coords,
                     data_path=data_path,
                     group_name="ShapeKeys",
-                    interpolation=animation.samplers[channel.sampler].interpolation,
+                    interpolation=sk_interpolation,
                 )
 
                 # Expand weight range if needed
                 kb = obj.data.shape_keys.key_blocks[kb_name]
-                min_weight = min(coords[1:2])
-                max_weight = max(coords[1:2])
-                if min_weight < kb.slider_min:
-                    kb.slider_min = min_weight
-                if max_weight > kb.slider_max:
-                    kb.slider_max = max_weight
+                if min_weights[sk] < kb.slider_min:
+                    kb.slider_min = min_weights[sk]
+                if max_weights[sk] > kb.slider_max:
+                    kb.slider_max = max_weights[sk]
 
         import_user_extensions('gather_import_animation_weight_after_hook', gltf, vnode, animation)
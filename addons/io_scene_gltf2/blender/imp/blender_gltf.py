@@ -13,9 +13,11 @@
 # limitations under the License.
 
 import bpy
+import numpy as np
 from mathutils import Vector, Quaternion, Matrix
 from ...io.imp.user_extensions import import_user_extensions
 from .scene import BlenderScene
+from .draco_compression_extension import decode_primitives
 
 
 class BlenderGlTF():
@@ -52,8 +54,17 @@ class BlenderGlTF():
         """Create glTF main worker method."""
         BlenderGlTF.set_convert_functions(gltf)
         BlenderGlTF.pre_compute(gltf)
+        decode_primitives(gltf)
         BlenderScene.create(gltf)
 
+        if gltf.merged_materials:
+            gltf.log.info("Material deduplication: %d materials reused" % gltf.merged_materials)
+        if gltf.deduplicated_images:
+            gltf.log.info("Image deduplication: %d images reused" % gltf.deduplicated_images)
+        if gltf.templated_materials:
+            gltf.log.info("Material templates: %d materials copied from %d templates" %
+                          (gltf.templated_materials, len(gltf.material_templates)))
+
     @staticmethod
     def set_convert_functions(gltf):
         if bpy.app.debug_value != 100:
@@ -87,6 +98,20 @@ class BlenderGlTF():
                 ns[:, [1, 2]] = ns[:, [2, 1]]
                 ns[:, 1] *= -1
 
+            def convert_scales_batch(ss):
+                ss[:, [1, 2]] = ss[:, [2, 1]]
+
+            # x,y,z,w -> w,x,-z,y (returns a new array)
+            def convert_quats_batch(qs):
+                return np.stack((qs[:, 3], qs[:, 0], -qs[:, 2], qs[:, 1]), axis=1)
+
+            # Column-major (n, 16) -> (n, 4, 4), same as convert_matrix (returns a new array)
+            to_blender = np.array([[u, 0, 0, 0], [0, 0, -u, 0], [0, u, 0, 0], [0, 0, 0, 1]])
+            to_gltf = np.linalg.inv(to_blender)
+
+            def convert_matrices_batch(ms):
+                return to_blender @ ms.reshape(-1, 4, 4).transpose(0, 2, 1) @ to_gltf
+
             # Correction for cameras and lights.
             # glTF: right = +X, forward = -Z, up = +Y
             # glTF after Yup2Zup: right = +X, forward = +Y, up = +Z
@@ -104,6 +129,9 @@ class BlenderGlTF():
 
             def convert_locs_batch(_locs): return
             def convert_normals_batch(_ns): return
+            def convert_scales_batch(_ss): return
+            def convert_quats_batch(qs): return qs[:, [3, 0, 1, 2]]
+            def convert_matrices_batch(ms): return ms.reshape(-1, 4, 4).transpose(0, 2, 1).copy()
 
             # Same convention, no correction needed.
             gltf.camera_correction = None
@@ -113,7 +141,10 @@ class BlenderGlTF():
         gltf.quaternion_gltf_to_blender = convert_quat
         gltf.normals_batch_gltf_to_blender = convert_normals_batch
         gltf.scale_gltf_to_blender = convert_scale
+        gltf.scales_batch_gltf_to_blender = convert_scales_batch
+        gltf.quaternions_batch_gltf_to_blender = convert_quats_batch
         gltf.matrix_gltf_to_blender = convert_matrix
+        gltf.matrices_batch_gltf_to_blender = convert_matrices_batch
 
     @staticmethod
     def pre_compute(gltf):
@@ -129,11 +160,24 @@ class BlenderGlTF():
         if gltf.data.materials:
             for material in gltf.data.materials:
                 material.blender_material = {}
+        # Blender material names by material fingerprint, when merging identical materials
+        gltf.material_fingerprints = {}
+        gltf.merged_materials = 0
+        # Materials targeted by KHR_animation_pointer, that are never merged
+        gltf.animated_materials = set()
+        # Template materials (name and node names) by node tree signature
+        gltf.material_templates = {}
+        gltf.templated_materials = 0
 
         # images
         if gltf.data.images is not None:
             for img in gltf.data.images:
                 img.blender_image_name = None
+        # Blender image names by image content hash, when deduplicating images
+        gltf.image_digests = {}
+        gltf.deduplicated_images = 0
+        # Temporary directory of embedded images, when not packed
+        gltf.image_directory = None
 
         if gltf.data.nodes is None:
             # Something is wrong in file, there is no nodes
@@ -374,6 +418,9 @@ class BlenderGlTF():
                 pointer_tab[4])]["animations"][anim_idx].append(channel_idx)
 
         # Materials
+        if len(pointer_tab) >= 3 and pointer_tab[1] == "materials":
+            gltf.animated_materials.add(int(pointer_tab[2]))
+
         if len(pointer_tab) == 4 and pointer_tab[1] == "materials" and \
                 pointer_tab[3] in ["emissiveFactor", "alphaCutoff"]:
 
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import bpy
-from math import tan
+import numpy as np
 from ..com.extras import set_extras
 from ...io.imp.user_extensions import import_user_extensions
 
@@ -82,4 +82,4 @@ class BlenderCamera():
 
     @staticmethod
     def calc_lens_from_fov(gltf, input_value, sensor):
-        return (sensor / 2.0) / tan(input_value * 0.5)
+        return (sensor / 2.0) / np.tan(input_value * 0.5)
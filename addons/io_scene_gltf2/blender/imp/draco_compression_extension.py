@@ -12,11 +12,48 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from ctypes import *
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 
 from ...io.com.gltf2_io import BufferView
-from ...io.imp.gltf2_io_binary import BinaryData
-from ...io.com.draco import dll_path
+from ...io.com.draco import load_dll
+
+
+def decode_primitives(gltf):
+    """
+    Decode all Draco compressed primitives of the meshes used by nodes, before mesh creation.
+    Primitives are decoded concurrently: the library calls release the GIL.
+    glTF data is only read by workers, decoded data is moved into buffers afterwards.
+    """
+    if gltf.data.nodes is None or gltf.data.meshes is None:
+        return
+
+    mesh_indices = sorted(set(node.mesh for node in gltf.data.nodes if node.mesh is not None))
+    prims = []
+    for mesh_idx in mesh_indices:
+        pymesh = gltf.data.meshes[mesh_idx]
+        for prim in pymesh.primitives:
+            if prim.extensions is not None and 'KHR_draco_mesh_compression' in prim.extensions \
+                    and 'POSITION' in prim.attributes:
+                gltf.log.info('Draco Decoder: Decode primitive {}'.format(pymesh.name or '[unnamed]'))
+                prims.append(prim)
+
+    if len(prims) == 0:
+        return
+
+    dll = load_dll()
+
+    # Buffers are loaded before starting workers
+    draco_buffers = [__get_buffer_view_array(gltf, prim.extensions['KHR_draco_mesh_compression']['bufferView'])
+                     for prim in prims]
+
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(
+            lambda args: __decode(gltf, dll, *args), zip(prims, draco_buffers)))
+
+    for prim, result in zip(prims, results):
+        __set_decoded_primitive(gltf, prim, result)
+        prim.draco_decoded = True
 
 
 def decode_primitive(gltf, prim):
@@ -24,55 +61,73 @@ def decode_primitive(gltf, prim):
     Handles draco compression.
     Moves decoded data into new buffers and buffer views held by the accessors of the given primitive.
     """
+    dll = load_dll()
+    draco_buffer = __get_buffer_view_array(gltf, prim.extensions['KHR_draco_mesh_compression']['bufferView'])
+    __set_decoded_primitive(gltf, prim, __decode(gltf, dll, prim, draco_buffer))
+    prim.draco_decoded = True
 
-    # Load DLL and setup function signatures.
-    dll = cdll.LoadLibrary(str(dll_path().resolve()))
 
-    dll.decoderCreate.restype = c_void_p
-    dll.decoderCreate.argtypes = []
+def __get_buffer_view_array(gltf, buffer_view_idx):
+    """Compressed data of a buffer view, as an array over the buffer memory (no copy)."""
+    buffer_view = gltf.data.buffer_views[buffer_view_idx]
+    if buffer_view.buffer not in gltf.buffers.keys():
+        gltf.load_buffer(buffer_view.buffer)
+    buffer = gltf.buffers[buffer_view.buffer]
 
-    dll.decoderRelease.restype = None
-    dll.decoderRelease.argtypes = [c_void_p]
+    byte_offset = buffer_view.byte_offset
+    if byte_offset is None:
+        byte_offset = 0
 
-    dll.decoderDecode.restype = c_bool
-    dll.decoderDecode.argtypes = [c_void_p, c_void_p, c_size_t]
+    return np.frombuffer(buffer, dtype=np.uint8, count=buffer_view.byte_length, offset=byte_offset)
 
-    dll.decoderReadAttribute.restype = c_bool
-    dll.decoderReadAttribute.argtypes = [c_void_p, c_uint32, c_size_t, c_char_p]
 
-    dll.decoderGetVertexCount.restype = c_uint32
-    dll.decoderGetVertexCount.argtypes = [c_void_p]
+def __decode(gltf, dll, prim, draco_buffer):
+    """
+    Decode a primitive, without modifying glTF data: this runs in a worker thread.
+    :return: (error, indices, attributes, index count, vertex count)
+    """
+    extension = prim.extensions['KHR_draco_mesh_compression']
 
-    dll.decoderGetIndexCount.restype = c_uint32
-    dll.decoderGetIndexCount.argtypes = [c_void_p]
+    decoder = dll.decoderCreate()
+    try:
+        if not dll.decoderDecode(decoder, draco_buffer.ctypes.data, len(draco_buffer)):
+            return 'Unable to decode.', None, None, 0, 0
 
-    dll.decoderAttributeIsNormalized.restype = c_bool
-    dll.decoderAttributeIsNormalized.argtypes = [c_void_p, c_uint32]
+        # Read indices.
+        index_accessor = gltf.data.accessors[prim.indices]
+        if not dll.decoderReadIndices(decoder, index_accessor.component_type):
+            return 'Unable to decode indices.', None, None, 0, 0
 
-    dll.decoderGetAttributeByteLength.restype = c_size_t
-    dll.decoderGetAttributeByteLength.argtypes = [c_void_p, c_uint32]
+        indices = bytes(dll.decoderGetIndicesByteLength(decoder))
+        dll.decoderCopyIndices(decoder, indices)
 
-    dll.decoderCopyAttribute.restype = None
-    dll.decoderCopyAttribute.argtypes = [c_void_p, c_uint32, c_void_p]
+        # Read each attribute.
+        attributes = {}
+        for attr in extension['attributes']:
+            dracoId = extension['attributes'][attr]
+            if attr not in prim.attributes:
+                return 'Draco attribute {} not in primitive attributes.'.format(attr), None, None, 0, 0
 
-    dll.decoderReadIndices.restype = c_bool
-    dll.decoderReadIndices.argtypes = [c_void_p, c_size_t]
+            accessor = gltf.data.accessors[prim.attributes[attr]]
+            if not dll.decoderReadAttribute(decoder, dracoId, accessor.component_type, accessor.type.encode()):
+                return 'Could not decode attribute {}.'.format(attr), None, None, 0, 0
 
-    dll.decoderGetIndicesByteLength.restype = c_size_t
-    dll.decoderGetIndicesByteLength.argtypes = [c_void_p]
+            decoded_data = bytes(dll.decoderGetAttributeByteLength(decoder, dracoId))
+            dll.decoderCopyAttribute(decoder, dracoId, decoded_data)
+            attributes[attr] = decoded_data
 
-    dll.decoderCopyIndices.restype = None
-    dll.decoderCopyIndices.argtypes = [c_void_p, c_void_p]
+        return None, indices, attributes, dll.decoderGetIndexCount(decoder), dll.decoderGetVertexCount(decoder)
 
-    decoder = dll.decoderCreate()
-    extension = prim.extensions['KHR_draco_mesh_compression']
+    finally:
+        dll.decoderRelease(decoder)
 
-    name = prim.name if hasattr(prim, 'name') else '[unnamed]'
 
-    # Create Draco decoder.
-    draco_buffer = bytes(BinaryData.get_buffer_view(gltf, extension['bufferView']))
-    if not dll.decoderDecode(decoder, draco_buffer, len(draco_buffer)):
-        gltf.log.error('Draco Decoder: Unable to decode. Skipping primitive {}.'.format(name))
+def __set_decoded_primitive(gltf, prim, result):
+    error, indices, attributes, index_count, vertex_count = result
+
+    name = prim.name if hasattr(prim, 'name') else '[unnamed]'
+    if error is not None:
+        gltf.log.error('Draco Decoder: {} Skipping primitive {}.'.format(error, name))
         return
 
     # Choose a buffer index which does not yet exist, skipping over existing glTF buffers yet to be loaded
@@ -82,55 +137,31 @@ def decode_primitive(gltf, prim):
         if base_buffer_idx <= existing_buffer_idx:
             base_buffer_idx = existing_buffer_idx + 1
 
-    # Read indices.
     index_accessor = gltf.data.accessors[prim.indices]
-    if dll.decoderGetIndexCount(decoder) != index_accessor.count:
+    if index_count != index_accessor.count:
         gltf.log.warning(
             'Draco Decoder: Index count of accessor and decoded index count does not match. Updating accessor.')
-        index_accessor.count = dll.decoderGetIndexCount(decoder)
-    if not dll.decoderReadIndices(decoder, index_accessor.component_type):
-        gltf.log.error('Draco Decoder: Unable to decode indices. Skipping primitive {}.'.format(name))
-        return
-
-    indices_byte_length = dll.decoderGetIndicesByteLength(decoder)
-    decoded_data = bytes(indices_byte_length)
-    dll.decoderCopyIndices(decoder, decoded_data)
+        index_accessor.count = index_count
 
     # Generate a new buffer holding the decoded indices.
-    gltf.buffers[base_buffer_idx] = decoded_data
+    gltf.buffers[base_buffer_idx] = indices
 
     # Create a buffer view referencing the new buffer.
     gltf.data.buffer_views.append(BufferView.from_dict({
         'buffer': base_buffer_idx,
-        'byteLength': indices_byte_length
+        'byteLength': len(indices)
     }))
 
     # Update accessor to point to the new buffer view.
     index_accessor.buffer_view = len(gltf.data.buffer_views) - 1
 
-    # Read each attribute.
-    for attr_idx, attr in enumerate(extension['attributes']):
-        dracoId = extension['attributes'][attr]
-        if attr not in prim.attributes:
-            gltf.log.error(
-                'Draco Decoder: Draco attribute {} not in primitive attributes. Skipping primitive {}.'.format(
-                    attr, name))
-            return
-
+    for attr_idx, (attr, decoded_data) in enumerate(attributes.items()):
         accessor = gltf.data.accessors[prim.attributes[attr]]
-        if dll.decoderGetVertexCount(decoder) != accessor.count:
+        if vertex_count != accessor.count:
             gltf.log.warning(
                 'Draco Decoder: Vertex count of accessor and decoded vertex count does not match for attribute {}. Updating accessor.'.format(
-                    attr,
-                    name))
-            accessor.count = dll.decoderGetVertexCount(decoder)
-        if not dll.decoderReadAttribute(decoder, dracoId, accessor.component_type, accessor.type.encode()):
-            gltf.log.error('Draco Decoder: Could not decode attribute {}. Skipping primitive {}.'.format(attr, name))
-            return
-
-        byte_length = dll.decoderGetAttributeByteLength(decoder, dracoId)
-        decoded_data = bytes(byte_length)
-        dll.decoderCopyAttribute(decoder, dracoId, decoded_data)
+                    attr))
+            accessor.count = vertex_count
 
         # Generate a new buffer holding the decoded vertex data.
         buffer_idx = base_buffer_idx + 1 + attr_idx
@@ -139,10 +170,8 @@ def decode_primitive(gltf, prim):
         # Create a buffer view referencing the new buffer.
         gltf.data.buffer_views.append(BufferView.from_dict({
             'buffer': buffer_idx,
-            'byteLength': byte_length
+            'byteLength': len(decoded_data)
         }))
 
         # Update accessor to point to the new buffer view.
         accessor.buffer_view = len(gltf.data.buffer_views) - 1
-
-    dll.decoderRelease(decoder)
@@ -0,0 +1,131 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bpy
+import numpy as np
+from ...io.imp.gltf2_io_binary import BinaryData
+from ...io.com.constants import DataType
+from ..com.conversion import get_attribute_type
+from .mesh import squish
+
+
+class BlenderGpuInstancing():
+    """
+    Blender instancer for EXT_mesh_gpu_instancing.
+    All instances of a node are the points of a single mesh, carrying instance transforms and custom
+    attributes. A Geometry Nodes modifier instances the mesh object on these points.
+    """
+    def __new__(cls, *args, **kwargs):
+        raise RuntimeError("%s should not be instantiated" % cls)
+
+    @staticmethod
+    def create(gltf, vnode, source_obj, special_collection):
+        """
+        Create the instancer object.
+        source_obj is the instanced mesh object. It is linked to the special (hidden) collection,
+        it is only used by the instancer.
+        """
+        ext_attributes = vnode.gpu_instancing['attributes']
+        count = gltf.data.accessors[next(iter(ext_attributes.values()))].count
+
+        if 'TRANSLATION' in ext_attributes:
+            locs = np.array(BinaryData.decode_accessor(gltf, ext_attributes['TRANSLATION']), dtype=np.float32)
+            gltf.locs_batch_gltf_to_blender(locs)
+        else:
+            locs = np.zeros((count, 3), dtype=np.float32)
+
+        if 'ROTATION' in ext_attributes:
+            rots = gltf.quaternions_batch_gltf_to_blender(
+                np.array(BinaryData.decode_accessor(gltf, ext_attributes['ROTATION']), dtype=np.float32))
+        else:
+            rots = np.zeros((count, 4), dtype=np.float32)
+            rots[:, 0] = 1.0
+
+        if 'SCALE' in ext_attributes:
+            scales = np.array(BinaryData.decode_accessor(gltf, ext_attributes['SCALE']), dtype=np.float32)
+            gltf.scales_batch_gltf_to_blender(scales)
+        else:
+            scales = np.ones((count, 3), dtype=np.float32)
+
+        name = vnode.name or source_obj.name
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(count)
+        mesh.attributes['position'].data.foreach_set('vector', squish(locs, np.float32))
+        mesh.attributes.new('rotation', 'QUATERNION', 'POINT').data.foreach_set('value', squish(rots, np.float32))
+        mesh.attributes.new('scale', 'FLOAT_VECTOR', 'POINT').data.foreach_set('vector', squish(scales, np.float32))
+
+        # Custom attributes are kept on points, Geometry Nodes propagates them to instances
+        for attr, accessor_idx in ext_attributes.items():
+            if not attr.startswith('_'):
+                continue
+            accessor = gltf.data.accessors[accessor_idx]
+            blender_attribute_data_type = get_attribute_type(accessor.component_type, accessor.type)
+            if blender_attribute_data_type is None:
+                continue
+
+            data = BinaryData.decode_accessor(gltf, accessor_idx)
+            blender_attribute = mesh.attributes.new(attr, blender_attribute_data_type, 'POINT')
+            if DataType.num_elements(accessor.type) == 1:
+                blender_attribute.data.foreach_set('value', data.flatten())
+            elif blender_attribute_data_type in ["BYTE_COLOR", "FLOAT_COLOR"]:
+                blender_attribute.data.foreach_set('color', data.flatten())
+            else:
+                blender_attribute.data.foreach_set('vector', data.flatten())
+
+        special_collection.objects.link(source_obj)
+
+        obj = bpy.data.objects.new(name, mesh)
+        modifier = obj.modifiers.new(name="glTF Instances", type='NODES')
+        modifier.node_group = BlenderGpuInstancing.create_node_group(name, source_obj)
+
+        return obj
+
+    @staticmethod
+    def create_node_group(name, source_obj):
+        """Instance on Points node group, instancing source_obj with the rotation and scale attributes."""
+        node_group = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+        node_group.interface.new_socket('Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+        node_group.interface.new_socket('Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+        group_input = node_group.nodes.new('NodeGroupInput')
+        group_input.location = (-600, 0)
+        group_output = node_group.nodes.new('NodeGroupOutput')
+        group_output.location = (300, 0)
+
+        object_info = node_group.nodes.new('GeometryNodeObjectInfo')
+        object_info.location = (-400, -100)
+        object_info.inputs['Object'].default_value = source_obj
+        object_info.inputs['As Instance'].default_value = True
+
+        rotation = node_group.nodes.new('GeometryNodeInputNamedAttribute')
+        rotation.location = (-400, -350)
+        rotation.data_type = 'QUATERNION'
+        rotation.inputs['Name'].default_value = 'rotation'
+
+        scale = node_group.nodes.new('GeometryNodeInputNamedAttribute')
+        scale.location = (-400, -500)
+        scale.data_type = 'FLOAT_VECTOR'
+        scale.inputs['Name'].default_value = 'scale'
+
+        instance = node_group.nodes.new('GeometryNodeInstanceOnPoints')
+        instance.location = (0, 0)
+
+        links = node_group.links
+        links.new(group_input.outputs[0], instance.inputs['Points'])
+        links.new(object_info.outputs['Geometry'], instance.inputs['Instance'])
+        links.new(rotation.outputs['Attribute'], instance.inputs['Rotation'])
+        links.new(scale.outputs['Attribute'], instance.inputs['Scale'])
+        links.new(instance.outputs['Instances'], group_output.inputs[0])
+
+        return node_group
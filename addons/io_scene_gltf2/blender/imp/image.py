@@ -13,13 +13,25 @@
 # limitations under the License.
 
 import bpy
+import hashlib
 import os
+import tempfile
 from os.path import dirname, join, basename
 
 from ...io.com.path import uri_to_path
 from ...io.imp.gltf2_io_binary import BinaryData
 from ...io.imp.user_extensions import import_user_extensions
 
+# Size of file reads when hashing image files
+IMAGE_DIGEST_CHUNK_SIZE = 1 << 20
+
+# Extensions of embedded images written to files, by MIME type
+FILE_EXTENSIONS = {
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/webp': '.webp',
+}
+
 
 # Note that Image is not a glTF2.0 object
 class BlenderImage():
@@ -36,6 +48,16 @@ class BlenderImage():
             # Image is already used somewhere
             return
 
+        digest = None
+        if gltf.import_settings['import_image_deduplication']:
+            digest = image_digest(gltf, img_idx)
+            blender_image_name = gltf.image_digests.get(digest)
+            if blender_image_name is not None:
+                # Reuse the Blender image of an image with the same content
+                img.blender_image_name = blender_image_name
+                gltf.deduplicated_images += 1
+                return
+
         import_user_extensions('gather_import_image_before_hook', gltf, img)
 
         if img.uri is not None and not img.uri.startswith('data:'):
@@ -46,6 +68,8 @@ class BlenderImage():
         if blender_image:
             blender_image.alpha_mode = 'CHANNEL_PACKED'
             img.blender_image_name = blender_image.name
+            if digest is not None:
+                gltf.image_digests[digest] = blender_image.name
 
         import_user_extensions('gather_import_image_after_hook', gltf, img, blender_image)
 
@@ -89,12 +113,18 @@ def create_from_file(gltf, img_idx):
 
 
 def create_from_data(gltf, img_idx):
-    # Image stored as data => pack
+    # Image stored as data => pack, or write to a temporary file
     img_data = BinaryData.get_image_data(gltf, img_idx)
     if img_data is None:
         return
     img_name = gltf.data.images[img_idx].name or 'Image_%d' % img_idx
 
+    if gltf.import_settings['import_embedded_images'] == 'FILES':
+        path = _write_temporary_file(gltf, img_idx, img_name, img_data)
+        blender_image = bpy.data.images.load(path)
+        blender_image.name = img_name
+        return blender_image
+
     # Create image, width and height are dummy values
     blender_image = bpy.data.images.new(img_name, 8, 8)
     # Set packed file data
@@ -104,6 +134,51 @@ def create_from_data(gltf, img_idx):
     return blender_image
 
 
+def image_digest(gltf, img_idx):
+    """Hash of the content of an image, or None if it can't be read."""
+    img = gltf.data.images[img_idx]
+    h = hashlib.blake2b(digest_size=20)
+
+    if img.uri is not None and not img.uri.startswith('data:'):
+        path = os.path.abspath(join(dirname(gltf.filename), uri_to_path(img.uri)))
+        try:
+            with open(path, 'rb') as f:
+                while True:
+                    chunk = f.read(IMAGE_DIGEST_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    h.update(chunk)
+        except OSError:
+            return None
+    else:
+        img_data = BinaryData.get_image_data(gltf, img_idx)
+        if img_data is None:
+            return None
+        h.update(img_data)
+
+    return h.digest()
+
+
+def _write_temporary_file(gltf, img_idx, img_name, img_data):
+    # All images of an import are written in the same directory.
+    # Files are kept after import: Blender images are loaded from them.
+    if gltf.image_directory is None:
+        gltf.image_directory = tempfile.mkdtemp(prefix='gltf_images_')
+        gltf.log.info("Embedded images written to %s" % gltf.image_directory)
+
+    img = gltf.data.images[img_idx]
+    mime_type = img.mime_type
+    if mime_type is None and img.uri is not None:
+        # data:image/png;base64,...
+        mime_type = img.uri[len('data:'):].split(';')[0]
+
+    filename = '%d_%s%s' % (img_idx, bpy.path.clean_name(img_name), FILE_EXTENSIONS.get(mime_type, ''))
+    path = join(gltf.image_directory, filename)
+    with open(path, 'wb') as f:
+        f.write(img_data)
+    return path
+
+
 def _placeholder_image(name, path):
     image = bpy.data.images.new(name, 128, 128)
     # allow the path to be resolved later
@@ -0,0 +1,155 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Error-bounded keyframe decimation.
+# Keyframes are added back, starting from the first and last ones, until the curve
+# through the kept keyframes is within tolerance of all original keyframes.
+# Each iteration evaluates the curve at all keyframes at once, and keeps the worst
+# keyframe of each segment out of tolerance.
+
+import numpy as np
+
+# Length of automatic handles of fcurve keyframes, relative to the distance to the
+# neighbouring keyframe (see BKE_nurb_handle_calc)
+AUTO_HANDLE_RATIO = 2.0 / 5.1228
+# Automatic handles are not longer than this ratio of the handle on the other side
+AUTO_HANDLE_MAX_RATIO = 5.0
+
+NEWTON_ITERATIONS = 8
+
+
+def decimate(keys, values, tolerance, interpolation, error):
+    """
+    Keyframes to keep, so that the curve through them stays within tolerance of all keyframes.
+
+    :param keys: (keys,) times
+    :param values: (keys, components) values
+    :param interpolation: how the curve is evaluated between keyframes: 'LINEAR', 'STEP',
+                          or 'CUBICSPLINE' (Bézier with automatic handles, as created on import)
+    :param error: 'DISTANCE' (euclidean), 'MAX' (largest error of all components),
+                  or 'ANGLE' (values are quaternions)
+    :return: sorted indices of kept keyframes
+    """
+    count = len(keys)
+    if count <= 2:
+        return np.arange(count)
+
+    evaluate = EVALUATE[interpolation]
+    measure = ERRORS[error]
+
+    kept = np.zeros(count, dtype=bool)
+    kept[0] = kept[-1] = True
+    positions = np.arange(count)
+
+    while True:
+        indices = np.flatnonzero(kept)
+        # Segment (between two kept keyframes) of each keyframe
+        segments = np.clip(np.searchsorted(indices, positions, side='right') - 1, 0, len(indices) - 2)
+
+        errors = measure(evaluate(keys, values, indices, segments), values)
+        errors[indices] = 0.0
+        over = errors > tolerance
+        if not over.any():
+            return indices
+
+        # Worst keyframe of each segment. The first one is kept when several have the same error:
+        # on STEP curves, this is where the value changes, so a staircase needs one keyframe per stair.
+        # (The sort is stable, keyframes with the same error stay in time order)
+        order = np.lexsort((-errors, segments))
+        first = np.insert(segments[order][1:] != segments[order][:-1], 0, True)
+        worst = order[first]
+        kept[worst[over[worst]]] = True
+
+
+def __intervals(keys):
+    intervals = np.diff(keys)
+    # Keyframes at the same time should not happen, avoid dividing by zero anyway
+    return np.where(intervals > 0, intervals, 1.0)
+
+
+def __evaluate_step(keys, values, indices, segments):
+    return values[indices[segments]]
+
+
+def __evaluate_linear(keys, values, indices, segments):
+    start, end = indices[segments], indices[segments + 1]
+    factors = (keys - keys[start]) / __intervals(keys[indices])[segments]
+    return values[start] + factors[:, np.newaxis] * (values[end] - values[start])
+
+
+def __evaluate_bezier(keys, values, indices, segments):
+    kept_keys, kept_values = keys[indices], values[indices]
+    intervals = __intervals(kept_keys)
+
+    # Automatic handles have the average slope of the adjacent segments.
+    # With constant extrapolation, handles of the first and last keyframes are flat.
+    slopes = np.diff(kept_values, axis=0) / intervals[:, np.newaxis]
+    tangents = np.zeros_like(kept_values)
+    tangents[1:-1] = (slopes[:-1] + slopes[1:]) / 2
+
+    # Handle lengths on each side of segments
+    previous = np.concatenate((intervals[:1], intervals[:-1]))
+    following = np.concatenate((intervals[1:], intervals[-1:]))
+    right = np.minimum(intervals, AUTO_HANDLE_MAX_RATIO * previous) * AUTO_HANDLE_RATIO
+    left = np.minimum(intervals, AUTO_HANDLE_MAX_RATIO * following) * AUTO_HANDLE_RATIO
+
+    # Bézier control points of the segment of each keyframe
+    x0 = kept_keys[segments]
+    x3 = kept_keys[segments + 1]
+    x1 = x0 + right[segments]
+    x2 = x3 - left[segments]
+    y0 = kept_values[segments]
+    y3 = kept_values[segments + 1]
+    y1 = y0 + tangents[segments] * right[segments, np.newaxis]
+    y2 = y3 - tangents[segments + 1] * left[segments, np.newaxis]
+
+    # Curve parameter of each keyframe time, x being monotonic on segments
+    u = (keys - x0) / intervals[segments]
+    for _ in range(NEWTON_ITERATIONS):
+        v = 1.0 - u
+        x = v * v * v * x0 + 3.0 * v * v * u * x1 + 3.0 * v * u * u * x2 + u * u * u * x3
+        dx = 3.0 * (v * v * (x1 - x0) + 2.0 * v * u * (x2 - x1) + u * u * (x3 - x2))
+        u = np.clip(u - (x - keys) / np.where(dx > 0, dx, 1.0), 0.0, 1.0)
+
+    u = u[:, np.newaxis]
+    v = 1.0 - u
+    return v * v * v * y0 + 3.0 * v * v * u * y1 + 3.0 * v * u * u * y2 + u * u * u * y3
+
+
+def __error_distance(approx, values):
+    return np.linalg.norm(approx - values, axis=1)
+
+
+def __error_max(approx, values):
+    return np.abs(approx - values).max(axis=1)
+
+
+def __error_angle(approx, values):
+    # Quaternion curves are evaluated by component, then normalized
+    norms = np.linalg.norm(approx, axis=1) * np.linalg.norm(values, axis=1)
+    dots = np.abs(np.sum(approx * values, axis=1)) / np.where(norms > 0, norms, 1.0)
+    return 2.0 * np.arccos(np.clip(dots, 0.0, 1.0))
+
+
+EVALUATE = {
+    'STEP': __evaluate_step,
+    'LINEAR': __evaluate_linear,
+    'CUBICSPLINE': __evaluate_bezier,
+}
+
+ERRORS = {
+    'DISTANCE': __error_distance,
+    'MAX': __error_max,
+    'ANGLE': __error_angle,
+}
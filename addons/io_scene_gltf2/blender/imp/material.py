@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import bpy
 
 from ...io.imp.user_extensions import import_user_extensions
@@ -19,6 +20,7 @@ from ..com.extras import set_extras
 from .pbrMetallicRoughness import MaterialHelper, pbr_metallic_roughness
 from .KHR_materials_pbrSpecularGlossiness import pbr_specular_glossiness
 from .KHR_materials_unlit import unlit
+from .material_template import MaterialRecording, TemplateUnsupported
 
 
 class BlenderMaterial():
@@ -31,49 +33,165 @@ class BlenderMaterial():
         """Material creation."""
         pymaterial = gltf.data.materials[material_idx]
 
+        fingerprint = None
+        if gltf.import_settings['import_merge_materials']:
+            fingerprint = BlenderMaterial.fingerprint(gltf, material_idx, vertex_color)
+            mat_name = gltf.material_fingerprints.get(fingerprint)
+            if mat_name is not None:
+                # Reuse the Blender material of an identical glTF material
+                mat = bpy.data.materials[mat_name]
+                pymaterial.blender_material[vertex_color] = mat_name
+                if gltf.KHR_materials_variants is True:
+                    gltf.variant_mapping[str(material_idx) + str(vertex_color)] = mat
+                BlenderMaterial.set_animation_pointer_references(pymaterial, mat)
+                gltf.merged_materials += 1
+                return
+
         import_user_extensions('gather_import_material_before_hook', gltf, pymaterial, vertex_color)
 
         name = pymaterial.name
         if name is None:
             name = "Material_" + str(material_idx)
 
-        mat = bpy.data.materials.new(name)
+        mat = None
+        if BlenderMaterial.use_template(gltf, material_idx):
+            recording = MaterialRecording()
+            try:
+                BlenderMaterial.create_nodes(MaterialHelper(gltf, pymaterial, recording, vertex_color))
+                if recording.failure is not None:
+                    # Caught by the node builders (hasattr, getattr with default)
+                    raise TemplateUnsupported(recording.failure)
+            except TemplateUnsupported as e:
+                gltf.log.debug("Material %s not built from a template: %s" % (name, e))
+            else:
+                mat = BlenderMaterial.create_from_template(gltf, recording, name, vertex_color)
+                recording.replace_references(pymaterial, mat)
+
+        if mat is None:
+            mat = BlenderMaterial.new_material(name)
+            BlenderMaterial.create_nodes(MaterialHelper(gltf, pymaterial, mat, vertex_color))
+
         pymaterial.blender_material[vertex_color] = mat.name
+        if fingerprint is not None:
+            gltf.material_fingerprints[fingerprint] = mat.name
 
         set_extras(mat, pymaterial.extras)
         BlenderMaterial.set_double_sided(pymaterial, mat)
         BlenderMaterial.set_eevee_surface_render_method(pymaterial, mat)
         BlenderMaterial.set_viewport_color(pymaterial, mat, vertex_color)
 
+        # Manage KHR_materials_variants
+        # We need to store link between material idx in glTF and Blender Material id
+        if gltf.KHR_materials_variants is True:
+            gltf.variant_mapping[str(material_idx) + str(vertex_color)] = mat
+
+        BlenderMaterial.set_animation_pointer_references(pymaterial, mat)
+
+        import_user_extensions('gather_import_material_after_hook', gltf, pymaterial, vertex_color, mat)
+
+    @staticmethod
+    def set_animation_pointer_references(pymaterial, mat):
+        if 'KHR_materials_pbrSpecularGlossiness' not in (pymaterial.extensions or {}):
+            pymaterial.pbr_metallic_roughness.blender_nodetree = mat.node_tree  # Used in case of for KHR_animation_pointer
+            # Used in case of for KHR_animation_pointer #TODOPointer Vertex Color...
+            pymaterial.pbr_metallic_roughness.blender_mat = mat
+
+        pymaterial.blender_nodetree = mat.node_tree  # Used in case of for KHR_animation_pointer
+        pymaterial.blender_mat = mat  # Used in case of for KHR_animation_pointer #TODOPointer Vertex Color...
+
+    @staticmethod
+    def new_material(name):
+        mat = bpy.data.materials.new(name)
         mat.use_nodes = True
         while mat.node_tree.nodes:  # clear all nodes
             mat.node_tree.nodes.remove(mat.node_tree.nodes[0])
+        return mat
 
-        mh = MaterialHelper(gltf, pymaterial, mat, vertex_color)
-
-        exts = pymaterial.extensions or {}
+    @staticmethod
+    def create_nodes(mh):
+        exts = mh.pymat.extensions or {}
         if 'KHR_materials_unlit' in exts:
             unlit(mh)
-            pymaterial.pbr_metallic_roughness.blender_nodetree = mat.node_tree  # Used in case of for KHR_animation_pointer
-            # Used in case of for KHR_animation_pointer #TODOPointer Vertex Color...
-            pymaterial.pbr_metallic_roughness.blender_mat = mat
         elif 'KHR_materials_pbrSpecularGlossiness' in exts:
             pbr_specular_glossiness(mh)
         else:
             pbr_metallic_roughness(mh)
-            pymaterial.pbr_metallic_roughness.blender_nodetree = mat.node_tree  # Used in case of for KHR_animation_pointer
-            # Used in case of for KHR_animation_pointer #TODOPointer Vertex Color...
-            pymaterial.pbr_metallic_roughness.blender_mat = mat
 
-        # Manage KHR_materials_variants
-        # We need to store link between material idx in glTF and Blender Material id
-        if gltf.KHR_materials_variants is True:
-            gltf.variant_mapping[str(material_idx) + str(vertex_color)] = mat
+    @staticmethod
+    def use_template(gltf, material_idx):
+        # Animated materials keep references to their own nodes, and user extensions
+        # can change nodes in any way
+        return gltf.import_settings['import_material_templates'] and \
+            material_idx not in gltf.animated_materials and \
+            not gltf.import_user_extensions
 
-        pymaterial.blender_nodetree = mat.node_tree  # Used in case of for KHR_animation_pointer
-        pymaterial.blender_mat = mat  # Used in case of for KHR_animation_pointer #TODOPointer Vertex Color...
+    @staticmethod
+    def create_from_template(gltf, recording, name, vertex_color):
+        """
+        Create a material from the recording of its nodes: a copy of the template material
+        of the same signature, or a new template.
+        """
+        signature = (vertex_color, recording.signature())
+        template = gltf.material_templates.get(signature)
+
+        if template is None:
+            mat = BlenderMaterial.new_material(name)
+            gltf.material_templates[signature] = (mat.name, recording.build(mat))
+            return mat
+
+        template_name, node_names = template
+        mat = bpy.data.materials[template_name].copy()
+        mat.name = name
+        for key in list(mat.keys()):  # extras of the template
+            del mat[key]
+        recording.apply_values(mat, node_names)
+        gltf.templated_materials += 1
+        return mat
 
-        import_user_extensions('gather_import_material_after_hook', gltf, pymaterial, vertex_color, mat)
+    @staticmethod
+    def fingerprint(gltf, material_idx, vertex_color):
+        """
+        Key of the material definition: materials with the same key only differ by their names.
+        Returns None for materials that must have their own Blender material.
+        """
+        if material_idx in gltf.animated_materials:
+            return None
+
+        definition = BlenderMaterial.definition(gltf, gltf.data.materials[material_idx].to_dict())
+        definition.pop('name', None)
+        # Values that can't be serialized are compared by identity
+        return json.dumps([definition, vertex_color], sort_keys=True, default=lambda v: '%s@%x' % (type(v), id(v)))
+
+    @staticmethod
+    def definition(gltf, value):
+        """
+        Copy of a material dict, where textures are replaced by their definition
+        (images and samplers), and without data added during import.
+        """
+        if isinstance(value, dict):
+            result = {}
+            for key, val in value.items():
+                if key.startswith('blender_') or key in ['animations', 'multiple_channels']:
+                    continue
+                if key == 'index' and isinstance(val, int):
+                    # Texture info: the texture index
+                    result['texture'] = BlenderMaterial.texture_definition(gltf, val)
+                    continue
+                result[key] = BlenderMaterial.definition(gltf, val)
+            return result
+        if isinstance(value, list):
+            return [BlenderMaterial.definition(gltf, val) for val in value]
+        return value
+
+    @staticmethod
+    def texture_definition(gltf, texture_idx):
+        texture = gltf.data.textures[texture_idx].to_dict()
+        texture.pop('name', None)
+        sampler = texture.pop('sampler', None)
+        if sampler is not None:
+            texture['sampler'] = gltf.data.samplers[sampler].to_dict()
+            texture['sampler'].pop('name', None)
+        return texture
 
     @staticmethod
     def set_double_sided(pymaterial, mat):
@@ -0,0 +1,225 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Material node trees built from templates.
+# Material nodes are first created on a recording, standing for the material: node creations,
+# links and property changes are only stored, in order.
+# The signature of the recording is the recording without the values of image, colors, factors...
+# The first material of a signature is built by replaying the whole recording, and is kept as template.
+# The next ones are copies of the template, where only values are replayed.
+
+import bpy
+from ...io.com import gltf2_io
+
+# Node properties that are values: they are not part of the signature, and are set on template copies
+VALUE_ATTRIBUTES = {'default_value', 'image', 'uv_map', 'extension', 'interpolation'}
+
+
+class TemplateUnsupported(AttributeError):
+    """
+    Raised when the material nodes use something that can't be recorded.
+    An AttributeError, so that hasattr() and getattr() with a default work on recordings:
+    the recording remembers the failure anyway (see MaterialRecording.failure).
+    """
+
+
+class MaterialRecording:
+    """Stands for a Blender material (and its node tree) while material nodes are created."""
+
+    def __init__(self):
+        object.__setattr__(self, 'events', [])
+        object.__setattr__(self, 'failure', None)
+        object.__setattr__(self, 'node_tree', _NodeTreeRecording(self))
+
+    def __getattr__(self, attr):
+        raise self.fail("material.%s" % attr)
+
+    def fail(self, reason):
+        """Remember that the recording is incomplete, and return the exception to raise."""
+        if self.failure is None:
+            object.__setattr__(self, 'failure', reason)
+        return TemplateUnsupported(reason)
+
+    def __setattr__(self, attr, value):
+        self.events.append(('set', ('mat', attr), value))
+
+    def signature(self):
+        """Hashable key of the recording, without values."""
+        return tuple(
+            ('set', path, None) if event == 'set' and _is_value(path) else (event, path, _hashable(value))
+            for event, path, value in self.events
+        )
+
+    def build(self, mat):
+        """
+        Create all nodes of the recording on a material without nodes.
+        :return: names of the created nodes, to find them in copies of the material
+        """
+        nodes = []
+        for event, path, value in self.events:
+            if event == 'new':
+                nodes.append(mat.node_tree.nodes.new(value))
+            elif event == 'link':
+                mat.node_tree.links.new(_socket(nodes, path), _socket(nodes, value))
+            else:
+                _apply(mat, nodes, path, value)
+        return [node.name for node in nodes]
+
+    def apply_values(self, mat, node_names):
+        """Set the values of the recording on a copy of a material built from a recording with the same signature."""
+        nodes = [mat.node_tree.nodes[name] for name in node_names]
+        for event, path, value in self.events:
+            if event == 'set' and _is_value(path):
+                _apply(mat, nodes, path, value)
+
+    def replace_references(self, pymat, mat):
+        """
+        Node builders store the material and its node tree in the glTF material (for KHR_animation_pointer):
+        replace the recording and its node tree by the Blender material and its node tree.
+        """
+        _replace_references(pymat, {id(self): mat, id(self.node_tree): mat.node_tree}, set())
+
+
+class _NodeTreeRecording:
+    def __init__(self, recording):
+        self.nodes = _NodesRecording(recording)
+        self.links = _LinksRecording(recording)
+
+
+class _NodesRecording:
+    def __init__(self, recording):
+        self.recording = recording
+        self.count = 0
+
+    def new(self, type):
+        self.recording.events.append(('new', self.count, type))
+        self.count += 1
+        return _NodeRecording(self.recording, self.count - 1)
+
+
+class _LinksRecording:
+    def __init__(self, recording):
+        self.recording = recording
+
+    def new(self, socket1, socket2):
+        if not isinstance(socket1, _SocketRecording) or not isinstance(socket2, _SocketRecording):
+            raise self.recording.fail("link to a socket of another node tree")
+        self.recording.events.append(('link', socket1.path, socket2.path))
+
+
+class _NodeRecording:
+    def __init__(self, recording, index):
+        object.__setattr__(self, 'recording', recording)
+        object.__setattr__(self, 'index', index)
+        object.__setattr__(self, 'values', {'image': None})
+        object.__setattr__(self, 'inputs', _SocketsRecording(self, 'inputs'))
+        object.__setattr__(self, 'outputs', _SocketsRecording(self, 'outputs'))
+
+    def __getattr__(self, attr):
+        # Only properties set before can be read back
+        try:
+            return self.values[attr]
+        except KeyError:
+            raise self.recording.fail("node.%s" % attr)
+
+    def __setattr__(self, attr, value):
+        self.values[attr] = value
+        self.recording.events.append(('set', ('node', self.index, attr), value))
+
+
+class _SocketsRecording:
+    def __init__(self, node, io):
+        self.node = node
+        self.io = io
+
+    def __getitem__(self, key):
+        return _SocketRecording(self.node.recording, ('socket', self.node.index, self.io, key))
+
+
+class _SocketRecording:
+    def __init__(self, recording, path):
+        object.__setattr__(self, 'recording', recording)
+        object.__setattr__(self, 'path', path)
+
+    def __getattr__(self, attr):
+        if attr == 'default_value':
+            return _ItemsRecording(self.recording, self.path)
+        raise self.recording.fail("socket.%s" % attr)
+
+    def __setattr__(self, attr, value):
+        self.recording.events.append(('set', self.path + (attr,), value))
+
+
+class _ItemsRecording:
+    """default_value of a socket, when setting a single item."""
+
+    def __init__(self, recording, path):
+        self.recording = recording
+        self.path = path
+
+    def __setitem__(self, item, value):
+        self.recording.events.append(('set', self.path + ('default_value', item), value))
+
+
+def _is_value(path):
+    return path[0] == 'mat' or path[0] == 'socket' or path[-1] in VALUE_ATTRIBUTES
+
+
+def _hashable(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, bpy.types.ID):
+        return (type(value).__name__, value.name)
+    try:
+        hash(value)
+    except TypeError:
+        # Never equal to the value of another recording
+        return ('id', id(value))
+    return value
+
+
+def _replace_references(value, replacements, seen):
+    # Walk glTF properties, dicts and lists
+    if id(value) in seen:
+        return
+    seen.add(id(value))
+    if isinstance(value, (dict, list)):
+        container = value
+        items = list(value.items() if isinstance(value, dict) else enumerate(value))
+    elif type(value).__module__ == gltf2_io.__name__:
+        container = vars(value)
+        items = list(container.items())
+    else:
+        return
+    for key, item in items:
+        if id(item) in replacements:
+            container[key] = replacements[id(item)]
+        else:
+            _replace_references(item, replacements, seen)
+
+
+def _socket(nodes, path):
+    _, index, io, key = path
+    return getattr(nodes[index], io)[key]
+
+
+def _apply(mat, nodes, path, value):
+    if path[0] == 'mat':
+        setattr(mat, path[1], value)
+    elif path[0] == 'node':
+        setattr(nodes[path[1]], path[2], value)
+    elif len(path) == 5:
+        setattr(_socket(nodes, path[:4]), path[4], value)
+    else:
+        _socket(nodes, path[:4]).default_value[path[5]] = value
@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import bpy
-from mathutils import Matrix
 import numpy as np
 from ...io.imp.user_extensions import import_user_extensions
 from ...io.imp.gltf2_io_binary import BinaryData
@@ -40,6 +39,9 @@ class BlenderMesh():
 UV_MAX = 8
 COLOR_MAX = 8
 
+# Number of verts skinned at once into the bind pose
+SKINNING_CHUNK_SIZE = 65536
+
 
 def create_mesh(gltf, mesh_idx, skin_idx):
     pymesh = gltf.data.meshes[mesh_idx]
@@ -85,8 +87,7 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
     num_uvs = 0
     num_cols = 0
     num_joint_sets = 0
-    attributes = set({})
-    attribute_data = []
+    attributes = []
     attribute_type = {}
     attribute_component_type = {}
 
@@ -120,45 +121,10 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
             if attr not in attributes:
                 attribute_type[attr] = gltf.data.accessors[prim.attributes[attr]].type
                 attribute_component_type[attr] = gltf.data.accessors[prim.attributes[attr]].component_type
-                attribute_data.append(
-                    np.empty(
-                        dtype=ComponentType.to_numpy_dtype(attribute_component_type[attr]),
-                        shape=(0, DataType.num_elements(attribute_type[attr])))
-                )
-        attributes.update(set(custom_attrs))
+                attributes.append(attr)
 
     num_shapekeys = sum(sk_name is not None for sk_name in pymesh.shapekey_names)
 
-    # -------------
-    # We'll process all the primitives gathering arrays to feed into the
-    # various foreach_set function that create the mesh data.
-
-    num_faces = 0  # total number of faces
-    vert_locs = np.empty(dtype=np.float32, shape=(0, 3))  # coordinate for each vert
-    vert_normals = np.empty(dtype=np.float32, shape=(0, 3))  # normal for each vert
-    edge_vidxs = np.array([], dtype=np.uint32)  # vertex_index for each loose edge
-    loop_vidxs = np.array([], dtype=np.uint32)  # vertex_index for each loop
-    loop_uvs = [
-        np.empty(dtype=np.float32, shape=(0, 2))  # UV for each loop for each layer
-        for _ in range(num_uvs)
-    ]
-    loop_cols = [
-        np.empty(dtype=np.float32, shape=(0, 4))  # color for each loop for each layer
-        for _ in range(num_cols)
-    ]
-    vert_joints = [
-        np.empty(dtype=np.uint32, shape=(0, 4))  # 4 joints for each vert for each set
-        for _ in range(num_joint_sets)
-    ]
-    vert_weights = [
-        np.empty(dtype=np.float32, shape=(0, 4))  # 4 weights for each vert for each set
-        for _ in range(num_joint_sets)
-    ]
-    sk_vert_locs = [
-        np.empty(dtype=np.float32, shape=(0, 3))  # coordinate for each vert for each shapekey
-        for _ in range(num_shapekeys)
-    ]
-
     # We need to detect if some non-tri primitives have some VC.
     # (Because, in that case, we will need to create vertex domain VC, instead of corner domain VC)
     has_non_tri_vcs = []
@@ -168,18 +134,26 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
             ['COLOR_' + str(i) in attr for attr in prim.attributes]) for prim in pymesh.primitives]))
         vc_domains.append('POINT' if has_non_tri_vcs[i] else 'CORNER')
 
+    # First pass: find the indices used by each primitive, to size the arrays.
+    # Arrays are then allocated once, and each primitive fills its slice.
+
+    prim_indices = []  # (prim, indices, is_edges, is_tris, unique_indices, inv_indices) for each primitive
+    num_verts = 0
+    num_loops = 0
+    num_edge_vidxs = 0
+    num_indices = 0
     for prim in pymesh.primitives:
         prim.num_faces = 0
 
         if 'POSITION' not in prim.attributes:
             continue
 
-        vert_index_base = len(vert_locs)
-
         if prim.extensions is not None and 'KHR_draco_mesh_compression' in prim.extensions:
 
-            gltf.log.info('Draco Decoder: Decode primitive {}'.format(pymesh.name or '[unnamed]'))
-            decode_primitive(gltf, prim)
+            # Usually already decoded, with all primitives of the file
+            if not getattr(prim, 'draco_decoded', False):
+                gltf.log.info('Draco Decoder: Decode primitive {}'.format(pymesh.name or '[unnamed]'))
+                decode_primitive(gltf, prim)
 
         import_user_extensions('gather_import_decode_primitive', gltf, pymesh, prim, skin_idx)
 
@@ -187,8 +161,8 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
             indices = BinaryData.decode_accessor(gltf, prim.indices)
             indices = indices.reshape(len(indices))
         else:
-            num_verts = gltf.data.accessors[prim.attributes['POSITION']].count
-            indices = np.arange(0, num_verts, dtype=np.uint32)
+            num_prim_verts = gltf.data.accessors[prim.attributes['POSITION']].count
+            indices = np.arange(0, num_prim_verts, dtype=np.uint32)
 
         mode = 4 if prim.mode is None else prim.mode
         points, edges, tris = points_edges_tris(mode, indices)
@@ -202,28 +176,77 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
         # We'll add one vert to the arrays for each index used in indices
         unique_indices, inv_indices = np.unique(indices, return_inverse=True)
 
+        prim_indices.append((prim, indices, edges is not None, tris is not None, unique_indices, inv_indices))
+        num_verts += len(unique_indices)
+        num_indices += len(indices)
+        if edges is not None:
+            num_edge_vidxs += len(indices)
+        if tris is not None:
+            num_loops += len(indices)
+
+    # -------------
+    # We'll process all the primitives gathering arrays to feed into the
+    # various foreach_set function that create the mesh data.
+
+    num_faces = 0  # total number of faces
+    vert_locs = np.empty(dtype=np.float32, shape=(num_verts, 3))  # coordinate for each vert
+    vert_normals = np.empty(dtype=np.float32, shape=(num_verts if has_normals else 0, 3))  # normal for each vert
+    edge_vidxs = np.empty(dtype=np.uint32, shape=num_edge_vidxs)  # vertex_index for each loose edge
+    loop_vidxs = np.empty(dtype=np.uint32, shape=num_loops)  # vertex_index for each loop
+    loop_uvs = [
+        np.empty(dtype=np.float32, shape=(num_loops, 2))  # UV for each loop for each layer
+        for _ in range(num_uvs)
+    ]
+    loop_cols = [
+        np.empty(dtype=np.float32, shape=(num_indices if vc_domains[col_i] == 'CORNER' else num_verts, 4))
+        for col_i in range(num_cols)  # color for each loop (or vert) for each layer
+    ]
+    vert_joints = [
+        np.empty(dtype=np.uint32, shape=(num_verts, 4))  # 4 joints for each vert for each set
+        for _ in range(num_joint_sets)
+    ]
+    vert_weights = [
+        np.empty(dtype=np.float32, shape=(num_verts, 4))  # 4 weights for each vert for each set
+        for _ in range(num_joint_sets)
+    ]
+    sk_vert_locs = [
+        np.empty(dtype=np.float32, shape=(num_verts, 3))  # coordinate for each vert for each shapekey
+        for _ in range(num_shapekeys)
+    ]
+    attribute_data = [
+        np.empty(
+            dtype=ComponentType.to_numpy_dtype(attribute_component_type[attr]),
+            shape=(num_verts, DataType.num_elements(attribute_type[attr])))
+        for attr in attributes
+    ]
+
+    # Second pass: fill the slices of each primitive
+    vert_index_base = 0
+    loop_base = 0
+    edge_base = 0
+    index_base = 0
+    for prim, indices, is_edges, is_tris, unique_indices, inv_indices in prim_indices:
+        verts = slice(vert_index_base, vert_index_base + len(unique_indices))
+
         vs = BinaryData.decode_accessor(gltf, prim.attributes['POSITION'], cache=True)
-        vert_locs = np.concatenate((vert_locs, vs[unique_indices]))
+        vert_locs[verts] = vs[unique_indices]
 
         if has_normals:
             if 'NORMAL' in prim.attributes:
                 ns = BinaryData.decode_accessor(gltf, prim.attributes['NORMAL'], cache=True)
-                ns = ns[unique_indices]
+                vert_normals[verts] = ns[unique_indices]
             else:
-                ns = np.zeros((len(unique_indices), 3), dtype=np.float32)
-            vert_normals = np.concatenate((vert_normals, ns))
+                vert_normals[verts] = 0.0
 
         for i in range(num_joint_sets):
             if ('JOINTS_%d' % i) in prim.attributes and ('WEIGHTS_%d' % i) in prim.attributes:
                 js = BinaryData.decode_accessor(gltf, prim.attributes['JOINTS_%d' % i], cache=True)
                 ws = BinaryData.decode_accessor(gltf, prim.attributes['WEIGHTS_%d' % i], cache=True)
-                js = js[unique_indices]
-                ws = ws[unique_indices]
+                vert_joints[i][verts] = js[unique_indices]
+                vert_weights[i][verts] = ws[unique_indices]
             else:
-                js = np.zeros((len(unique_indices), 4), dtype=np.uint32)
-                ws = np.zeros((len(unique_indices), 4), dtype=np.float32)
-            vert_joints[i] = np.concatenate((vert_joints[i], js))
-            vert_weights[i] = np.concatenate((vert_weights[i], ws))
+                vert_joints[i][verts] = 0
+                vert_weights[i][verts] = 0.0
 
         sk_i = 0
         for sk, sk_name in enumerate(pymesh.shapekey_names):
@@ -231,10 +254,9 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
                 continue
             if prim.targets and 'POSITION' in prim.targets[sk]:
                 morph_vs = BinaryData.decode_accessor(gltf, prim.targets[sk]['POSITION'], cache=True)
-                morph_vs = morph_vs[unique_indices]
+                sk_vert_locs[sk_i][verts] = morph_vs[unique_indices]
             else:
-                morph_vs = np.zeros((len(unique_indices), 3), dtype=np.float32)
-            sk_vert_locs[sk_i] = np.concatenate((sk_vert_locs[sk_i], morph_vs))
+                sk_vert_locs[sk_i][verts] = 0.0
             sk_i += 1
 
         # inv_indices are the indices into the verts just for this prim;
@@ -242,26 +264,32 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
         prim_vidxs = inv_indices.astype(np.uint32, copy=False)
         prim_vidxs += vert_index_base  # offset for verts from previous prims
 
-        if edges is not None:
-            edge_vidxs = np.concatenate((edge_vidxs, prim_vidxs))
+        if is_edges:
+            edge_vidxs[edge_base:edge_base + len(prim_vidxs)] = prim_vidxs
+            edge_base += len(prim_vidxs)
 
-        if tris is not None:
+        if is_tris:
             prim.num_faces = len(indices) // 3
             num_faces += prim.num_faces
 
-            loop_vidxs = np.concatenate((loop_vidxs, prim_vidxs))
+            loops = slice(loop_base, loop_base + len(indices))
+            loop_vidxs[loops] = prim_vidxs
 
             # UV only if we have a face
             for uv_i in range(num_uvs):
                 if ('TEXCOORD_%d' % uv_i) in prim.attributes:
                     uvs = BinaryData.decode_accessor(gltf, prim.attributes['TEXCOORD_%d' % uv_i], cache=True)
-                    uvs = uvs[indices]
+                    loop_uvs[uv_i][loops] = uvs[indices]
                 else:
-                    uvs = np.zeros((len(indices), 2), dtype=np.float32)
-                loop_uvs[uv_i] = np.concatenate((loop_uvs[uv_i], uvs))
+                    loop_uvs[uv_i][loops] = 0.0
+            loop_base += len(indices)
 
         # We can have VC for points, lines, and tris
         for col_i in range(num_cols):
+            if vc_domains[col_i] == 'CORNER':
+                col_slice = slice(index_base, index_base + len(indices))
+            else:
+                col_slice = verts
             if ('COLOR_%d' % col_i) in prim.attributes:
                 cols = BinaryData.decode_accessor(gltf, prim.attributes['COLOR_%d' % col_i], cache=True)
                 if vc_domains[col_i] == 'CORNER':
@@ -270,23 +298,19 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
                     cols = cols[unique_indices]
                 if cols.shape[1] == 3:
                     cols = colors_rgb_to_rgba(cols)
+                loop_cols[col_i][col_slice] = cols
             else:
-                if vc_domains[col_i] == 'CORNER':
-                    cols = np.ones((len(indices), 4), dtype=np.float32)
-                else:
-                    cols = np.ones((len(unique_indices), 4), dtype=np.float32)
-            loop_cols[col_i] = np.concatenate((loop_cols[col_i], cols))
+                loop_cols[col_i][col_slice] = 1.0
 
         for idx, attr in enumerate(attributes):
             if attr in prim.attributes:
                 attr_data = BinaryData.decode_accessor(gltf, prim.attributes[attr], cache=True)
-                attribute_data[idx] = np.concatenate((attribute_data[idx], attr_data[unique_indices]))
+                attribute_data[idx][verts] = attr_data[unique_indices]
             else:
-                attr_data = np.zeros(
-                    (len(unique_indices), DataType.num_elements(attribute_type[attr])),
-                    dtype=ComponentType.to_numpy_dtype(attribute_component_type[attr])
-                )
-                attribute_data[idx] = np.concatenate((attribute_data[idx], attr_data))
+                attribute_data[idx][verts] = 0
+
+        vert_index_base += len(unique_indices)
+        index_base += len(indices)
 
     # Accessors are cached in case they are shared between primitives; clear
     # the cache now that all prims are done.
@@ -364,7 +388,6 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
         mesh.color_attributes.render_color_index = 0
 
     # Skinning
-    # TODO: this is slow :/
     if num_joint_sets and mesh_options.skinning:
         pyskin = gltf.data.skins[skin_idx]
         for i, node_idx in enumerate(pyskin.joints):
@@ -372,21 +395,7 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
             ob.vertex_groups.new(name=bone.blender_bone_name)
 
         vgs = list(ob.vertex_groups)
-
-        for i in range(num_joint_sets):
-            js = vert_joints[i].tolist()  # tolist() is faster
-            ws = vert_weights[i].tolist()
-            for vi in range(len(vert_locs)):
-                w0, w1, w2, w3 = ws[vi]
-                j0, j1, j2, j3 = js[vi]
-                if w0 != 0:
-                    vgs[j0].add((vi,), w0, 'REPLACE')
-                if w1 != 0:
-                    vgs[j1].add((vi,), w1, 'REPLACE')
-                if w2 != 0:
-                    vgs[j2].add((vi,), w2, 'REPLACE')
-                if w3 != 0:
-                    vgs[j3].add((vi,), w3, 'REPLACE')
+        set_vertex_group_weights(vgs, vert_joints[:num_joint_sets], vert_weights[:num_joint_sets])
 
     # Shapekeys
     if num_shapekeys:
@@ -640,64 +649,101 @@ def uvs_gltf_to_blender(uvs):
     uvs[:, 1] += 1
 
 
+def set_vertex_group_weights(vgs, vert_joints, vert_weights):
+    """
+    Add vertices to vertex groups, from joints/weights sets.
+    Vertices are grouped by joint and weight, so that there is only one call for all vertices
+    of a vertex group having the same weight.
+    When a joint is used more than once for a vertex, its last non-zero weight is used.
+    """
+    num_verts = len(vert_joints[0])
+    # Influences ordered by vertex, then set, then slot
+    joints = np.stack(vert_joints, axis=1).reshape(-1).astype(np.int64)
+    weights = np.stack(vert_weights, axis=1).reshape(-1)
+    verts = np.repeat(np.arange(num_verts), len(vert_joints) * 4)
+
+    nonzero = weights != 0
+    joints, weights, verts = joints[nonzero], weights[nonzero], verts[nonzero]
+    if len(joints) == 0:
+        return
+
+    # Keep the last influence of each (vertex, joint) pair
+    keys = verts * (int(joints.max()) + 1) + joints
+    _, last = np.unique(keys[::-1], return_index=True)
+    last = len(keys) - 1 - last
+    joints, weights, verts = joints[last], weights[last], verts[last]
+
+    # Runs of same joint and weight
+    order = np.lexsort((weights, joints))
+    joints, weights, verts = joints[order], weights[order], verts[order]
+    starts = np.flatnonzero(np.concatenate((
+        [True],
+        (joints[1:] != joints[:-1]) | (weights[1:] != weights[:-1])
+    )))
+    ends = np.append(starts[1:], len(joints))
+
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        vgs[joints[start]].add(verts[start:end].tolist(), weights[start].item(), 'REPLACE')
+
+
 def skin_into_bind_pose(gltf, skin_idx, vert_joints, vert_weights, locs, vert_normals):
     # Skin each position/normal using the bind pose.
     # Skinning equation: vert' = sum_(j,w) w * joint_mat[j] * vert
     # where the sum is over all (joint,weight) pairs.
 
     # Calculate joint matrices
-    joint_mats = []
     pyskin = gltf.data.skins[skin_idx]
+    bind_mats = np.array([gltf.vnodes[joint].bind_arma_mat for joint in pyskin.joints])
     if pyskin.inverse_bind_matrices is not None:
-        inv_binds = BinaryData.get_data_from_accessor(gltf, pyskin.inverse_bind_matrices)
-        inv_binds = [gltf.matrix_gltf_to_blender(m) for m in inv_binds]
+        inv_binds = BinaryData.decode_accessor(gltf, pyskin.inverse_bind_matrices)
+        joint_mats = bind_mats @ gltf.matrices_batch_gltf_to_blender(np.asarray(inv_binds, dtype=np.float64))
     else:
-        inv_binds = [Matrix.Identity(4) for i in range(len(pyskin.joints))]
-    bind_mats = [gltf.vnodes[joint].bind_arma_mat for joint in pyskin.joints]
-    joint_mats = [bind_mat @ inv_bind for bind_mat, inv_bind in zip(bind_mats, inv_binds)]
+        joint_mats = bind_mats
 
     # TODO: check if joint_mats are all (approximately) 1, and skip skinning
 
-    joint_mats = np.array(joint_mats, dtype=np.float32)
+    dtype = np.float64 if gltf.import_settings['import_skinning_double_precision'] else np.float32
+    joint_mats = joint_mats.astype(dtype)
 
-    # Compute the skinning matrices for every vert
+    # Skinning matrices are computed for a chunk of verts at a time, to bound memory use
     num_verts = len(locs[0])
-    skinning_mats = np.zeros((num_verts, 4, 4), dtype=np.float32)
-    weight_sums = np.zeros(num_verts, dtype=np.float32)
-    for js, ws in zip(vert_joints, vert_weights):
-        for i in range(4):
-            skinning_mats += ws[:, i].reshape(len(ws), 1, 1) * joint_mats[js[:, i]]
-            weight_sums += ws[:, i]
-
-    # Some invalid files have 0 weight sum.
-    # To avoid to have this vertices at 0.0 / 0.0 / 0.0
-    # We set all weight ( aka 1.0 ) to the first bone
-    zeros_indices = np.where(weight_sums == 0)[0]
-    if zeros_indices.shape[0] > 0:
-        gltf.log.error('File is invalid: Some vertices are not assigned to bone(s) ')
-        vert_weights[0][:, 0][zeros_indices] = 1.0  # Assign to first bone with all weight
+    invalid_weights = False
+    for start in range(0, num_verts, SKINNING_CHUNK_SIZE):
+        end = min(start + SKINNING_CHUNK_SIZE, num_verts)
 
-        # Reprocess IBM for these vertices
-        skinning_mats[zeros_indices] = np.zeros((4, 4), dtype=np.float32)
+        skinning_mats = np.zeros((end - start, 4, 4), dtype=dtype)
+        weight_sums = np.zeros(end - start, dtype=dtype)
         for js, ws in zip(vert_joints, vert_weights):
+            js, ws = js[start:end], ws[start:end]
             for i in range(4):
-                skinning_mats[zeros_indices] += ws[:,
-                                                   i][zeros_indices].reshape(len(ws[zeros_indices]), 1, 1) * joint_mats[js[:, i][zeros_indices]]
-                weight_sums[zeros_indices] += ws[:, i][zeros_indices]
+                skinning_mats += ws[:, i].reshape(len(ws), 1, 1) * joint_mats[js[:, i]]
+                weight_sums += ws[:, i]
 
-    skinning_mats /= weight_sums.reshape(num_verts, 1, 1)
+        # Some invalid files have 0 weight sum.
+        # To avoid to have this vertices at 0.0 / 0.0 / 0.0
+        # We set all weight ( aka 1.0 ) to the first bone
+        zeros_indices = np.where(weight_sums == 0)[0]
+        if zeros_indices.shape[0] > 0:
+            invalid_weights = True
+            vert_weights[0][start:end, 0][zeros_indices] = 1.0  # Assign to first bone with all weight
+            skinning_mats[zeros_indices] = joint_mats[vert_joints[0][start:end, 0][zeros_indices]]
+            weight_sums[zeros_indices] = 1.0
 
-    skinning_mats_3x3 = skinning_mats[:, :3, :3]
-    skinning_trans = skinning_mats[:, :3, 3]
+        skinning_mats /= weight_sums.reshape(len(weight_sums), 1, 1)
 
-    for vs in locs:
-        vs[:] = mul_mats_vecs(skinning_mats_3x3, vs)
-        vs[:] += skinning_trans
+        skinning_mats_3x3 = skinning_mats[:, :3, :3]
+        skinning_trans = skinning_mats[:, :3, 3]
 
-    if len(vert_normals) != 0:
-        vert_normals[:] = mul_mats_vecs(skinning_mats_3x3, vert_normals)
-        # Don't translate normals!
-        normalize_vecs(vert_normals)
+        for vs in locs:
+            vs[start:end] = mul_mats_vecs(skinning_mats_3x3, vs[start:end]) + skinning_trans
+
+        if len(vert_normals) != 0:
+            # Don't translate normals!
+            vert_normals[start:end] = mul_mats_vecs(skinning_mats_3x3, vert_normals[start:end])
+            normalize_vecs(vert_normals[start:end])
+
+    if invalid_weights:
+        gltf.log.error('File is invalid: Some vertices are not assigned to bone(s) ')
 
 
 def mul_mats_vecs(mats, vecs):
@@ -20,6 +20,7 @@ from ..com.blender_default import BLENDER_GLTF_SPECIAL_COLLECTION
 from .mesh import BlenderMesh
 from .camera import BlenderCamera
 from .light import BlenderLight
+from .gpu_instancing import BlenderGpuInstancing
 from .vnode import VNode
 
 
@@ -64,7 +65,11 @@ class BlenderNode():
             obj = BlenderNode.create_mesh_object(gltf, vnode)
 
         elif vnode.type == VNode.Inst and vnode.mesh_idx is not None:
-            obj = BlenderNode.create_mesh_object(gltf, vnode)
+            if vnode.gpu_instancing is not None:
+                obj = BlenderGpuInstancing.create(
+                    gltf, vnode, BlenderNode.create_mesh_object(gltf, vnode), BlenderNode.special_collection(gltf))
+            else:
+                obj = BlenderNode.create_mesh_object(gltf, vnode)
 
         elif vnode.camera_node_idx is not None:
             pynode = gltf.data.nodes[vnode.camera_node_idx]
@@ -143,24 +148,31 @@ class BlenderNode():
         if gltf.import_settings['disable_bone_shape'] is True:
             return
 
-        # Create a special collection (if not exists already)
-        # Content of this collection will not be exported
-        if BLENDER_GLTF_SPECIAL_COLLECTION not in bpy.data.collections:
-            bpy.data.collections.new(BLENDER_GLTF_SPECIAL_COLLECTION)
-            bpy.data.scenes[gltf.blender_scene].collection.children.link(
-                bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION])
-            bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].hide_viewport = True
-            bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].hide_render = True
+        special_collection = BlenderNode.special_collection(gltf)
 
         # Create an icosphere, and assign it to the collection
         bpy.ops.mesh.primitive_ico_sphere_add(
             radius=1, enter_editmode=False, align='WORLD', location=(
                 0, 0, 0), scale=(
                 1, 1, 1))
-        bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].objects.link(bpy.context.object)
+        special_collection.objects.link(bpy.context.object)
         gltf.bone_shape = bpy.context.object.name
         bpy.context.collection.objects.unlink(bpy.context.object)
 
+    @staticmethod
+    def special_collection(gltf):
+        """
+        Get the special collection, creating it if it doesn't exist already.
+        Content of this collection is hidden, and will not be exported.
+        """
+        if BLENDER_GLTF_SPECIAL_COLLECTION not in bpy.data.collections:
+            bpy.data.collections.new(BLENDER_GLTF_SPECIAL_COLLECTION)
+            bpy.data.scenes[gltf.blender_scene].collection.children.link(
+                bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION])
+            bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].hide_viewport = True
+            bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].hide_render = True
+        return bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION]
+
     @staticmethod
     def calc_empty_display_size(gltf, vnode_id):
         # Use min distance to parent/children to guess size
@@ -13,9 +13,10 @@
 # limitations under the License.
 
 import bpy
+import numpy as np
 from mathutils import Vector, Quaternion, Matrix
 from ...io.imp.gltf2_io_binary import BinaryData
-from ..com.gltf2_blender_math import scale_rot_swap_matrix, nearby_signed_perm_matrix
+from ..com.gltf2_blender_math import scale_rot_swap_matrix, nearby_signed_perm_matrix, np_quaternion_multiply
 
 
 def compute_vnodes(gltf):
@@ -66,6 +67,8 @@ class VNode:
         self.mesh_node_idx = None
         self.camera_node_idx = None
         self.light_node_idx = None
+        # EXT_mesh_gpu_instancing extension, for instances imported with Geometry Nodes
+        self.gpu_instancing = None
 
     def trs(self):
         # (final TRS) = (rotation after) (base TRS) (rotation before)
@@ -77,17 +80,19 @@ class VNode:
             m @ s,
         )
 
+    # Batch versions of trs(), on (N,3) locations/scales and (N,4) (wxyz) rotations arrays
+
     def base_locs_to_final_locs(self, base_locs):
-        ra = self.rotation_after
-        return [ra @ loc for loc in base_locs]
+        ra = np.array(self.rotation_after.to_matrix())
+        return base_locs @ ra.T
 
     def base_rots_to_final_rots(self, base_rots):
-        ra, rb = self.rotation_after, self.rotation_before
-        return [ra @ rot @ rb for rot in base_rots]
+        ra, rb = np.array(self.rotation_after), np.array(self.rotation_before)
+        return np_quaternion_multiply(np_quaternion_multiply(ra, base_rots), rb)
 
     def base_scales_to_final_scales(self, base_scales):
-        m = scale_rot_swap_matrix(self.rotation_before)
-        return [m @ scale for scale in base_scales]
+        m = np.array(scale_rot_swap_matrix(self.rotation_before))
+        return base_scales @ m.T
 
 
 def local_rotation(gltf, vnode_id, rot):
@@ -146,6 +151,28 @@ def init_vnodes(gltf):
 
 
 def manage_gpu_instancing(gltf, vnode, i, ext, mesh_id):
+    # All attributes have the instance count, custom ones (starting with "_") too:
+    # instances without transform attributes have identity transforms
+    if not ext.get('attributes'):
+        # Nothing to instance: a regular mesh, in both modes
+        vnode.mesh_node_idx = i
+        return
+    length = gltf.data.accessors[next(iter(ext['attributes'].values()))].count
+
+    if gltf.import_settings['import_gpu_instances'] == "GEOMETRY_NODES":
+        # A single child, instancing the mesh on points with Geometry Nodes
+        inst_id = '%d' % i + ".instances"
+        inst_vnode = VNode()
+        inst_vnode.type = VNode.Inst
+        gltf.vnodes[inst_id] = inst_vnode
+        inst_vnode.name = None
+        inst_vnode.default_name = 'Node_' + inst_id
+        inst_vnode.children = []
+        inst_vnode.mesh_idx = mesh_id
+        inst_vnode.gpu_instancing = ext
+
+        vnode.children.append(inst_id)
+        return
 
     trans_list = BinaryData.get_data_from_accessor(gltf, ext['attributes'].get('TRANSLATION', None)) \
         if ext['attributes'].get('TRANSLATION', None) is not None else None
@@ -156,19 +183,6 @@ def manage_gpu_instancing(gltf, vnode, i, ext, mesh_id):
     scale_list = BinaryData.get_data_from_accessor(gltf, ext['attributes'].get('SCALE', None)) \
         if ext['attributes'].get('SCALE', None) is not None else None
 
-    # Retrieve the first available attribute to get the number of children
-    val = next((elem for elem in [
-        trans_list,
-        rot_list,
-        scale_list,
-    ] if elem is not None), None)
-
-    # Wwe can't have only custom properties
-    if not val:
-        return
-
-    length = len(val)
-
     if trans_list is None:
         trans_list = [None] * length
     if rot_list is None:
@@ -188,6 +202,7 @@ def manage_gpu_instancing(gltf, vnode, i, ext, mesh_id):
         inst_vnode.children = []
         inst_vnode.base_trs = get_inst_trs(gltf, trans_list[inst], rot_list[inst], scale_list[inst])
         inst_vnode.mesh_idx = mesh_id
+        inst_vnode.gpu_instancing = None
 
         vnode.children.append(inst_id)
 
@@ -14,9 +14,13 @@
 
 import os
 import sys
+from ctypes import *
 from pathlib import Path
 import bpy
 
+# Library binding, loaded once (see load_dll)
+__dll = None
+
 
 def find_draco_dll_in_module(library_name: str) -> Path:
     """
@@ -87,3 +91,92 @@ def dll_exists(quiet=False) -> bool:
                 'Draco mesh compression is not available because library could not be found at %s' %
                 dll_path().absolute())
     return exists
+
+
+def load_dll():
+    """
+    Load the Draco library and set up function signatures, once for all encodings and decodings.
+    Encoders and decoders are independent objects, so the library can be called from several threads:
+    ctypes releases the GIL during foreign calls.
+    :return: the library binding.
+    """
+    global __dll
+    if __dll is not None:
+        return __dll
+
+    dll = cdll.LoadLibrary(str(dll_path().resolve()))
+
+    # Encoder
+    dll.encoderCreate.restype = c_void_p
+    dll.encoderCreate.argtypes = [c_uint32]
+
+    dll.encoderRelease.restype = None
+    dll.encoderRelease.argtypes = [c_void_p]
+
+    dll.encoderSetCompressionLevel.restype = None
+    dll.encoderSetCompressionLevel.argtypes = [c_void_p, c_uint32]
+
+    dll.encoderSetQuantizationBits.restype = None
+    dll.encoderSetQuantizationBits.argtypes = [c_void_p, c_uint32, c_uint32, c_uint32, c_uint32, c_uint32]
+
+    dll.encoderSetIndices.restype = None
+    dll.encoderSetIndices.argtypes = [c_void_p, c_size_t, c_uint32, c_void_p]
+
+    dll.encoderSetAttribute.restype = c_uint32
+    dll.encoderSetAttribute.argtypes = [c_void_p, c_char_p, c_size_t, c_char_p, c_void_p, c_bool]
+
+    dll.encoderEncode.restype = c_bool
+    dll.encoderEncode.argtypes = [c_void_p, c_uint8]
+
+    dll.encoderGetEncodedVertexCount.restype = c_uint32
+    dll.encoderGetEncodedVertexCount.argtypes = [c_void_p]
+
+    dll.encoderGetEncodedIndexCount.restype = c_uint32
+    dll.encoderGetEncodedIndexCount.argtypes = [c_void_p]
+
+    dll.encoderGetByteLength.restype = c_uint64
+    dll.encoderGetByteLength.argtypes = [c_void_p]
+
+    dll.encoderCopy.restype = None
+    dll.encoderCopy.argtypes = [c_void_p, c_void_p]
+
+    # Decoder
+    dll.decoderCreate.restype = c_void_p
+    dll.decoderCreate.argtypes = []
+
+    dll.decoderRelease.restype = None
+    dll.decoderRelease.argtypes = [c_void_p]
+
+    dll.decoderDecode.restype = c_bool
+    dll.decoderDecode.argtypes = [c_void_p, c_void_p, c_size_t]
+
+    dll.decoderReadAttribute.restype = c_bool
+    dll.decoderReadAttribute.argtypes = [c_void_p, c_uint32, c_size_t, c_char_p]
+
+    dll.decoderGetVertexCount.restype = c_uint32
+    dll.decoderGetVertexCount.argtypes = [c_void_p]
+
+    dll.decoderGetIndexCount.restype = c_uint32
+    dll.decoderGetIndexCount.argtypes = [c_void_p]
+
+    dll.decoderAttributeIsNormalized.restype = c_bool
+    dll.decoderAttributeIsNormalized.argtypes = [c_void_p, c_uint32]
+
+    dll.decoderGetAttributeByteLength.restype = c_size_t
+    dll.decoderGetAttributeByteLength.argtypes = [c_void_p, c_uint32]
+
+    dll.decoderCopyAttribute.restype = None
+    dll.decoderCopyAttribute.argtypes = [c_void_p, c_uint32, c_void_p]
+
+    dll.decoderReadIndices.restype = c_bool
+    dll.decoderReadIndices.argtypes = [c_void_p, c_size_t]
+
+    dll.decoderGetIndicesByteLength.restype = c_size_t
+    dll.decoderGetIndicesByteLength.argtypes = [c_void_p]
+
+    dll.decoderCopyIndices.restype = None
+    dll.decoderCopyIndices.argtypes = [c_void_p, c_void_p]
+
+    __dll = dll
+    return dll
+
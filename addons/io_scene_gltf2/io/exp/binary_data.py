@@ -14,22 +14,44 @@
 
 import typing
 import array
+from concurrent.futures import Future
 from ...io.com import constants as gltf2_io_constants
 
 
 class BinaryData:
-    """Store for gltf binary data that can later be stored in a buffer."""
+    """
+    Store for gltf binary data that can later be stored in a buffer.
+    Data can be a Future of bytes (e.g. an image encoded in background), resolved on first access.
+    Binary data of a Future is compared and hashed by identity of the Future, so that using it
+    in a cache key doesn't wait for the encoding.
+    """
 
-    def __init__(self, data: bytes, bufferViewTarget=None):
-        if not isinstance(data, bytes):
+    def __init__(self, data: typing.Union[bytes, Future], bufferViewTarget=None, byteStride=None):
+        if not isinstance(data, (bytes, Future)):
             raise TypeError("Data is not a bytes array")
-        self.data = data
+        self._data = data
+        self._future = data if isinstance(data, Future) else None
         self.bufferViewTarget = bufferViewTarget
+        self.byteStride = byteStride
+
+    @property
+    def data(self):
+        if isinstance(self._data, Future):
+            self._data = self._data.result()
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
 
     def __eq__(self, other):
-        return self.data == other.data
+        if self._future is not None or other._future is not None:
+            return self._future is other._future and self.byteStride == other.byteStride
+        return self.data == other.data and self.byteStride == other.byteStride
 
     def __hash__(self):
+        if self._future is not None:
+            return hash(self._future)
         return hash(self.data)
 
     @classmethod
@@ -12,62 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from ctypes import *
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from ...io.exp.binary_data import BinaryData
-from ...io.com.draco import dll_path
+from ...io.com.draco import load_dll
 
 
 def encode_scene_primitives(scenes, export_settings):
     """
     Handles draco compression.
     Moves position, normal and texture coordinate attributes into a Draco encoded buffer.
+    Unique primitives are encoded concurrently: the library calls release the GIL.
     """
 
-    # Load DLL and setup function signatures.
-    dll = cdll.LoadLibrary(str(dll_path().resolve()))
-
-    dll.encoderCreate.restype = c_void_p
-    dll.encoderCreate.argtypes = [c_uint32]
-
-    dll.encoderRelease.restype = None
-    dll.encoderRelease.argtypes = [c_void_p]
-
-    dll.encoderSetCompressionLevel.restype = None
-    dll.encoderSetCompressionLevel.argtypes = [c_void_p, c_uint32]
-
-    dll.encoderSetQuantizationBits.restype = None
-    dll.encoderSetQuantizationBits.argtypes = [c_void_p, c_uint32, c_uint32, c_uint32, c_uint32, c_uint32]
-
-    dll.encoderSetIndices.restype = None
-    dll.encoderSetIndices.argtypes = [c_void_p, c_size_t, c_uint32, c_void_p]
-
-    dll.encoderSetAttribute.restype = c_uint32
-    dll.encoderSetAttribute.argtypes = [c_void_p, c_char_p, c_size_t, c_char_p, c_void_p, c_bool]
-
-    dll.encoderEncode.restype = c_bool
-    dll.encoderEncode.argtypes = [c_void_p, c_uint8]
-
-    dll.encoderGetEncodedVertexCount.restype = c_uint32
-    dll.encoderGetEncodedVertexCount.argtypes = [c_void_p]
-
-    dll.encoderGetEncodedIndexCount.restype = c_uint32
-    dll.encoderGetEncodedIndexCount.argtypes = [c_void_p]
-
-    dll.encoderGetByteLength.restype = c_uint64
-    dll.encoderGetByteLength.argtypes = [c_void_p]
-
-    dll.encoderCopy.restype = None
-    dll.encoderCopy.argtypes = [c_void_p, c_void_p]
+    dll = load_dll()
 
     # Don't encode the same primitive multiple times.
-    encoded_primitives_cache = {}
-
-    # Compress meshes into Draco buffers.
+    # This usually happens when nodes are duplicated in Blender, thus their indices/attributes are shared data.
+    primitives = {}
     for scene in scenes:
         for node in scene.nodes:
-            __traverse_node(node, lambda node: __encode_node(node, dll, export_settings, encoded_primitives_cache))
+            __traverse_node(node, lambda node: __collect_node(node, export_settings, primitives))
+
+    # Compress meshes into Draco buffers.
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(lambda primitive: __encode_primitive(primitive, dll, export_settings), primitives))
+
+    for primitive, result in zip(primitives, results):
+        __set_encoded_primitive(primitive, result, export_settings)
 
     # Release uncompressed index and attribute buffers.
     # Since those buffers may be shared across nodes, this step must happen after all meshes have been compressed.
@@ -97,40 +69,41 @@ def __traverse_node(node, f):
             __traverse_node(child, f)
 
 
-def __encode_node(node, dll, export_settings, encoded_primitives_cache):
+def __collect_node(node, export_settings, primitives):
     if node.mesh is not None:
-        export_settings['log'].info('Draco encoder: Encoding mesh {}.'.format(node.name))
+        count = len(primitives)
         for primitive in node.mesh.primitives:
-            __encode_primitive(primitive, dll, export_settings, encoded_primitives_cache)
+            if primitive in primitives:
+                continue
 
+            # Only do TRIANGLES primitives
+            if primitive.mode not in [None, 4]:
+                continue
 
-def __encode_primitive(primitive, dll, export_settings, encoded_primitives_cache):
-    attributes = primitive.attributes
-    indices = primitive.indices
+            if 'POSITION' not in primitive.attributes:
+                export_settings['log'].warning('Draco encoder: Primitive without positions encountered. Skipping.')
+                continue
 
-    # Check if this primitive has already been encoded.
-    # This usually happens when nodes are duplicated in Blender, thus their indices/attributes are shared data.
-    if primitive in encoded_primitives_cache:
-        if primitive.extensions is None:
-            primitive.extensions = {}
-        primitive.extensions['KHR_draco_mesh_compression'] = encoded_primitives_cache[primitive]
-        return
+            # Skip nodes without a position buffer, e.g. a primitive from a Blender shared instance.
+            if primitive.attributes['POSITION'].buffer_view is None:
+                continue
 
-    # Only do TRIANGLES primitives
-    if primitive.mode not in [None, 4]:
-        return
+            primitives[primitive] = None
 
-    if 'POSITION' not in attributes:
-        export_settings['log'].warning('Draco encoder: Primitive without positions encountered. Skipping.')
-        return
+        # Meshes shared by several nodes are only encoded once
+        if len(primitives) > count:
+            export_settings['log'].info('Draco encoder: Encoding mesh {}.'.format(node.name))
 
-    positions = attributes['POSITION']
 
-    # Skip nodes without a position buffer, e.g. a primitive from a Blender shared instance.
-    if attributes['POSITION'].buffer_view is None:
-        return
+def __encode_primitive(primitive, dll, export_settings):
+    """
+    Encode a primitive, without modifying it: this runs in a worker thread.
+    Index and attribute data is passed to the library without copy.
+    """
+    attributes = primitive.attributes
+    indices = primitive.indices
 
-    encoder = dll.encoderCreate(positions.count)
+    encoder = dll.encoderCreate(attributes['POSITION'].count)
 
     draco_ids = {}
     for attr_name in attributes:
@@ -155,30 +128,37 @@ def __encode_primitive(primitive, dll, export_settings, encoded_primitives_cache
                                    export_settings['gltf_draco_generic_quantization'])
 
     preserve_triangle_order = primitive.targets is not None and len(primitive.targets) > 0
-    if not dll.encoderEncode(encoder, preserve_triangle_order):
-        export_settings['log'].error('Could not encode primitive. Skipping primitive.')
+    success = dll.encoderEncode(encoder, preserve_triangle_order)
 
     byte_length = dll.encoderGetByteLength(encoder)
     encoded_data = bytes(byte_length)
     dll.encoderCopy(encoder, encoded_data)
 
+    index_count = dll.encoderGetEncodedIndexCount(encoder)
+    vertex_count = dll.encoderGetEncodedVertexCount(encoder)
+
+    dll.encoderRelease(encoder)
+
+    return success, encoded_data, draco_ids, index_count, vertex_count
+
+
+def __set_encoded_primitive(primitive, result, export_settings):
+    success, encoded_data, draco_ids, index_count, vertex_count = result
+    if not success:
+        export_settings['log'].error('Could not encode primitive. Skipping primitive.')
+
     if primitive.extensions is None:
         primitive.extensions = {}
 
-    extension_info = {
+    primitive.extensions['KHR_draco_mesh_compression'] = {
         'bufferView': BinaryData(encoded_data),
         'attributes': draco_ids
     }
-    primitive.extensions['KHR_draco_mesh_compression'] = extension_info
-    encoded_primitives_cache[primitive] = extension_info
 
     # Set to triangle list mode.
     primitive.mode = 4
 
     # Update accessors to match encoded data.
-    indices.count = dll.encoderGetEncodedIndexCount(encoder)
-    encoded_vertices = dll.encoderGetEncodedVertexCount(encoder)
-    for attr_name in attributes:
-        attributes[attr_name].count = encoded_vertices
-
-    dll.encoderRelease(encoder)
+    primitive.indices.count = index_count
+    for attr_name in primitive.attributes:
+        primitive.attributes[attr_name].count = vertex_count
@@ -13,23 +13,33 @@
 # limitations under the License.
 
 import re
+from concurrent.futures import Future
 
 
 class ImageData:
-    """Contains encoded images"""
+    """
+    Contains encoded images.
+    Data can be a Future of bytes (image encoded in background), resolved on first access.
+    Image data of a Future is compared and hashed by identity of the Future (see BinaryData).
+    """
     # FUTURE_WORK: as a method to allow the node graph to be better supported, we could model some of
     # the node graph elements with numpy functions
 
     def __init__(self, data: bytes, mime_type: str, name: str):
         self._data = data
+        self._future = data if isinstance(data, Future) else None
         self._mime_type = mime_type
         self._name = name
 
     def __eq__(self, other):
-        return self._data == other.data
+        if self._future is not None or other._future is not None:
+            return self._future is other._future
+        return self.data == other.data
 
     def __hash__(self):
-        return hash(self._data)
+        if self._future is not None:
+            return hash(self._future)
+        return hash(self.data)
 
     def adjusted_name(self):
         regex_dot = re.compile(r"\.")
@@ -39,6 +49,8 @@ class ImageData:
 
     @property
     def data(self):
+        if isinstance(self._data, Future):
+            self._data = self._data.result()
         return self._data
 
     @property
@@ -55,4 +67,4 @@ class ImageData:
 
     @property
     def byte_length(self):
-        return len(self._data)
+        return len(self.data)
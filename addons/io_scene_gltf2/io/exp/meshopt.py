@@ -0,0 +1,537 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# EXT_meshopt_compression encoder.
+# Bitstreams are the ones of meshoptimizer: vertex codec version 0, index codec version 1,
+# index sequence codec version 1.
+
+import numpy as np
+
+from ...io.com.constants import ComponentType, DataType
+from .binary_data import BinaryData
+from .buffer import Buffer
+
+VERTEX_HEADER = 0xa0
+INDEX_HEADER = 0xe1
+SEQUENCE_HEADER = 0xd1
+
+BYTE_GROUP_SIZE = 16
+VERTEX_BLOCK_SIZE_BYTES = 8192
+VERTEX_BLOCK_MAX_SIZE = 256
+TAIL_MAX_SIZE = 32
+
+TRIANGLE_INDEX_ORDER = ((0, 1, 2), (1, 2, 0), (2, 0, 1))
+CODEAUX_TABLE = (0x00, 0x76, 0x87, 0x56, 0x67, 0x78, 0xa9, 0x86, 0x65, 0x89, 0x68, 0x98, 0x01, 0x69, 0x00, 0x00)
+# Only the first 14 entries of the table can be referenced by triangle codes
+CODEAUX_INDEX = {v: i for i, v in reversed(list(enumerate(CODEAUX_TABLE[:14])))}
+
+
+def __zigzag8(deltas):
+    return ((deltas.view(np.int8) >> 7).view(np.uint8) ^ (deltas << 1)).astype(np.uint8)
+
+
+def __pack_groups(groups, bits):
+    """
+    Encode groups of 16 bytes with the given bit count.
+    Return an array of encoded rows (padded to 32 bytes) and the length of each row.
+    """
+    nb_groups = len(groups)
+    rows = np.zeros((nb_groups, 32), dtype=np.uint8)
+
+    if bits == 8:
+        rows[:, :16] = groups
+        return rows, np.full(nb_groups, 16, dtype=np.int64)
+
+    sentinel = (1 << bits) - 1
+    per_byte = 8 // bits
+    packed_size = BYTE_GROUP_SIZE // per_byte
+
+    escaped = groups >= sentinel
+    codes = np.where(escaped, sentinel, groups).astype(np.uint8).reshape(nb_groups, packed_size, per_byte)
+    packed = np.zeros((nb_groups, packed_size), dtype=np.uint8)
+    for k in range(per_byte):
+        packed = (packed << bits) | codes[:, :, k]
+    rows[:, :packed_size] = packed
+
+    # Values that don't fit are stored as full bytes after the packed values, in order
+    order = np.argsort(~escaped, axis=1, kind='stable')
+    rows[:, packed_size:packed_size + BYTE_GROUP_SIZE] = np.take_along_axis(groups, order, axis=1)
+
+    return rows, packed_size + np.count_nonzero(escaped, axis=1)
+
+
+def __encode_byte_streams(streams):
+    """
+    Encode byte streams of the same (16-aligned) length, as meshoptimizer encodeBytes() does.
+    Streams are encoded one after the other: header (2 bits per group), then data of each group.
+    """
+    nb_streams, stream_size = streams.shape
+    groups_per_stream = stream_size // BYTE_GROUP_SIZE
+    groups = streams.reshape(-1, BYTE_GROUP_SIZE)
+
+    # Candidates: 0 bits (all zeros), 2 bits, 4 bits, 8 bits (raw bytes)
+    candidates = [__pack_groups(groups, bits) for bits in (2, 4, 8)]
+    sizes = np.stack([c[1] for c in candidates], axis=1)
+    best = np.argmin(sizes, axis=1)
+    best_code = best + 1
+    all_zeros = ~np.any(groups, axis=1)
+    best_code[all_zeros] = 0
+
+    rows = np.zeros((len(groups), 32), dtype=np.uint8)
+    lengths = np.zeros(len(groups), dtype=np.int64)
+    for idx, (c_rows, c_lengths) in enumerate(candidates):
+        mask = best_code == idx + 1
+        rows[mask] = c_rows[mask]
+        lengths[mask] = c_lengths[mask]
+
+    # Headers: 4 groups per byte, first group in the lowest bits
+    header_size = (groups_per_stream + 3) // 4
+    codes = np.zeros((nb_streams, header_size * 4), dtype=np.uint8)
+    codes[:, :groups_per_stream] = best_code.reshape(nb_streams, groups_per_stream)
+    codes = codes.reshape(nb_streams, header_size, 4)
+    headers = codes[:, :, 0] | (codes[:, :, 1] << 2) | (codes[:, :, 2] << 4) | (codes[:, :, 3] << 6)
+
+    # Interleave header rows and group rows, then flatten the valid bytes
+    all_rows = np.zeros((nb_streams, 1 + groups_per_stream, 32), dtype=np.uint8)
+    all_rows[:, 0, :header_size] = headers
+    all_rows[:, 1:] = rows.reshape(nb_streams, groups_per_stream, 32)
+    all_lengths = np.empty((nb_streams, 1 + groups_per_stream), dtype=np.int64)
+    all_lengths[:, 0] = header_size
+    all_lengths[:, 1:] = lengths.reshape(nb_streams, groups_per_stream)
+
+    all_rows = all_rows.reshape(-1, 32)
+    valid = np.arange(32)[np.newaxis, :] < all_lengths.reshape(-1, 1)
+    return all_rows[valid].tobytes()
+
+
+def __encode_vertex_blocks(deltas, block_size):
+    """Encode vertex blocks of the same vertex count."""
+    nb_vertices, stride = deltas.shape
+    nb_blocks = nb_vertices // block_size
+    aligned = (block_size + BYTE_GROUP_SIZE - 1) & ~(BYTE_GROUP_SIZE - 1)
+
+    # One byte stream per block and per byte of vertex
+    streams = np.zeros((nb_blocks, stride, aligned), dtype=np.uint8)
+    streams[:, :, :block_size] = deltas.reshape(nb_blocks, block_size, stride).transpose(0, 2, 1)
+    return __encode_byte_streams(streams.reshape(nb_blocks * stride, aligned))
+
+
+def encode_vertex_buffer(vertices):
+    """
+    Encode vertex data (count, stride) of bytes with meshoptimizer vertex codec.
+    Stride must be a multiple of 4, and at most 256.
+    """
+    count, stride = vertices.shape
+    assert stride % 4 == 0 and 0 < stride <= 256
+
+    block_size = min((VERTEX_BLOCK_SIZE_BYTES // stride) & ~(BYTE_GROUP_SIZE - 1), VERTEX_BLOCK_MAX_SIZE)
+
+    # Bytes are delta encoded from the previous vertex, first vertex being the reference
+    previous = np.empty_like(vertices)
+    if count > 0:
+        previous[0] = vertices[0]
+        previous[1:] = vertices[:-1]
+    deltas = __zigzag8(vertices - previous)
+
+    data = [bytes([VERTEX_HEADER])]
+    full = (count // block_size) * block_size
+    if full > 0:
+        data.append(__encode_vertex_blocks(deltas[:full], block_size))
+    if full < count:
+        data.append(__encode_vertex_blocks(deltas[full:], count - full))
+
+    # First vertex is stored at the end, padded to 32 bytes
+    data.append(bytes(max(0, TAIL_MAX_SIZE - stride)))
+    data.append(vertices[0].tobytes() if count > 0 else bytes(stride))
+
+    return b"".join(data)
+
+
+def __encode_vbyte(data, v):
+    while True:
+        if v > 127:
+            data.append((v & 127) | 128)
+        else:
+            data.append(v)
+            return
+        v >>= 7
+
+
+def __encode_index(data, index, last):
+    d = (index - last) & 0xffffffff
+    __encode_vbyte(data, ((d << 1) ^ (0xffffffff if d & 0x80000000 else 0)) & 0xffffffff)
+
+
+def encode_index_buffer(indices):
+    """
+    Encode triangle indices with meshoptimizer index codec.
+    Triangles can be rotated, but winding order is kept.
+    """
+    indices = indices.tolist()
+    nb_triangles = len(indices) // 3
+
+    edge_fifo = [(-1, -1)] * 16
+    vertex_fifo = [-1] * 16
+    edge_offset = 0
+    vertex_offset = 0
+    next_index = 0
+    last = 0
+
+    codes = bytearray()
+    data = bytearray()
+    fecmax = 13
+
+    for t in range(nb_triangles):
+        tri = indices[3 * t:3 * t + 3]
+        i0, i1, i2 = tri
+
+        # Look for an edge of the triangle in the edge fifo
+        fer = -1
+        for i in range(16):
+            e0, e1 = edge_fifo[(edge_offset - 1 - i) & 15]
+            if e0 == i0 and e1 == i1:
+                fer = (i << 2) | 0
+                break
+            if e0 == i1 and e1 == i2:
+                fer = (i << 2) | 1
+                break
+            if e0 == i2 and e1 == i0:
+                fer = (i << 2) | 2
+                break
+
+        if fer >= 0 and (fer >> 2) < 15:
+            order = TRIANGLE_INDEX_ORDER[fer & 3]
+            a, b, c = tri[order[0]], tri[order[1]], tri[order[2]]
+
+            fe = fer >> 2
+            fc = -1
+            for i in range(16):
+                if vertex_fifo[(vertex_offset - 1 - i) & 15] == c:
+                    fc = i
+                    break
+
+            if 1 <= fc < fecmax:
+                fec = fc
+            elif c == next_index:
+                fec = 0
+                next_index += 1
+            else:
+                fec = 15
+
+            if fec == 15:
+                # Strip-like sequences
+                if c + 1 == last:
+                    fec = 13
+                    last = c
+                if c == last + 1:
+                    fec = 14
+                    last = c
+
+            codes.append((fe << 4) | fec)
+
+            if fec == 15:
+                __encode_index(data, c, last)
+                last = c
+
+            if fec == 0 or fec >= fecmax:
+                vertex_fifo[vertex_offset] = c
+                vertex_offset = (vertex_offset + 1) & 15
+
+            edge_fifo[edge_offset] = (c, b)
+            edge_offset = (edge_offset + 1) & 15
+            edge_fifo[edge_offset] = (a, c)
+            edge_offset = (edge_offset + 1) & 15
+
+        else:
+            rotation = 1 if i1 == next_index else 2 if i2 == next_index else 0
+            order = TRIANGLE_INDEX_ORDER[rotation]
+            a, b, c = tri[order[0]], tri[order[1]], tri[order[2]]
+
+            reset = False
+            if a == 0 and b == 1 and c == 2 and next_index > 0:
+                reset = True
+                next_index = 0
+                vertex_fifo = [-1] * 16
+
+            fb = fc = -1
+            for i in range(16):
+                v = vertex_fifo[(vertex_offset - 1 - i) & 15]
+                if fb == -1 and v == b:
+                    fb = i
+                if fc == -1 and v == c:
+                    fc = i
+
+            if a == next_index:
+                fea = 0
+                next_index += 1
+            else:
+                fea = 15
+
+            if 0 <= fb < 14:
+                feb = fb + 1
+            elif b == next_index:
+                feb = 0
+                next_index += 1
+            else:
+                feb = 15
+
+            if 0 <= fc < 14:
+                fec = fc + 1
+            elif c == next_index:
+                fec = 0
+                next_index += 1
+            else:
+                fec = 15
+
+            codeaux = (feb << 4) | fec
+            codeaux_index = CODEAUX_INDEX.get(codeaux, -1)
+
+            if fea == 0 and codeaux_index >= 0 and not reset:
+                codes.append(0xf0 | codeaux_index)
+            else:
+                codes.append(0xf0 | 14 | fea)
+                data.append(codeaux)
+
+            if fea == 15:
+                __encode_index(data, a, last)
+                last = a
+            if feb == 15:
+                __encode_index(data, b, last)
+                last = b
+            if fec == 15:
+                __encode_index(data, c, last)
+                last = c
+
+            for v, fe in ((a, fea), (b, feb), (c, fec)):
+                if fe == 0 or fe == 15:
+                    vertex_fifo[vertex_offset] = v
+                    vertex_offset = (vertex_offset + 1) & 15
+
+            for e in ((b, a), (c, b), (a, c)):
+                edge_fifo[edge_offset] = e
+                edge_offset = (edge_offset + 1) & 15
+
+    # The codeaux table is stored at the end, and is also used as padding by decoders
+    return bytes([INDEX_HEADER]) + bytes(codes) + bytes(data) + bytes(CODEAUX_TABLE)
+
+
+def encode_index_sequence(indices):
+    """Encode an index sequence (lines, points...) with meshoptimizer index sequence codec."""
+    data = bytearray([SEQUENCE_HEADER])
+    last = [0, 0]
+    for index in indices.tolist():
+        # Two baselines are available. Using a second one when a jump happens helps for line lists
+        current = 0 if abs(index - last[0]) <= abs(index - last[1]) else 1
+        d = (index - last[current]) & 0xffffffff
+        v = ((d << 1) ^ (0xffffffff if d & 0x80000000 else 0)) & 0xffffffff
+        __encode_vbyte(data, (v << 1) | current)
+        last[current] = index
+    data.extend(bytes(4))
+    return bytes(data)
+
+
+def encode_filter_octahedral(vectors, component_type, bits):
+    """
+    Octahedral filter, for unit vectors stored in 4 components of (normalized) bytes or shorts.
+    The fourth component is kept as is.
+    """
+    max_value = float((1 << (bits - 1)) - 1)
+
+    x, y, z = vectors[:, 0], vectors[:, 1], vectors[:, 2]
+    length = np.abs(x) + np.abs(y) + np.abs(z)
+    inv = np.divide(1.0, length, out=np.zeros_like(length), where=length != 0.0)
+    x = x * inv
+    y = y * inv
+
+    u = np.where(z >= 0.0, x, (1.0 - np.abs(y)) * np.where(x >= 0.0, 1.0, -1.0))
+    v = np.where(z >= 0.0, y, (1.0 - np.abs(x)) * np.where(y >= 0.0, 1.0, -1.0))
+
+    dtype = ComponentType.to_numpy_dtype(component_type)
+    result = np.empty((len(vectors), 4), dtype=dtype)
+    result[:, 0] = np.trunc(np.clip(u, -1.0, 1.0) * max_value + np.where(u >= 0.0, 0.5, -0.5))
+    result[:, 1] = np.trunc(np.clip(v, -1.0, 1.0) * max_value + np.where(v >= 0.0, 0.5, -0.5))
+    result[:, 2] = max_value
+    result[:, 3] = vectors[:, 3]
+    return result
+
+
+def encode_filter_exponential(values, bits):
+    """
+    Exponential filter, for float values.
+    Each value is stored as a signed mantissa of the given bit count, and its own exponent.
+    """
+    values = values.astype(np.float32)
+    _, exponent = np.frexp(values)
+    exponent = np.clip(exponent.astype(np.int32) - (bits - 1), -100, 100)
+
+    limit = (1 << 23) - 1
+    mantissa = np.trunc(np.ldexp(values.astype(np.float64), -exponent) + np.where(values >= 0.0, 0.5, -0.5))
+    mantissa = np.clip(mantissa, -limit, limit).astype(np.int32)
+
+    return ((mantissa & 0xffffff).astype(np.uint32) | (exponent.astype(np.uint32) << 24)).astype(np.uint32)
+
+
+def __view_layouts(gltf):
+    """
+    Collect, for each bufferView, how it is used by accessors:
+    index of primitives (and primitive mode), vertex attributes (and semantic), or other data.
+    """
+    layouts = {}
+
+    def add(view, count, component_type, data_type, normalized, usage):
+        if view is None:
+            return
+        layout = {
+            'count': count,
+            'component_type': component_type,
+            'element_size': ComponentType.get_size(component_type) * DataType.num_elements(data_type),
+            'normalized': normalized,
+            'usage': usage,
+        }
+        if view in layouts.keys() and layouts[view] != layout:
+            layouts[view] = None  # Shared with incompatible layouts, not compressed
+        else:
+            layouts[view] = layout
+
+    usages = {}
+    for mesh in gltf.meshes:
+        for primitive in mesh.primitives:
+            if primitive.indices is not None:
+                mode = primitive.mode if primitive.mode is not None else 4
+                usages[primitive.indices] = 'TRIANGLES' if mode == 4 else 'INDICES'
+            for semantic, accessor in primitive.attributes.items():
+                usages[accessor] = 'NORMAL' if semantic in ["NORMAL", "TANGENT"] else 'ATTRIBUTE'
+            for target in primitive.targets or []:
+                for accessor in target.values():
+                    usages[accessor] = 'ATTRIBUTE'
+    for animation in gltf.animations:
+        for sampler in animation.samplers:
+            usages[sampler.output] = 'ANIMATION'
+    # Keyframe times are never filtered: lossy filters could make them non increasing.
+    # Set last, in case an accessor is also used as a sampler output
+    for animation in gltf.animations:
+        for sampler in animation.samplers:
+            usages[sampler.input] = 'TIME'
+
+    for idx, accessor in enumerate(gltf.accessors):
+        usage = usages.get(idx)
+        if accessor.min is not None or accessor.max is not None:
+            # POSITION (and its morph targets) have bounds, computed from the exact values:
+            # lossy filters could move vertices outside of them
+            usage = 'BOUNDED'
+        add(accessor.buffer_view, accessor.count, accessor.component_type, accessor.type, accessor.normalized, usage)
+        if accessor.sparse is not None:
+            add(accessor.sparse.indices.buffer_view, accessor.sparse.count, accessor.sparse.indices.component_type,
+                DataType.Scalar, None, None)
+            add(accessor.sparse.values.buffer_view, accessor.sparse.count, accessor.component_type, accessor.type,
+                accessor.normalized, None)
+
+    return layouts
+
+
+def __compress_view(data, view, layout, export_settings):
+    """Return (compressed data, extension) for a bufferView, or None if it can't be compressed."""
+    usage = layout['usage']
+    count = layout['count']
+
+    if usage in ['TRIANGLES', 'INDICES']:
+        if layout['component_type'] not in [ComponentType.UnsignedShort, ComponentType.UnsignedInt]:
+            return None
+        dtype = ComponentType.to_numpy_dtype(layout['component_type'])
+        indices = np.frombuffer(data, dtype=dtype, count=count)
+        mode = 'TRIANGLES' if usage == 'TRIANGLES' and count % 3 == 0 else 'INDICES'
+        encoded = encode_index_buffer(indices) if mode == 'TRIANGLES' else encode_index_sequence(indices)
+        return encoded, {'byteStride': layout['element_size'], 'count': count, 'mode': mode}
+
+    stride = view.byte_stride or layout['element_size']
+    if stride % 4 != 0 or stride > 256 or count * stride != view.byte_length:
+        return None
+
+    vertices = np.frombuffer(data, dtype=np.uint8).reshape(count, stride)
+    view_filter = None
+
+    float_bits = export_settings['gltf_meshopt_float_bits']
+    if usage == 'NORMAL' and layout['normalized'] is True \
+            and layout['component_type'] in [ComponentType.Byte, ComponentType.Short] \
+            and stride == 4 * ComponentType.get_size(layout['component_type']):
+        dtype = ComponentType.to_numpy_dtype(layout['component_type'])
+        max_value = np.iinfo(dtype).max
+        vectors = np.frombuffer(data, dtype=dtype).reshape(count, 4).astype(np.float32)
+        vectors[:, :3] /= max_value
+        bits = min(export_settings['gltf_meshopt_normal_bits'], 8 * ComponentType.get_size(layout['component_type']))
+        vertices = encode_filter_octahedral(vectors, layout['component_type'], bits).view(np.uint8).reshape(count, stride)
+        view_filter = 'OCTAHEDRAL'
+
+    elif float_bits > 0 and usage in ['ATTRIBUTE', 'NORMAL', 'ANIMATION'] \
+            and layout['component_type'] == ComponentType.Float and view.byte_stride is None:
+        values = np.frombuffer(data, dtype=np.float32)
+        vertices = encode_filter_exponential(values, float_bits).view(np.uint8).reshape(count, stride)
+        view_filter = 'EXPONENTIAL'
+
+    extension = {'byteStride': stride, 'count': count, 'mode': 'ATTRIBUTES'}
+    if view_filter is not None:
+        extension['filter'] = view_filter
+    return encode_vertex_buffer(vertices), extension
+
+
+def compress_buffer_views(gltf, buffer, export_settings):
+    """
+    Compress bufferViews with EXT_meshopt_compression.
+
+    Compressed data is stored in a new buffer (index 0), uncompressed bufferViews are copied as is.
+    Compressed bufferViews reference a fallback buffer (index 1) without data, so the extension is required.
+    Return the new buffer and the byte length of the fallback buffer.
+    """
+    layouts = __view_layouts(gltf)
+    source = bytes(buffer.to_bytes())
+
+    new_buffer = Buffer()
+    fallback_length = 0
+    original_size = compressed_size = 0
+
+    for idx, view in enumerate(gltf.buffer_views):
+        data = source[view.byte_offset or 0:(view.byte_offset or 0) + view.byte_length]
+
+        compressed = None
+        layout = layouts.get(idx)
+        if layout is not None and layout['count'] > 0:
+            compressed = __compress_view(data, view, layout, export_settings)
+
+        if compressed is None or len(compressed[0]) >= len(data):
+            new_view = new_buffer.add_and_get_view(BinaryData(data))
+            view.buffer = 0
+            view.byte_offset = new_view.byte_offset
+            continue
+
+        encoded, extension = compressed
+        compressed_view = new_buffer.add_and_get_view(BinaryData(encoded))
+        extension['buffer'] = 0
+        extension['byteOffset'] = compressed_view.byte_offset
+        extension['byteLength'] = len(encoded)
+
+        view.buffer = 1
+        view.byte_offset = fallback_length
+        fallback_length += (view.byte_length + 3) // 4 * 4
+        if view.extensions is None:
+            view.extensions = {}
+        view.extensions['EXT_meshopt_compression'] = extension
+
+        original_size += len(data)
+        compressed_size += len(encoded)
+
+    if original_size > 0:
+        export_settings['log'].info("Meshopt compression: {} bytes compressed to {} bytes".format(
+            original_size, compressed_size))
+
+    return new_buffer, fallback_length
@@ -0,0 +1,95 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Memory budgeted cache of source image pixels, used while exporting images.
+# Values are numpy arrays, that are also held by background encodings until they are done.
+
+from collections import OrderedDict, deque
+from concurrent.futures import wait
+
+# Memory budget of the source pixels cache, shared by all images of an export
+PIXEL_CACHE_BUDGET = 1 << 30
+
+
+class PixelCache:
+    """
+    Byte budgeted LRU cache of source image pixels, shared by all images of an export.
+    Pixels of byte images are stored as uint8 (lossless), others as float32.
+    When a source image feeds several channels or several packed images, its pixels are read only once.
+    Pixels used by pending background encodings count in the budget, even once evicted:
+    when they are over budget, new encodings wait for the oldest ones.
+    """
+
+    def __init__(self, budget=PIXEL_CACHE_BUDGET):
+        self.budget = budget
+        # Bytes of all arrays held by the cache, or by pending encodings
+        self.size = 0
+        self.entries = OrderedDict()
+        # id(array): [array, references]. An entry is a reference, as well as each pending encoding using the array
+        self.held = {}
+        # (future, arrays) of pending encodings, oldest first
+        self.pending = deque()
+
+    def get(self, key, load):
+        """Get cached value for key, or call load() to get it. Value is a (read-only array, extra) tuple."""
+        self.__collect()
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+            return value
+
+        value = load()
+        value[0].flags.writeable = False
+        if value[0].nbytes <= self.budget:
+            self.entries[key] = value
+            self.__hold(value[0])
+            self.__evict()
+        return value
+
+    def add_pending(self, future, arrays):
+        """Keep arrays counted until the encoding of future is done. Wait for older encodings if over budget."""
+        for array in arrays:
+            self.__hold(array)
+        self.pending.append((future, arrays))
+        self.__collect()
+        self.__evict()
+        while self.size > self.budget and len(self.pending) > 1:
+            wait([self.pending[0][0]])
+            self.__collect()
+            self.__evict()
+
+    def __hold(self, array):
+        held = self.held.setdefault(id(array), [array, 0])
+        if held[1] == 0:
+            self.size += array.nbytes
+        held[1] += 1
+
+    def __release(self, array):
+        held = self.held[id(array)]
+        held[1] -= 1
+        if held[1] == 0:
+            del self.held[id(array)]
+            self.size -= array.nbytes
+
+    def __collect(self):
+        # Done encodings don't need their pixels anymore
+        while self.pending and self.pending[0][0].done():
+            _, arrays = self.pending.popleft()
+            for array in arrays:
+                self.__release(array)
+
+    def __evict(self):
+        while self.size > self.budget and self.entries:
+            _, (evicted, _) = self.entries.popitem(last=False)
+            self.__release(evicted)
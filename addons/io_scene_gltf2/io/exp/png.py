@@ -0,0 +1,134 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# In-process PNG encoder, using numpy row filters and zlib.
+# zlib and numpy release the GIL, so several images can be encoded in parallel threads.
+
+import io
+import struct
+import zlib
+import numpy as np
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+# Number of rows filtered and compressed at once, to bound memory use
+BAND_ROWS = 256
+
+# channels: PNG color type
+COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+PIL_MODES = {1: 'L', 2: 'LA', 3: 'RGB', 4: 'RGBA'}
+
+
+def encode_png(pixels, compression_level=6):
+    """
+    Encode an image to PNG.
+
+    :param pixels: (height, width, channels) uint8 or uint16 array, first row at top. 1 to 4 channels.
+    :param compression_level: zlib compression level
+    :return: PNG file bytes
+    """
+    height, width, channels = pixels.shape
+
+    if PILImage is not None and pixels.dtype == np.uint8:
+        return __encode_pil(pixels, channels, compression_level)
+
+    bands = (pixels[start:start + BAND_ROWS] for start in range(0, height, BAND_ROWS))
+    return encode_png_bands(width, height, channels, bands, pixels.dtype, compression_level)
+
+
+def encode_png_bands(width, height, channels, bands, dtype=np.uint8, compression_level=6):
+    """
+    Encode an image to PNG, from bands of rows. Bands are filtered and compressed as they come,
+    so the full image never needs to be in memory.
+
+    :param bands: iterable of (rows, width, channels) uint8 or uint16 arrays (as dtype), from top to bottom
+    :return: PNG file bytes
+    """
+    bit_depth = 16 if dtype == np.uint16 else 8
+    bpp = channels * bit_depth // 8
+
+    compressor = zlib.compressobj(compression_level)
+    chunks = []
+    previous = np.zeros(width * bpp, dtype=np.uint8)
+    for band in bands:
+        if bit_depth == 16:
+            rows = band.astype('>u2').view(np.uint8).reshape(len(band), width * bpp)
+        else:
+            rows = np.ascontiguousarray(band, dtype=np.uint8).reshape(len(band), width * bpp)
+        if len(rows) == 0:
+            continue
+        chunks.append(compressor.compress(__filter_rows(rows, previous, bpp).tobytes()))
+        previous = rows[-1]
+    chunks.append(compressor.flush())
+
+    header = struct.pack('>IIBBBBB', width, height, bit_depth, COLOR_TYPES[channels], 0, 0, 0)
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        __chunk(b'IHDR', header),
+        __chunk(b'IDAT', b''.join(chunks)),
+        __chunk(b'IEND', b'')
+    ])
+
+
+def __encode_pil(pixels, channels, compression_level):
+    image = PILImage.fromarray(pixels[:, :, 0] if channels == 1 else pixels, PIL_MODES[channels])
+    stream = io.BytesIO()
+    image.save(stream, format='PNG', compress_level=compression_level)
+    return stream.getvalue()
+
+
+def __chunk(chunk_type, data):
+    return struct.pack('>I', len(data)) + chunk_type + data + \
+        struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff)
+
+
+def __filter_rows(band, previous, bpp):
+    """
+    Apply PNG filters to a band of rows, choosing for each row the filter
+    with the lowest sum of absolute values (as signed bytes), as recommended by the PNG specification.
+    :return: (rows, 1 + stride) uint8 array, with the filter type as first byte of each row
+    """
+    x = band.astype(np.int16)
+    up = np.empty_like(x)
+    up[0] = previous
+    up[1:] = x[:-1]
+    left = np.zeros_like(x)
+    left[:, bpp:] = x[:, :-bpp]
+    up_left = np.zeros_like(x)
+    up_left[:, bpp:] = up[:, :-bpp]
+
+    # Paeth predictor
+    p = left + up - up_left
+    pa, pb, pc = np.abs(p - left), np.abs(p - up), np.abs(p - up_left)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+
+    candidates = np.stack([
+        x,
+        x - left,
+        x - up,
+        x - ((left + up) >> 1),
+        x - paeth
+    ]).astype(np.uint8)
+
+    cost = np.abs(candidates.view(np.int8).astype(np.int32)).sum(axis=2)
+    best = np.argmin(cost, axis=0)
+
+    filtered = np.empty((len(band), band.shape[1] + 1), dtype=np.uint8)
+    filtered[:, 0] = best
+    filtered[:, 1:] = candidates[best, np.arange(len(band))]
+    return filtered
@@ -0,0 +1,131 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Image resampling with separable filters, vectorized with numpy.
+# Each output pixel of a pass is a weighted sum of a few input pixels (taps),
+# computed for all pixels at once, one tap at a time.
+
+import math
+import numpy as np
+
+# Number of rows resampled at once in the horizontal pass, to bound memory use
+BAND_ROWS = 256
+
+LANCZOS_LOBES = 3
+
+
+def __box(x):
+    return ((x >= -0.5) & (x < 0.5)).astype(np.float64)
+
+
+def __lanczos(x):
+    return np.where(np.abs(x) < LANCZOS_LOBES, np.sinc(x) * np.sinc(x / LANCZOS_LOBES), 0.0)
+
+
+FILTERS = {
+    'BOX': (__box, 0.5),
+    'LANCZOS': (__lanczos, float(LANCZOS_LOBES)),
+}
+
+
+def resample(pixels, size, filter='LANCZOS'):
+    """
+    Resample an image.
+
+    :param pixels: (height, width, channels) array. uint8 pixels are read as values in [0, 1]
+    :param size: (width, height) of the result
+    :param filter: 'BOX' (area average) or 'LANCZOS'
+    :return: (height, width, channels) float32 array. Lanczos can overshoot, values are not clamped.
+    """
+    height, width, channels = pixels.shape
+    new_width, new_height = size
+    scale = 1.0 / 255.0 if pixels.dtype == np.uint8 else 1.0
+
+    # Horizontal pass, by bands of rows
+    indices, weights = __taps(width, new_width, filter)
+    columns = np.empty((height, new_width, channels), np.float32)
+    for start in range(0, height, BAND_ROWS):
+        band = pixels[start:start + BAND_ROWS].astype(np.float32)
+        if scale != 1.0:
+            band *= scale
+        columns[start:start + BAND_ROWS] = __apply(band, indices, weights, axis=1)
+
+    # Vertical pass
+    indices, weights = __taps(height, new_height, filter)
+    return __apply(columns, indices, weights, axis=0)
+
+
+def __taps(length, new_length, filter):
+    """
+    Input indices and weights of each output pixel, along an axis.
+    :return: (new_length, taps) indices and (new_length, taps) float32 weights
+    """
+    kernel, support = FILTERS[filter]
+    scale = length / new_length
+    # When downscaling, the filter is stretched, to average all input pixels
+    filter_scale = max(scale, 1.0)
+    support *= filter_scale
+
+    centers = (np.arange(new_length) + 0.5) * scale
+    first = np.floor(centers - support).astype(np.int64)
+    tap_count = int(math.ceil(2 * support)) + 1
+    indices = first[:, np.newaxis] + np.arange(tap_count)
+
+    weights = kernel((indices + 0.5 - centers[:, np.newaxis]) / filter_scale)
+    # Pixels out of the image are replaced by the border pixels
+    indices = np.clip(indices, 0, length - 1)
+    total = weights.sum(axis=1, keepdims=True)
+    weights /= np.where(total != 0.0, total, 1.0)
+
+    # Remove taps unused by all output pixels
+    used = np.any(weights != 0.0, axis=0)
+    return indices[:, used], weights[:, used].astype(np.float32)
+
+
+def __apply(pixels, indices, weights, axis):
+    shape = [1, 1, 1]
+    shape[axis] = len(weights)
+    result = None
+    for tap in range(indices.shape[1]):
+        contribution = np.take(pixels, indices[:, tap], axis=axis) * weights[:, tap].reshape(shape)
+        if result is None:
+            result = contribution
+        else:
+            result += contribution
+    return result
+
+
+def fit_size(size, max_size, power_of_two):
+    """
+    Size of an image once limited to max_size (keeping aspect ratio), and rounded to powers of two if needed.
+    :param max_size: maximum width and height, 0 for no limit
+    """
+    width, height = size
+    if max_size > 0 and max(width, height) > max_size:
+        factor = max_size / max(width, height)
+        width = max(1, int(round(width * factor)))
+        height = max(1, int(round(height * factor)))
+
+    if power_of_two:
+        width, height = __power_of_two(width, max_size), __power_of_two(height, max_size)
+
+    return width, height
+
+
+def __power_of_two(length, max_size):
+    # Nearest power of two (in log scale), not over max_size
+    result = 1 << max(0, int(round(math.log2(length))))
+    while max_size > 0 and result > max_size:
+        result >>= 1
+    return result
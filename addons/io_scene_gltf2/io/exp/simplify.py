@@ -0,0 +1,283 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Mesh simplification, using quadric error metrics and half edge collapses.
+# Only indices are modified: vertices are kept, so simplified meshes can share vertex data.
+# Collapses are done in batches of independent collapses, to keep the work vectorized.
+
+import numpy as np
+
+# Triangles with a normal rotating more than this (cosine) are considered as flipped
+FLIP_THRESHOLD = 1e-2
+
+# Number of independent set searches per batch of collapses
+SELECTION_ROUNDS = 4
+
+
+def simplify(positions, indices, target_index_count, attributes=None, target_error=None):
+    """
+    Simplify a triangle list.
+
+    :param positions: (N, 3) vertex positions
+    :param indices: triangle list indices
+    :param target_index_count: wanted number of indices. The result can have more indices, if the mesh
+        can't be simplified further without going over target_error, or without changing topology.
+    :param attributes: list of (array (N, k), weight). Differences of attributes between collapsed vertices
+        are added to the cost, weighted.
+    :param target_error: maximum error, relative to mesh extent. None for no limit.
+    :return: simplified indices, and error reached (relative to mesh extent)
+    """
+    triangles = indices.reshape(-1, 3).astype(np.int64)
+    vertex_count = len(positions)
+    if len(triangles) == 0 or len(indices) <= target_index_count:
+        return indices, 0.0
+
+    # Work in normalized coordinates, so that errors are relative to mesh extent
+    used = np.unique(triangles)
+    origin = positions[used].min(axis=0)
+    extent = float(np.max(positions[used].max(axis=0) - origin))
+    if extent == 0.0:
+        extent = 1.0
+    pos = (positions.astype(np.float64) - origin) / extent
+
+    attributes = [(a.reshape(vertex_count, -1).astype(np.float64), w) for a, w in (attributes or [])]
+
+    # Vertices on borders (including UV and material seams, that are split in the vertex data) are locked
+    locked = __locked_vertices(triangles, vertex_count)
+    quadric = __plane_quadrics(pos, triangles, vertex_count)
+    blocked = np.zeros(vertex_count, dtype=bool)
+
+    max_cost = np.inf if target_error is None else target_error ** 2
+    error = 0.0
+
+    while len(triangles) * 3 > target_index_count:
+        edges, edge_triangle_count = __edges(triangles, vertex_count)
+        collapses = __select_collapses(
+            pos, attributes, quadric, edges, edge_triangle_count, locked | blocked, vertex_count, max_cost)
+        if collapses is None:
+            break
+        source, target, cost, removed = collapses
+
+        # Check collapses that would change topology, or flip triangles
+        rejected = __check_link(source, target, edges, removed, vertex_count) | \
+            __check_flips(pos, triangles, source, target, vertex_count)
+        blocked[source[rejected]] = True
+        source, target, cost, removed = source[~rejected], target[~rejected], cost[~rejected], removed[~rejected]
+        if len(source) == 0:
+            continue
+
+        # Don't go (much) under the target
+        order = np.argsort(cost, kind='stable')
+        removable = len(triangles) - target_index_count // 3
+        keep = max(1, int(np.searchsorted(np.cumsum(removed[order]), removable, side='right')))
+        order = order[:keep]
+        source, target, cost = source[order], target[order], cost[order]
+
+        remap = np.arange(vertex_count)
+        remap[source] = target
+        triangles = remap[triangles]
+        degenerate = (triangles[:, 0] == triangles[:, 1]) | (triangles[:, 1] == triangles[:, 2]) | \
+            (triangles[:, 2] == triangles[:, 0])
+        triangles = triangles[~degenerate]
+
+        np.add.at(quadric, target, quadric[source])
+        error = max(error, float(np.max(cost)))
+
+    return triangles.reshape(-1).astype(indices.dtype), float(np.sqrt(error))
+
+
+def __edges(triangles, vertex_count):
+    """Unique undirected edges (as keys lower * vertex_count + higher), and number of triangles using them."""
+    a = triangles.reshape(-1)
+    b = triangles[:, [1, 2, 0]].reshape(-1)
+    keys = np.minimum(a, b) * vertex_count + np.maximum(a, b)
+    return np.unique(keys, return_counts=True)
+
+
+def __locked_vertices(triangles, vertex_count):
+    keys, counts = __edges(triangles, vertex_count)
+    border = keys[counts != 2]
+    locked = np.zeros(vertex_count, dtype=bool)
+    locked[border // vertex_count] = True
+    locked[border % vertex_count] = True
+    return locked
+
+
+def __plane_quadrics(pos, triangles, vertex_count):
+    """
+    Area weighted quadrics of triangle planes, accumulated on vertices.
+    Stored as 10 floats: xx, xy, xz, yy, yz, zz (A), x, y, z (b), c
+    so that error of point p is p.A.p + 2 b.p + c
+    """
+    p0, p1, p2 = pos[triangles[:, 0]], pos[triangles[:, 1]], pos[triangles[:, 2]]
+    normal = np.cross(p1 - p0, p2 - p0)
+    length = np.linalg.norm(normal, axis=1)
+    area = length * 0.5
+    normal = normal / np.where(length > 0.0, length, 1.0)[:, np.newaxis]
+    d = -np.einsum('ij,ij->i', normal, p0)
+
+    x, y, z = normal[:, 0], normal[:, 1], normal[:, 2]
+    components = np.stack([x * x, x * y, x * z, y * y, y * z, z * z, x * d, y * d, z * d, d * d], axis=1)
+    components *= area[:, np.newaxis]
+
+    quadric = np.zeros((vertex_count, 10), dtype=np.float64)
+    for k in range(3):
+        for c in range(10):
+            quadric[:, c] += np.bincount(triangles[:, k], weights=components[:, c], minlength=vertex_count)
+    return quadric
+
+
+def __quadric_error(quadric, p):
+    x, y, z = p[:, 0], p[:, 1], p[:, 2]
+    q = quadric
+    error = q[:, 0] * x * x + 2 * q[:, 1] * x * y + 2 * q[:, 2] * x * z + q[:, 3] * y * y + 2 * q[:, 4] * y * z \
+        + q[:, 5] * z * z + 2 * (q[:, 6] * x + q[:, 7] * y + q[:, 8] * z) + q[:, 9]
+    return np.abs(error)
+
+
+def __select_collapses(pos, attributes, quadric, edges, edge_triangle_count, locked, vertex_count, max_cost):
+    """
+    Select a batch of independent half edge collapses (source -> target).
+    Each vertex gets its cheapest collapse. Collapses are selected when their cost is a local minimum:
+    no neighbor of the source has a cheaper collapse. So sources are never adjacent.
+    """
+    lower, higher = edges // vertex_count, edges % vertex_count
+    source = np.concatenate((lower, higher))
+    target = np.concatenate((higher, lower))
+    removed = np.concatenate((edge_triangle_count, edge_triangle_count))
+
+    valid = ~locked[source]
+    source, target, removed = source[valid], target[valid], removed[valid]
+    if len(source) == 0:
+        return None
+
+    cost = __quadric_error(quadric[source] + quadric[target], pos[target])
+    for values, weight in attributes:
+        cost += weight * np.sum((values[source] - values[target]) ** 2, axis=1)
+
+    valid = cost <= max_cost
+    source, target, removed, cost = source[valid], target[valid], removed[valid], cost[valid]
+    if len(source) == 0:
+        return None
+
+    # Cheapest collapse of each source vertex
+    best_cost = np.full(vertex_count, np.inf)
+    np.minimum.at(best_cost, source, cost)
+    candidates = np.flatnonzero(cost == best_cost[source])
+    best = np.full(vertex_count, -1, dtype=np.int64)
+    best[source[candidates]] = candidates
+    best = best[best >= 0]
+    source, target, removed, cost = source[best], target[best], removed[best], cost[best]
+
+    # Rank of vertices by collapse cost, vertices without collapse come last
+    rank = np.full(vertex_count, vertex_count, dtype=np.int64)
+    rank[source[np.argsort(cost, kind='stable')]] = np.arange(len(source))
+
+    # Vertices with the lowest rank of their 2-ring are selected, so that one-rings of
+    # selected collapses don't overlap and their link conditions stay independent.
+    # Then selected vertices and their 2-ring are removed, and new minima are searched
+    available = rank < vertex_count
+    selected = np.zeros(vertex_count, dtype=bool)
+    for _ in range(SELECTION_ROUNDS):
+        current = np.where(available, rank, vertex_count)
+        ring_min = __ring_min(current, lower, higher)
+        ring_min = __ring_min(ring_min, lower, higher)
+        new = available & (current == ring_min)
+        if not np.any(new):
+            break
+        selected |= new
+        near = __ring_any(__ring_any(new, lower, higher), lower, higher)
+        available &= ~near
+
+    selected = selected[source]
+    return source[selected], target[selected], cost[selected], removed[selected]
+
+
+def __ring_min(values, lower, higher):
+    """Minimum of values over each vertex and its neighbors."""
+    result = values.copy()
+    np.minimum.at(result, lower, values[higher])
+    np.minimum.at(result, higher, values[lower])
+    return result
+
+
+def __ring_any(mask, lower, higher):
+    result = mask.copy()
+    result[lower[mask[higher]]] = True
+    result[higher[mask[lower]]] = True
+    return result
+
+
+def __check_link(source, target, edges, removed, vertex_count):
+    """
+    Link condition: common neighbors of source and target must be the opposite vertices
+    of the triangles using the collapsed edge. Otherwise the collapse changes topology.
+    """
+    lower, higher = edges // vertex_count, edges % vertex_count
+    collapse_of = np.full(vertex_count, -1, dtype=np.int64)
+    collapse_of[source] = np.arange(len(source))
+
+    # Neighbors of sources
+    a = np.concatenate((lower, higher))
+    b = np.concatenate((higher, lower))
+    mask = collapse_of[a] >= 0
+    collapse, neighbor = collapse_of[a[mask]], b[mask]
+    t = target[collapse]
+    mask = neighbor != t
+    collapse, neighbor, t = collapse[mask], neighbor[mask], t[mask]
+
+    # Is the neighbor also a neighbor of the target?
+    keys = np.minimum(neighbor, t) * vertex_count + np.maximum(neighbor, t)
+    found = np.searchsorted(edges, keys)
+    found = (found < len(edges)) & (edges[np.minimum(found, len(edges) - 1)] == keys)
+    common = np.bincount(collapse[found], minlength=len(source))
+
+    return common != removed
+
+
+def __check_flips(pos, triangles, source, target, vertex_count):
+    """Reject collapses that flip (or degenerate) a remaining triangle around the source."""
+    moved = np.full(vertex_count, -1, dtype=np.int64)
+    moved[source] = target
+
+    # Sources are not adjacent, so each triangle contains at most one source
+    moving = moved[triangles]
+    affected = np.any(moving >= 0, axis=1)
+    tris = triangles[affected]
+    moving = moving[affected]
+    new_tris = np.where(moving >= 0, moving, tris)
+
+    # Triangles using the collapsed edge disappear
+    degenerate = (new_tris[:, 0] == new_tris[:, 1]) | (new_tris[:, 1] == new_tris[:, 2]) | \
+        (new_tris[:, 2] == new_tris[:, 0])
+    tris, new_tris, moving = tris[~degenerate], new_tris[~degenerate], moving[~degenerate]
+
+    def normals(t):
+        p0, p1, p2 = pos[t[:, 0]], pos[t[:, 1]], pos[t[:, 2]]
+        return np.cross(p1 - p0, p2 - p0)
+
+    old_normal = normals(tris)
+    new_normal = normals(new_tris)
+    dot = np.einsum('ij,ij->i', old_normal, new_normal)
+    old_length = np.linalg.norm(old_normal, axis=1)
+    flipped = (dot <= FLIP_THRESHOLD * old_length * np.linalg.norm(new_normal, axis=1)) & (old_length > 0.0)
+
+    # Retrieve the source of each flipped triangle
+    source_vertex = tris[moving >= 0]
+    collapse_of = np.full(vertex_count, -1, dtype=np.int64)
+    collapse_of[source] = np.arange(len(source))
+
+    rejected = np.zeros(len(source), dtype=bool)
+    rejected[collapse_of[source_vertex[flipped]]] = True
+    return rejected
@@ -0,0 +1,115 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Persistent cache of encoded textures, shared by exports (and by several processes).
+# Entries are files named by the fingerprint of the encoding inputs.
+# Entries are written to a temporary file then renamed, so readers only see complete entries.
+# Access time is tracked by touching entries, least recently used entries are evicted first.
+
+import hashlib
+import os
+import tempfile
+
+# Increase when the way textures are encoded changes, to invalidate existing entries
+CACHE_VERSION = 1
+
+ENTRY_SUFFIX = '.bin'
+
+
+class TextureCache:
+
+    def __init__(self, directory, max_size):
+        """
+        :param directory: cache directory, created if needed
+        :param max_size: size of the cache, in bytes. Checked when trimming the cache.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(*inputs):
+        """Key of an entry, from all inputs of the encoding (any repr-able values)."""
+        h = hashlib.blake2b(digest_size=20)
+        h.update(repr((CACHE_VERSION,) + inputs).encode('utf-8'))
+        return h.hexdigest()
+
+    def __path(self, key):
+        return os.path.join(self.directory, key[:2], key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """Encoded bytes of an entry, or None."""
+        path = self.__path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            # Not cached, or evicted by another process
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store an entry. Errors are ignored: the cache is only an optimization."""
+        path = self.__path(key)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except OSError:
+            pass
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def trim(self):
+        """Remove least recently used entries, until the cache fits in its size."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(ENTRY_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Already removed by another process, or in use
+                pass
+            total -= size
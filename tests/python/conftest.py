@@ -0,0 +1,33 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Tests of the modules of the add-on that only depend on numpy, run with pytest outside of Blender:
+#   python -m pytest tests/python
+# The packages of the add-on import bpy when initialized. They are registered as empty packages,
+# so that their Blender-independent modules can be imported alone.
+
+import os
+import sys
+import types
+
+ADDON_NAME = 'io_scene_gltf2'
+ADDON_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'addons', ADDON_NAME))
+
+for root, dirs, _ in os.walk(ADDON_PATH):
+    dirs[:] = [d for d in dirs if d != '__pycache__']
+    relative = os.path.relpath(root, ADDON_PATH)
+    name = ADDON_NAME if relative == os.curdir else '.'.join([ADDON_NAME] + relative.split(os.sep))
+    package = types.ModuleType(name)
+    package.__path__ = [root]
+    sys.modules.setdefault(name, package)
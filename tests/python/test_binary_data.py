@@ -0,0 +1,66 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from io_scene_gltf2.blender.exp.cache import cached
+from io_scene_gltf2.io.exp.binary_data import BinaryData
+from io_scene_gltf2.io.exp.image_data import ImageData
+
+
+@cached
+def make_image(buffer_view, uri, export_settings):
+    # Same arguments as the cached gathering of images
+    return buffer_view, uri
+
+
+def test_encodings_overlap():
+    # Each encoding only finishes once both are running: if wrapping the first one in a
+    # cache key waited for its result, the second one would never be submitted
+    barrier = threading.Barrier(2, timeout=5)
+
+    def encode(data):
+        barrier.wait()
+        return data
+
+    export_settings = {}
+    with ThreadPoolExecutor(2) as executor:
+        png = executor.submit(encode, b'png')
+        buffer_view, _ = make_image(BinaryData(png), None, export_settings)
+        uri = executor.submit(encode, b'jpeg')
+        _, image = make_image(None, ImageData(uri, 'image/jpeg', 'Image'), export_settings)
+
+        assert buffer_view.data == b'png'
+        assert image.data == b'jpeg'
+    assert not barrier.broken
+
+
+def test_future_identity():
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(bytes, 4)
+        other = executor.submit(bytes, 4)
+        assert BinaryData(future) == BinaryData(future)
+        assert hash(BinaryData(future)) == hash(BinaryData(future))
+        assert BinaryData(future) != BinaryData(other)
+        assert BinaryData(future) != BinaryData(bytes(4))
+        # Hash doesn't change once resolved
+        data = BinaryData(future)
+        key = hash(data)
+        assert data.data == bytes(4)
+        assert hash(data) == key
+
+    # Bytes are compared by content
+    assert BinaryData(b'abc') == BinaryData(b'abc')
+    assert hash(ImageData(b'abc', 'image/png', 'A')) == hash(ImageData(b'abc', 'image/png', 'B'))
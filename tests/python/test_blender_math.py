@@ -0,0 +1,49 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Needs mathutils: run with the Python of Blender.
+
+import numpy as np
+import pytest
+
+pytest.importorskip('mathutils')
+
+from io_scene_gltf2.blender.com.gltf2_blender_math import (  # noqa: E402
+    np_matrices_are_trs, np_matrices_to_trs, np_trs_to_matrices)
+
+
+def random_trs(rng, count):
+    rotation = rng.normal(size=(count, 4))
+    rotation /= np.linalg.norm(rotation, axis=1, keepdims=True)
+    scale = rng.uniform(0.1, 3.0, (count, 3)) * np.sign(rng.normal(size=(count, 3)))
+    return rng.normal(size=(count, 3)), rotation, scale
+
+
+def test_trs_round_trip():
+    mats = np_trs_to_matrices(*random_trs(np.random.default_rng(0), 100))
+    assert np.allclose(np_trs_to_matrices(*np_matrices_to_trs(mats)), mats)
+    assert np_matrices_are_trs(mats).all()
+
+
+def test_shear_detected():
+    rng = np.random.default_rng(1)
+    children = np_trs_to_matrices(*random_trs(rng, 100))
+
+    def parent(scale):
+        return np_trs_to_matrices(np.zeros((1, 3)), np.array([[0.0, 0.0, 0.0, 1.0]]), np.array([scale]))
+
+    # Uniform scale of the parent keeps world matrices TRS
+    assert np_matrices_are_trs(parent([2.0, 2.0, 2.0]) @ children).all()
+    # Non uniform scale of the parent, with rotated children: shear
+    assert not np_matrices_are_trs(parent([1.0, 3.0, 1.0]) @ children).any()
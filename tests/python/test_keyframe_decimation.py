@@ -0,0 +1,77 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import numpy as np
+import pytest
+
+from io_scene_gltf2.blender.imp.keyframe_decimation import decimate, EVALUATE, ERRORS
+
+
+def max_error(keys, values, kept, interpolation, error):
+    segments = np.clip(np.searchsorted(kept, np.arange(len(keys)), side='right') - 1, 0, len(kept) - 2)
+    return ERRORS[error](EVALUATE[interpolation](keys, values, kept, segments), values).max()
+
+
+def test_step_staircase():
+    # 10 stairs of 1000 keyframes each
+    keys = np.arange(10000, dtype=np.float64)
+    values = (np.arange(10000) // 1000).astype(np.float64)[:, np.newaxis]
+
+    start = time.perf_counter()
+    kept = decimate(keys, values, 0.01, 'STEP', 'MAX')
+    assert time.perf_counter() - start < 1.0
+
+    # First and last keyframes, and one keyframe per stair change
+    assert kept.tolist() == [0] + list(range(1000, 10000, 1000)) + [9999]
+
+
+@pytest.mark.parametrize('interpolation, error', [
+    ('LINEAR', 'DISTANCE'),
+    ('LINEAR', 'MAX'),
+    ('CUBICSPLINE', 'DISTANCE'),
+])
+def test_error_bound(interpolation, error):
+    rng = np.random.default_rng(0)
+    keys = np.cumsum(rng.uniform(0.5, 1.5, 500)) / 24
+    values = np.stack((np.sin(keys * 3), np.cos(keys * 5), keys), axis=1)
+    values[::50] += rng.normal(0, 0.1, values[::50].shape)
+
+    kept = decimate(keys, values, 0.01, interpolation, error)
+
+    assert kept[0] == 0 and kept[-1] == len(keys) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert len(kept) < len(keys)
+    assert max_error(keys, values, kept, interpolation, error) <= 0.01
+
+
+def test_angle_error_bound():
+    rng = np.random.default_rng(1)
+    keys = np.arange(300) / 24
+    angles = np.sin(keys * 2)
+    axes = np.tile([0.0, 0.6, 0.8], (len(keys), 1))
+    values = np.concatenate((np.cos(angles / 2)[:, np.newaxis], axes * np.sin(angles / 2)[:, np.newaxis]), axis=1)
+    values[rng.random(len(keys)) < 0.5] *= -1  # Same rotations
+
+    kept = decimate(keys, values, 0.001, 'LINEAR', 'ANGLE')
+    assert len(kept) < len(keys)
+    assert max_error(keys, values, kept, 'LINEAR', 'ANGLE') <= 0.001
+
+
+def test_linear_curve_keeps_ends():
+    keys = np.arange(100, dtype=np.float64)
+    values = 2.0 * keys[:, np.newaxis] + 1.0
+    assert decimate(keys, values, 1e-6, 'LINEAR', 'DISTANCE').tolist() == [0, 99]
+    assert decimate(keys[:2], values[:2], 1e-6, 'LINEAR', 'DISTANCE').tolist() == [0, 1]
@@ -0,0 +1,308 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Encoded data is decoded as specified by EXT_meshopt_compression, written from the specification
+# and independently of the encoder.
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from io_scene_gltf2.io.com.constants import ComponentType, DataType
+from io_scene_gltf2.io.exp import meshopt
+
+
+def decode_vbyte(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 127) << shift
+        shift += 7
+        if byte < 128:
+            return result, pos
+
+
+def unzigzag(v):
+    return (v >> 1) ^ -(v & 1)
+
+
+def decode_vertex_buffer(data, count, stride):
+    assert data[0] == 0xa0
+    block_size = min((8192 // stride) & ~15, 256)
+    tail = max(stride, 32)
+    previous = np.frombuffer(data[len(data) - stride:], dtype=np.uint8).astype(np.int64)
+    pos = 1
+    vertices = np.zeros((count, stride), dtype=np.uint8)
+
+    for start in range(0, count, block_size):
+        block_count = min(block_size, count - start)
+        groups = (block_count + 15) // 16
+        deltas = np.zeros((stride, groups * 16), dtype=np.int64)
+        for k in range(stride):
+            header = data[pos:pos + (groups + 3) // 4]
+            pos += (groups + 3) // 4
+            for g in range(groups):
+                mode = (header[g // 4] >> (2 * (g % 4))) & 3
+                values = deltas[k, 16 * g:16 * g + 16]
+                if mode == 3:
+                    values[:] = list(data[pos:pos + 16])
+                    pos += 16
+                elif mode != 0:
+                    bits = 2 if mode == 1 else 4
+                    packed = data[pos:pos + 16 * bits // 8]
+                    pos += 16 * bits // 8
+                    for i in range(16):
+                        byte = packed[i * bits // 8]
+                        shift = 8 - bits - (i * bits) % 8
+                        v = (byte >> shift) & ((1 << bits) - 1)
+                        if v == (1 << bits) - 1:
+                            v = data[pos]
+                            pos += 1
+                        values[i] = v
+        for i in range(block_count):
+            current = (previous + unzigzag(deltas[:, i])) & 255
+            vertices[start + i] = current
+            previous = current
+
+    assert pos == len(data) - tail
+    return vertices
+
+
+def decode_index_buffer(data, count):
+    assert data[0] == 0xe1
+    codeaux_table = data[len(data) - 16:]
+    codes = data[1:1 + count // 3]
+    pos = 1 + count // 3
+    edges = [(0, 0)] * 16
+    edge_offset = 0
+    vertices = [0] * 16
+    vertex_offset = 0
+    next_index = last = 0
+    triangles = []
+
+    def push_vertex(v, condition=True):
+        nonlocal vertex_offset
+        vertices[vertex_offset] = v
+        vertex_offset = (vertex_offset + int(condition)) & 15
+
+    def push_edge(a, b):
+        nonlocal edge_offset
+        edges[edge_offset] = (a, b)
+        edge_offset = (edge_offset + 1) & 15
+
+    def decode_index():
+        nonlocal pos, last
+        v, pos = decode_vbyte(data, pos)
+        last = (last + unzigzag(v)) & 0xffffffff
+        return last
+
+    for code in codes:
+        if code < 0xf0:
+            a, b = edges[(edge_offset - 1 - (code >> 4)) & 15]
+            fec = code & 15
+            if fec < 13:
+                c = next_index if fec == 0 else vertices[(vertex_offset - 1 - fec) & 15]
+                next_index += fec == 0
+                push_vertex(c, fec == 0)
+            else:
+                if fec == 15:
+                    c = decode_index()
+                else:
+                    last = c = last + (-1 if fec == 13 else 1)
+                push_vertex(c)
+            push_edge(c, b)
+            push_edge(a, c)
+        else:
+            if code < 0xfe:
+                codeaux = codeaux_table[code & 15]
+                fea = 0
+            else:
+                codeaux = data[pos]
+                pos += 1
+                fea = 0 if code == 0xfe else 15
+                if codeaux == 0:
+                    next_index = 0
+            feb, fec = codeaux >> 4, codeaux & 15
+            a = b = c = 0
+            if fea == 0:
+                a = next_index
+                next_index += 1
+            if feb == 0:
+                b = next_index
+                next_index += 1
+            elif feb != 15:
+                b = vertices[(vertex_offset - feb) & 15]
+            if fec == 0:
+                c = next_index
+                next_index += 1
+            elif fec != 15:
+                c = vertices[(vertex_offset - fec) & 15]
+            if fea == 15:
+                a = decode_index()
+            if feb == 15:
+                b = decode_index()
+            if fec == 15:
+                c = decode_index()
+            push_vertex(a)
+            push_vertex(b, feb in (0, 15))
+            push_vertex(c, fec in (0, 15))
+            push_edge(b, a)
+            push_edge(c, b)
+            push_edge(a, c)
+        triangles.append((a, b, c))
+
+    assert pos == len(data) - 16
+    return triangles
+
+
+def decode_index_sequence(data, count):
+    assert data[0] == 0xd1
+    pos = 1
+    last = [0, 0]
+    indices = []
+    for _ in range(count):
+        v, pos = decode_vbyte(data, pos)
+        current = v & 1
+        last[current] = (last[current] + unzigzag(v >> 1)) & 0xffffffff
+        indices.append(last[current])
+    assert pos == len(data) - 4
+    return indices
+
+
+def decode_filter_exponential(encoded):
+    exponents = (encoded >> 24).astype(np.uint8).view(np.int8).astype(np.int32)
+    mantissas = (encoded << 8).view(np.int32) >> 8
+    return np.ldexp(mantissas.astype(np.float64), exponents)
+
+
+def canonical(triangle):
+    # Triangles can be rotated, winding order is kept
+    i = triangle.index(min(triangle))
+    return tuple(triangle[i:] + triangle[:i])
+
+
+def grid_triangles(size):
+    triangles = []
+    for y in range(size):
+        for x in range(size):
+            v = y * (size + 1) + x
+            triangles += [(v, v + 1, v + size + 1), (v + 1, v + size + 2, v + size + 1)]
+    return triangles
+
+
+@pytest.mark.parametrize('count, stride', [(1, 4), (17, 8), (300, 12), (1000, 32), (700, 256)])
+def test_vertex_buffer_round_trip(count, stride):
+    rng = np.random.default_rng(count)
+    # Smooth data (small deltas, packed in 2 or 4 bits), with some noise (escaped values) and constant bytes
+    vertices = np.cumsum(rng.integers(-2, 3, (count, stride)), axis=0).astype(np.uint8)
+    vertices[rng.random((count, stride)) < 0.05] = rng.integers(0, 256)
+    vertices[:, 0] = 7
+
+    encoded = meshopt.encode_vertex_buffer(vertices)
+    assert np.array_equal(decode_vertex_buffer(encoded, count, stride), vertices)
+
+
+@pytest.mark.parametrize('triangles', [
+    grid_triangles(12),
+    # Several meshes in the same buffer: index reset
+    grid_triangles(3) + grid_triangles(4),
+    [tuple(t) for t in np.random.default_rng(0).integers(0, 5000, (500, 3)).tolist()],
+])
+def test_index_buffer_round_trip(triangles):
+    indices = np.array(triangles, dtype=np.uint32).reshape(-1)
+    decoded = decode_index_buffer(meshopt.encode_index_buffer(indices), len(indices))
+    assert [canonical(list(t)) for t in decoded] == [canonical(list(t)) for t in triangles]
+
+
+def test_index_sequence_round_trip():
+    indices = np.array([0, 1, 1, 2, 100000, 100001, 3, 4, 0, 70000], dtype=np.uint32)
+    assert decode_index_sequence(meshopt.encode_index_sequence(indices), len(indices)) == indices.tolist()
+
+
+@pytest.mark.parametrize('bits', [8, 12, 16])
+def test_filter_exponential_error(bits):
+    values = np.random.default_rng(bits).normal(0, 1000, 1000).astype(np.float32)
+    decoded = decode_filter_exponential(meshopt.encode_filter_exponential(values, bits))
+    # Mantissas of the given bit count, rounded to nearest
+    assert np.all(np.abs(decoded - values) <= np.abs(values) * 2.0 ** (1 - bits))
+
+
+def test_filter_octahedral():
+    vectors = np.random.default_rng(1).normal(size=(500, 4)).astype(np.float32)
+    vectors[:, :3] /= np.linalg.norm(vectors[:, :3], axis=1, keepdims=True)
+    vectors[:, 3] = 1.0
+
+    encoded = meshopt.encode_filter_octahedral(vectors, ComponentType.Short, 16).astype(np.float64)
+    x, y = encoded[:, 0], encoded[:, 1]
+    z = encoded[:, 2] - np.abs(x) - np.abs(y)
+    t = np.maximum(-z, 0.0)
+    x -= np.where(x >= 0, t, -t)
+    y -= np.where(y >= 0, t, -t)
+    decoded = np.stack((x, y, z), axis=1)
+    decoded /= np.linalg.norm(decoded, axis=1, keepdims=True)
+
+    assert np.amax(np.abs(decoded - vectors[:, :3])) < 1e-3
+    assert np.all(encoded[:, 3] == 1.0)
+
+
+def test_keyframe_times_not_filtered():
+    times = np.cumsum(np.full(100, 1 / 24, dtype=np.float32)).astype(np.float32)
+    values = np.random.default_rng(2).normal(size=(100, 3)).astype(np.float32)
+
+    def accessor(view, data_type):
+        return SimpleNamespace(buffer_view=view, count=100, component_type=ComponentType.Float,
+                               type=data_type, normalized=None, sparse=None, min=None, max=None)
+
+    gltf = SimpleNamespace(
+        meshes=[],
+        animations=[SimpleNamespace(samplers=[SimpleNamespace(input=0, output=1)])],
+        accessors=[accessor(0, DataType.Scalar), accessor(1, DataType.Vec3)],
+    )
+    layouts = meshopt.__view_layouts(gltf)
+    export_settings = {'gltf_meshopt_float_bits': 8, 'gltf_meshopt_normal_bits': 8}
+
+    # Times are compressed losslessly
+    view = SimpleNamespace(byte_stride=None, byte_length=times.nbytes)
+    encoded, extension = meshopt.__compress_view(times.tobytes(), view, layouts[0], export_settings)
+    assert 'filter' not in extension
+    decoded = decode_vertex_buffer(encoded, 100, 4).view(np.float32).reshape(-1)
+    assert np.array_equal(decoded, times)
+
+    # Values get the lossy filter
+    view = SimpleNamespace(byte_stride=None, byte_length=values.nbytes)
+    encoded, extension = meshopt.__compress_view(values.tobytes(), view, layouts[1], export_settings)
+    assert extension['filter'] == 'EXPONENTIAL'
+
+
+def test_bounded_accessors_not_filtered():
+    positions = np.random.default_rng(3).uniform(-1, 1, (50, 3)).astype(np.float32)
+    accessor = SimpleNamespace(buffer_view=0, count=50, component_type=ComponentType.Float, type=DataType.Vec3,
+                               normalized=None, sparse=None,
+                               min=np.amin(positions, axis=0).tolist(), max=np.amax(positions, axis=0).tolist())
+    gltf = SimpleNamespace(
+        meshes=[SimpleNamespace(primitives=[SimpleNamespace(indices=None, attributes={'POSITION': 0}, targets=None)])],
+        animations=[],
+        accessors=[accessor],
+    )
+    layouts = meshopt.__view_layouts(gltf)
+    export_settings = {'gltf_meshopt_float_bits': 8, 'gltf_meshopt_normal_bits': 8}
+
+    # Positions are compressed losslessly, so that they stay within the accessor bounds
+    view = SimpleNamespace(byte_stride=None, byte_length=positions.nbytes)
+    encoded, extension = meshopt.__compress_view(positions.tobytes(), view, layouts[0], export_settings)
+    assert 'filter' not in extension
+    decoded = decode_vertex_buffer(encoded, 50, 12).view(np.float32).reshape(-1, 3)
+    assert np.array_equal(decoded, positions)
@@ -0,0 +1,87 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from io_scene_gltf2.io.exp.pixel_cache import PixelCache
+
+
+def loader(size, loads):
+    def load():
+        loads.append(size)
+        return np.zeros(size, np.uint8), None
+    return load
+
+
+def test_lru():
+    cache = PixelCache(1000)
+    loads = []
+    a = cache.get('a', loader(400, loads))[0]
+    cache.get('b', loader(400, loads))
+    assert cache.get('a', loader(400, loads))[0] is a
+    cache.get('c', loader(400, loads))
+
+    # b was the least recently used
+    assert list(cache.entries) == ['a', 'c']
+    assert cache.size == 800
+    assert loads == [400, 400, 400]
+    assert not a.flags.writeable
+
+    # Too large to be cached
+    cache.get('d', loader(2000, loads))
+    assert list(cache.entries) == ['a', 'c'] and cache.size == 800
+
+
+def test_pending_pixels_counted():
+    cache = PixelCache(1000)
+    loads = []
+    done = threading.Event()
+    with ThreadPoolExecutor(1) as executor:
+        a = cache.get('a', loader(400, loads))[0]
+        future = executor.submit(done.wait, 5)
+        cache.add_pending(future, [a, a])
+
+        # a is evicted from the cache, but still in memory for the encoding
+        cache.get('b', loader(400, loads))
+        cache.get('c', loader(400, loads))
+        assert list(cache.entries) == ['c']
+        assert cache.size == 800
+
+        done.set()
+        future.result()
+        cache.get('c', loader(400, loads))
+        assert cache.size == 400
+
+
+def test_encodings_wait_over_budget():
+    cache = PixelCache(1000)
+    loads = []
+    first_done = threading.Event()
+    with ThreadPoolExecutor(2) as executor:
+        first = executor.submit(first_done.wait, 5)
+        cache.add_pending(first, [cache.get(0, loader(600, loads))[0]])
+
+        # Pixels of both encodings are over budget: the second one waits for the first one
+        second = executor.submit(lambda: None)
+        threading.Timer(0.2, first_done.set).start()
+        start = time.perf_counter()
+        cache.add_pending(second, [cache.get(1, loader(600, loads))[0]])
+
+        assert first.done() and first.result() is True
+        assert 0.1 < time.perf_counter() - start < 4
+        assert cache.size <= 1000
@@ -0,0 +1,103 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Encoded files are decoded as specified by PNG, independently of the encoder.
+
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from io_scene_gltf2.io.exp.png import encode_png, encode_png_bands
+
+CHANNELS = {0: 1, 4: 2, 2: 3, 6: 4}
+
+
+def paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def decode_png(data):
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    pos = 8
+    chunks = []
+    while pos < len(data):
+        length, = struct.unpack('>I', data[pos:pos + 4])
+        chunk_type = data[pos + 4:pos + 8]
+        content = data[pos + 8:pos + 8 + length]
+        crc, = struct.unpack('>I', data[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(chunk_type + content) & 0xffffffff
+        chunks.append((chunk_type, content))
+        pos += 12 + length
+    assert chunks[0][0] == b'IHDR' and chunks[-1] == (b'IEND', b'')
+
+    width, height, bit_depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', chunks[0][1])
+    assert interlace == 0
+    channels = CHANNELS[color_type]
+    bpp = channels * bit_depth // 8
+    stride = width * bpp
+    raw = zlib.decompress(b''.join(content for chunk_type, content in chunks if chunk_type == b'IDAT'))
+    assert len(raw) == height * (stride + 1)
+
+    rows = []
+    previous = bytearray(stride)
+    for y in range(height):
+        line = raw[y * (stride + 1):(y + 1) * (stride + 1)]
+        filter_type, row = line[0], bytearray(line[1:])
+        for i in range(stride):
+            a = row[i - bpp] if i >= bpp else 0
+            b = previous[i]
+            c = previous[i - bpp] if i >= bpp else 0
+            predictor = [0, a, b, (a + b) // 2, paeth(a, b, c)][filter_type]
+            row[i] = (row[i] + predictor) & 255
+        rows.append(bytes(row))
+        previous = row
+
+    dtype = np.dtype('>u2') if bit_depth == 16 else np.uint8
+    return np.frombuffer(b''.join(rows), dtype=dtype).reshape(height, width, channels)
+
+
+def image(height, width, channels, dtype, seed):
+    # Gradients (filtered well) and noise
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    pixels = np.stack([(x * (c + 1) + y * 3) for c in range(channels)], axis=-1) * 7
+    pixels[rng.random((height, width)) < 0.1] = rng.integers(0, 65536)
+    return (pixels % np.iinfo(dtype).max).astype(dtype)
+
+
+@pytest.mark.parametrize('channels', [1, 2, 3, 4])
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16])
+def test_round_trip(channels, dtype):
+    pixels = image(37, 29, channels, dtype, channels)
+    assert np.array_equal(decode_png(encode_png(pixels)), pixels)
+
+
+def test_bands():
+    pixels = image(40, 16, 4, np.uint8, 0)
+    # Bands of any size, including empty ones
+    bands = [pixels[0:1], pixels[1:1], pixels[1:17], pixels[17:40]]
+    data = encode_png_bands(16, 40, 4, iter(bands), np.uint8, 9)
+    assert np.array_equal(decode_png(data), pixels)
+
+
+def test_compression():
+    pixels = image(64, 64, 3, np.uint8, 0)
+    pixels[:] = 100
+    assert len(encode_png_bands(64, 64, 3, [pixels])) < pixels.nbytes // 50
@@ -0,0 +1,102 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+import numpy as np
+
+from io_scene_gltf2.blender.exp.primitive_optimize import compute_acmr, optimize_primitives, tipsify
+
+
+class Log:
+    def __init__(self, level):
+        self.logger = logging.getLogger('test_primitive_optimize')
+        self.logger.setLevel(level)
+        self.messages = []
+
+    def debug(self, message):
+        self.messages.append(message)
+
+    def info(self, message):
+        self.messages.append(message)
+
+
+def shuffled_grid(size, seed=0):
+    v = (np.arange(size)[:, np.newaxis] * (size + 1) + np.arange(size)).ravel()
+    triangles = np.stack((
+        np.stack((v, v + 1, v + size + 1), axis=1),
+        np.stack((v + 1, v + size + 2, v + size + 1), axis=1),
+    ), axis=1).reshape(-1, 3)
+    triangles = triangles[np.random.default_rng(seed).permutation(len(triangles))]
+    return triangles.reshape(-1).astype(np.uint32), (size + 1) ** 2
+
+
+def canonical_triangles(indices):
+    # Triangles can be rotated, winding order is kept
+    triangles = indices.reshape(-1, 3)
+    rotation = np.argmin(triangles, axis=1)
+    rotated = np.stack([np.roll(t, -r) for t, r in zip(triangles, rotation)])
+    return sorted(map(tuple, rotated.tolist()))
+
+
+def test_tipsify_reorders_triangles():
+    indices, vertex_count = shuffled_grid(40)
+    result = tipsify(indices, vertex_count)
+
+    assert canonical_triangles(result) == canonical_triangles(indices)
+    assert compute_acmr(result, vertex_count) < 0.75 < compute_acmr(indices, vertex_count)
+
+
+def test_optimize_shared_attributes():
+    indices, vertex_count = shuffled_grid(20)
+    positions = np.random.default_rng(1).random((vertex_count, 3)).astype(np.float32)
+    # An unused vertex, kept at the end
+    positions = np.concatenate((positions, [[9, 9, 9]])).astype(np.float32)
+    shared = {
+        'POSITION': {'data': positions.copy()},
+        'JOINTS_0': list(range(4 * len(positions))),
+    }
+    primitives = [
+        {'indices': indices[:600], 'material': 0},
+        {'indices': indices[600:], 'material': 1},
+        {'mode': 1, 'indices': np.array([0, 1]), 'attributes': {}},
+    ]
+    log = Log(logging.DEBUG)
+    optimize_primitives(primitives, shared, 'Grid', {'log': log})
+
+    # Skinning data follows vertices: it gives the original index of each vertex
+    new_positions = shared['POSITION']['data']
+    original_vertex = np.array(shared['JOINTS_0']).reshape(-1, 4)[:, 0] // 4
+    assert np.array_equal(positions[original_vertex], new_positions)
+
+    # Same triangles in each primitive
+    for primitive, original in ((primitives[0], indices[:600]), (primitives[1], indices[600:])):
+        assert canonical_triangles(original_vertex[primitive['indices']]) == canonical_triangles(original)
+
+    # Vertices in first use order, unused vertex last
+    used, first_use = np.unique(np.concatenate([primitives[0]['indices'], primitives[1]['indices']]),
+                                return_index=True)
+    assert np.array_equal(used[np.argsort(first_use)], np.arange(vertex_count))
+    assert np.array_equal(new_positions[-1], [9, 9, 9])
+    # Edges are not modified
+    assert np.array_equal(primitives[2]['indices'], [0, 1])
+    assert len(log.messages) == 1
+
+
+def test_acmr_only_computed_for_debug_logs():
+    indices, vertex_count = shuffled_grid(5)
+    primitives = [{'indices': indices, 'attributes': {'POSITION': {'data': np.zeros((vertex_count, 3))}}}]
+    log = Log(logging.INFO)
+    optimize_primitives(primitives, None, 'Grid', {'log': log})
+    assert log.messages == []
@@ -0,0 +1,122 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from io_scene_gltf2.io.com import constants as gltf2_io_constants
+from io_scene_gltf2.blender.exp.quantization import prepare_mesh_position_quantization, quantize_attribute
+
+
+def export_settings(bits=16, normalized=False):
+    return {
+        'gltf_quantize_position_bits': bits,
+        'gltf_quantize_position_normalized': normalized,
+        'gltf_quantization_report': {'errors': {}, 'skipped': [], 'used': False},
+        'gltf_quantized_positions': {},
+        'gltf_quantized_accessors': [],
+    }
+
+
+def position(data):
+    return {
+        'data': np.asarray(data, dtype=np.float32),
+        'data_type': gltf2_io_constants.DataType.Vec3,
+        'component_type': gltf2_io_constants.ComponentType.Float,
+    }
+
+
+def test_grid_shared_by_all_primitives():
+    settings = export_settings()
+    primitives = [
+        {'attributes': {'POSITION': position([[0, 0, 0], [1, 2, 0]])}},
+        {'attributes': {'POSITION': position([[-1, 0, 0], [0, 0, 4]])}},
+    ]
+    prepare_mesh_position_quantization(primitives, None, settings)
+
+    offsets, steps = zip(*(p['attributes']['POSITION']['quantization'] for p in primitives))
+    assert np.array_equal(offsets[0], [-1, 0, 0]) and np.array_equal(offsets[1], [-1, 0, 0])
+    # Uniform scale, from the largest extent
+    assert steps[0] == steps[1] == 4 / 65535
+
+
+def test_shared_accessors():
+    # Triangle primitives have no attributes with shared accessors, edges and points have
+    settings = export_settings()
+    shared = {'POSITION': position([[0, 0, 0], [2, 2, 2]])}
+    primitives = [
+        {'indices': np.array([0, 1, 1]), 'material': 0},
+        {'mode': 1, 'attributes': {'POSITION': position([[-2, 0, 0], [0, 0, 0]])}},
+    ]
+    prepare_mesh_position_quantization(primitives, shared, settings)
+
+    offset, step = shared['POSITION']['quantization']
+    assert np.array_equal(offset, [-2, 0, 0]) and step == 4 / 65535
+    assert primitives[1]['attributes']['POSITION']['quantization'] == shared['POSITION']['quantization']
+
+
+def test_morph_targets_not_quantized():
+    settings = export_settings()
+    shared = {'POSITION': position([[0, 0, 0]]), 'MORPH_POSITION_0': position([[1, 0, 0]])}
+    prepare_mesh_position_quantization([{'indices': np.array([0, 0, 0])}], shared, settings)
+    assert 'quantization' not in shared['POSITION']
+
+
+def test_position_round_trip():
+    settings = export_settings(bits=14)
+    rng = np.random.default_rng(0)
+    data = rng.uniform(-10, 30, (1000, 3))
+    attributes = {'POSITION': position(data)}
+    prepare_mesh_position_quantization([{'attributes': attributes}], None, settings)
+
+    accessor = quantize_attribute('POSITION', attributes['POSITION'], settings)
+    offset, scale = settings['gltf_quantized_positions'][id(accessor)]
+    # Vertex attribute elements are padded to 4 bytes
+    quantized = np.frombuffer(accessor.buffer_view.data, dtype=np.uint16).reshape(-1, 4)[:, :3]
+    step = np.amax(np.ptp(attributes['POSITION']['data'], axis=0)) / ((1 << 14) - 1)
+    assert np.isclose(scale, step)
+    assert np.amax(np.abs(quantized * scale + offset - data)) <= step / 2 + 1e-5
+
+
+def decoded_vectors(accessor, dtype, width):
+    # Vertex attribute elements are padded to 4 bytes
+    quantized = np.frombuffer(accessor.buffer_view.data, dtype=dtype).reshape(-1, 4)[:, :width]
+    return np.maximum(quantized / np.iinfo(dtype).max, -1.0)
+
+
+def test_normals_closest_to_unit_length():
+    settings = export_settings()
+    settings['gltf_quantize_normal_bits'] = 8
+    normals = np.random.default_rng(0).normal(size=(2000, 3))
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.concatenate((normals, [[0, 0, 0]]))
+    data = {'data': normals.astype(np.float32), 'data_type': gltf2_io_constants.DataType.Vec3}
+
+    decoded = decoded_vectors(quantize_attribute('NORMAL', data, settings), np.int8, 3)
+    rounded = np.round(normals * 127) / 127
+    length_error = np.abs(np.linalg.norm(decoded[:-1], axis=1) - 1.0)
+    assert np.amax(length_error) < 0.75 * np.amax(np.abs(np.linalg.norm(rounded[:-1], axis=1) - 1.0))
+    # Still one of the grid points around the original vector
+    assert np.amax(np.abs(decoded - normals)) <= 1 / 127 + 1e-6
+    assert np.array_equal(decoded[-1], [0, 0, 0])
+
+
+def test_tangents_keep_handedness():
+    settings = export_settings()
+    settings['gltf_quantize_normal_bits'] = 12
+    tangents = np.array([[1, 0, 0, 1], [0, 0.6, 0.8, -1]], dtype=np.float32)
+    data = {'data': tangents, 'data_type': gltf2_io_constants.DataType.Vec4}
+
+    decoded = decoded_vectors(quantize_attribute('TANGENT', data, settings), np.int16, 4)
+    assert np.array_equal(decoded[:, 3], [1, -1])
+    assert np.allclose(decoded[:, :3], tangents[:, :3], atol=1 / 2047)
@@ -0,0 +1,65 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from io_scene_gltf2.io.exp import resample as resample_module
+from io_scene_gltf2.io.exp.resample import fit_size, resample
+
+
+@pytest.mark.parametrize('filter', ['BOX', 'LANCZOS'])
+@pytest.mark.parametrize('size', [(8, 6), (50, 30), (17, 40)])
+def test_constant_image(filter, size):
+    pixels = np.full((24, 32, 3), [0.25, 0.5, 1.0], dtype=np.float32)
+    result = resample(pixels, size, filter)
+    assert result.shape == (size[1], size[0], 3)
+    assert result.dtype == np.float32
+    assert np.allclose(result, [0.25, 0.5, 1.0], atol=1e-5)
+
+
+def test_box_average():
+    pixels = np.random.default_rng(0).random((32, 48, 4)).astype(np.float32)
+    # Integer factors: each output pixel is the average of a block of input pixels
+    expected = pixels.reshape(8, 4, 12, 4, 4).mean(axis=(1, 3))
+    assert np.allclose(resample(pixels, (12, 8), 'BOX'), expected, atol=1e-5)
+
+
+def test_uint8(monkeypatch):
+    pixels = np.random.default_rng(1).integers(0, 256, (300, 20, 3)).astype(np.uint8)
+    # Several bands in the horizontal pass
+    monkeypatch.setattr(resample_module, 'BAND_ROWS', 64)
+    result = resample(pixels, (20, 300), 'LANCZOS')
+    # Same size: identity, values in [0, 1]
+    assert np.allclose(result, pixels / 255.0, atol=1e-5)
+
+
+def test_lanczos_frequency():
+    # A smooth gradient is kept when downscaling, apart from borders
+    x = np.linspace(0, 1, 256, dtype=np.float32)
+    pixels = np.broadcast_to(x[np.newaxis, :, np.newaxis], (4, 256, 1))
+    result = resample(pixels, (64, 4), 'LANCZOS')
+    expected = (np.arange(64) * 4 + 1.5) / 255
+    assert np.allclose(result[0, 3:-3, 0], expected[3:-3], atol=1e-4)
+
+
+def test_fit_size():
+    assert fit_size((4000, 2000), 0, False) == (4000, 2000)
+    assert fit_size((4000, 2000), 1024, False) == (1024, 512)
+    assert fit_size((3000, 10), 1000, False) == (1000, 3)
+    assert fit_size((10000, 1), 100, False) == (100, 1)
+    # Nearest power of two, not over the limit
+    assert fit_size((1000, 300), 0, True) == (1024, 256)
+    assert fit_size((1500, 700), 1024, True) == (1024, 512)
+    assert fit_size((1, 1), 0, True) == (1, 1)
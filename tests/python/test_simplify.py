@@ -0,0 +1,125 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from io_scene_gltf2.io.exp.simplify import simplify
+
+
+def grid(size, height=None):
+    """Grid of size x size quads on the XY plane, facing +Z."""
+    x, y = np.meshgrid(np.linspace(0, 1, size + 1), np.linspace(0, 1, size + 1))
+    z = np.zeros_like(x) if height is None else height(x, y)
+    positions = np.stack((x, y, z), axis=-1).reshape(-1, 3).astype(np.float32)
+    v = (np.arange(size)[:, np.newaxis] * (size + 1) + np.arange(size)).ravel()
+    triangles = np.stack((
+        np.stack((v, v + 1, v + size + 1), axis=1),
+        np.stack((v + 1, v + size + 2, v + size + 1), axis=1),
+    ), axis=1).reshape(-1)
+    return positions, triangles.astype(np.uint32)
+
+
+def sphere(rings, segments):
+    """Closed UV sphere."""
+    theta = np.linspace(0, np.pi, rings + 1)[1:-1]
+    phi = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing='ij')
+    positions = np.stack((np.sin(t) * np.cos(p), np.sin(t) * np.sin(p), np.cos(t)), axis=-1).reshape(-1, 3)
+    positions = np.concatenate((positions, [[0, 0, 1], [0, 0, -1]])).astype(np.float32)
+    top, bottom = len(positions) - 2, len(positions) - 1
+
+    triangles = []
+    for s in range(segments):
+        n = (s + 1) % segments
+        triangles.append((top, s, n))
+        triangles.append((bottom, (rings - 2) * segments + n, (rings - 2) * segments + s))
+        for r in range(rings - 2):
+            a, b = r * segments + s, r * segments + n
+            c, d = a + segments, b + segments
+            triangles += [(a, c, b), (b, c, d)]
+    return positions, np.array(triangles, dtype=np.uint32).reshape(-1)
+
+
+def normals(positions, indices):
+    p = positions[indices.reshape(-1, 3)].astype(np.float64)
+    return np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+
+
+def edge_counts(indices):
+    t = indices.reshape(-1, 3)
+    a, b = t.reshape(-1), t[:, [1, 2, 0]].reshape(-1)
+    a, b = a.astype(np.int64), b.astype(np.int64)
+    _, counts = np.unique(np.minimum(a, b) * (1 << 32) + np.maximum(a, b), return_counts=True)
+    return counts
+
+
+def test_plane():
+    positions, indices = grid(16)
+    result, error = simplify(positions, indices, 64)
+
+    assert result.dtype == indices.dtype
+    assert len(result) < len(indices) // 4
+    assert error < 1e-6
+    # No flipped triangle, and the area is kept
+    n = normals(positions, result)
+    assert np.all(n[:, 2] > 0)
+    assert np.isclose(np.sum(n[:, 2]) / 2, 1.0)
+    # Border vertices are locked
+    border = np.flatnonzero((positions[:, 0] % 1 == 0) | (positions[:, 1] % 1 == 0))
+    assert set(border.tolist()) <= set(result.tolist())
+
+
+def test_closed_mesh():
+    positions, indices = sphere(24, 32)
+    result, error = simplify(positions, indices, len(indices) // 4)
+
+    assert len(result) <= len(indices) // 2
+    assert 0 < error < 0.1
+    # Still closed, without non manifold edges, and without flipped triangles
+    assert np.all(edge_counts(result) == 2)
+    centers = positions[result.reshape(-1, 3)].mean(axis=1)
+    assert np.all(np.einsum('ij,ij->i', normals(positions, result), centers) > 0)
+
+
+def test_target_error():
+    rng = np.random.default_rng(0)
+    positions, indices = grid(16, lambda x, y: 0.05 * np.sin(8 * x) * np.cos(6 * y))
+    positions[:, 2] += rng.normal(0, 1e-3, len(positions)).astype(np.float32)
+
+    limited, limited_error = simplify(positions, indices, 0, target_error=0.002)
+    unlimited, unlimited_error = simplify(positions, indices, 0)
+
+    assert limited_error <= 0.002
+    assert len(unlimited) < len(limited) < len(indices)
+    assert unlimited_error > limited_error
+
+
+def test_attributes():
+    positions, indices = grid(16)
+    # Half of the plane has another color: collapses across the color change are expensive
+    colors = (positions[:, :1] > 0.5).astype(np.float32)
+    with_colors, _ = simplify(positions, indices, 0, attributes=[(colors, 1.0)], target_error=0.01)
+    without_colors, _ = simplify(positions, indices, 0, target_error=0.01)
+    assert len(without_colors) < len(with_colors) < len(indices)
+
+    # All vertices have different values: nothing can be collapsed
+    values = np.random.default_rng(0).random((len(positions), 2))
+    result, _ = simplify(positions, indices, 0, attributes=[(values, 1.0)], target_error=0.01)
+    assert len(result) == len(indices)
+
+
+def test_nothing_to_do():
+    positions, indices = grid(2)
+    result, error = simplify(positions, indices, len(indices))
+    assert result is indices and error == 0.0
@@ -0,0 +1,74 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from io_scene_gltf2.io.exp.texture_cache import TextureCache
+
+
+def entries(directory):
+    return sorted(name for _, _, files in os.walk(directory) for name in files)
+
+
+def test_put_get(tmp_path):
+    cache = TextureCache(str(tmp_path / 'cache'), 1 << 20)
+    key = TextureCache.fingerprint('image.png', 'WEBP', 75)
+
+    assert cache.get(key) is None
+    cache.put(key, b'encoded')
+    assert cache.get(key) == b'encoded'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Shared by other instances (exports)
+    assert TextureCache(str(tmp_path / 'cache'), 1 << 20).get(key) == b'encoded'
+    # No temporary file left
+    assert entries(tmp_path) == [key + '.bin']
+
+
+def test_fingerprint():
+    assert TextureCache.fingerprint('a', 1) == TextureCache.fingerprint('a', 1)
+    assert TextureCache.fingerprint('a', 1) != TextureCache.fingerprint('a', 2)
+    assert TextureCache.fingerprint('a', 1) != TextureCache.fingerprint(('a', 1))
+
+
+def test_put_errors_ignored(tmp_path):
+    # The cache directory can't be created: a file is in the way
+    (tmp_path / 'file').write_bytes(b'')
+    cache = TextureCache(str(tmp_path / 'file'), 1 << 20)
+    key = TextureCache.fingerprint('image')
+    cache.put(key, b'encoded')
+    assert cache.get(key) is None
+
+
+def test_trim_least_recently_used(tmp_path):
+    cache = TextureCache(str(tmp_path), 250)
+    keys = [TextureCache.fingerprint(i) for i in range(4)]
+    for age, key in enumerate(keys):
+        cache.put(key, bytes(100))
+        path = os.path.join(str(tmp_path), key[:2], key + '.bin')
+        os.utime(path, (1000 + age, 1000 + age))
+
+    # Reading an entry makes it the most recently used
+    assert cache.get(keys[0]) is not None
+    cache.trim()
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is None
+    assert cache.get(keys[3]) is not None
+    assert cache.get(keys[0]) is not None
+
+    # Other files of the directory are kept
+    (tmp_path / 'other').write_bytes(bytes(1000))
+    cache.trim()
+    assert 'other' in entries(tmp_path)
@@ -0,0 +1,63 @@
+# Copyright 2018-2025 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Needs mathutils and bpy: run with the Python of Blender.
+
+import numpy as np
+import pytest
+
+mathutils = pytest.importorskip('mathutils')
+pytest.importorskip('bpy')
+
+from mathutils import Quaternion, Vector  # noqa: E402
+
+from io_scene_gltf2.blender.imp.vnode import VNode  # noqa: E402
+
+
+def random_quaternions(rng, count):
+    q = rng.normal(size=(count, 4))
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize('rotation_before', [
+    Quaternion((1, 0, 0, 0)),
+    # Signed axis permutations, as set by local_rotation
+    Quaternion((2 ** -0.5, 2 ** -0.5, 0, 0)),
+    Quaternion((0.5, 0.5, 0.5, 0.5)),
+])
+@pytest.mark.parametrize('rotation_after', [
+    Quaternion((1, 0, 0, 0)),
+    Quaternion((2 ** -0.5, 0, 0, -(2 ** -0.5))),
+])
+def test_batch_trs(rotation_before, rotation_after):
+    rng = np.random.default_rng(0)
+    locs = rng.normal(size=(20, 3))
+    rots = random_quaternions(rng, 20)
+    scales = rng.uniform(0.1, 3.0, size=(20, 3))
+
+    vnode = VNode()
+    vnode.rotation_before = rotation_before
+    vnode.rotation_after = rotation_after
+
+    final_locs = vnode.base_locs_to_final_locs(locs)
+    final_rots = vnode.base_rots_to_final_rots(rots)
+    final_scales = vnode.base_scales_to_final_scales(scales)
+
+    # Same as trs(), keyframe by keyframe
+    for i in range(20):
+        vnode.base_trs = (Vector(locs[i]), Quaternion(rots[i]), Vector(scales[i]))
+        t, r, s = vnode.trs()
+        assert np.allclose(final_locs[i], t)
+        assert np.allclose(final_rots[i], r)
+        assert np.allclose(final_scales[i], s)